@@ -5,17 +5,31 @@
 """
 
 import os
-import json
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import random
-from src.services.ai.llm_service import LLMService
+from collections import deque
+from src.services.ai.llm_service import get_shared_llm_service
 from src.config import config
+from src.utils.prompt_loader import load_prompt
+from src.utils.json_utils import atomic_write
+from modules.memory.memory_service import SHORT_MEMORY_FILE, iter_short_memory
 import re
 
 logger = logging.getLogger('main')
 
+# 项目根目录及日记提示词路径
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_DIARY_PROMPT_PATH = os.path.join(_PROJECT_ROOT, "data", "base", "diary.md")
+
+# 日记格式化使用的正则表达式
+_RE_BRACKET = re.compile(r'\[.*?\]')  # 表情标签
+_RE_KEEP = re.compile(r'[^\w\s\u4e00-\u9fff，。！？、：；""''（）【】《》\n]')  # 只保留中文、英文、数字和基本标点
+_RE_SENT = re.compile(r'([。！？])')  # 句末标点
+
 class DiaryService:
     """
     日记服务模块，生成基于角色视角的日记
@@ -32,11 +46,16 @@ class DiaryService:
         self.max_token = max_token
         self.temperature = temperature
         self.llm_client = None
+        self._ensured_dirs = set()  # 已确认存在的记忆目录
+        self._diary_counters: Dict[Tuple[str, str, str], int] = {}  # 每天下一篇日记的序号: {(角色, 用户, 日期): 序号}
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="diary")
+        self._user_locks = {}  # 每个角色与用户组合的日记生成锁
+        self._locks_guard = threading.Lock()
     
     def _get_llm_client(self):
         """获取或创建LLM客户端"""
         if not self.llm_client:
-            self.llm_client = LLMService(
+            self.llm_client = get_shared_llm_service(
                 api_key=self.api_key,
                 base_url=self.base_url,
                 model=self.model,
@@ -49,13 +68,15 @@ class DiaryService:
     def _get_avatar_memory_dir(self, avatar_name: str, user_id: str) -> str:
         """获取角色记忆目录，如果不存在则创建"""
         avatar_memory_dir = os.path.join(self.root_dir, "data", "avatars", avatar_name, "memory", user_id)
-        os.makedirs(avatar_memory_dir, exist_ok=True)
+        if avatar_memory_dir not in self._ensured_dirs:
+            os.makedirs(avatar_memory_dir, exist_ok=True)
+            self._ensured_dirs.add(avatar_memory_dir)
         return avatar_memory_dir
     
     def _get_short_memory_path(self, avatar_name: str, user_id: str) -> str:
         """获取短期记忆文件路径"""
         memory_dir = self._get_avatar_memory_dir(avatar_name, user_id)
-        return os.path.join(memory_dir, "short_memory.json")
+        return os.path.join(memory_dir, SHORT_MEMORY_FILE)
     
     def _get_avatar_prompt_path(self, avatar_name: str) -> str:
         """获取角色设定文件路径"""
@@ -69,18 +90,32 @@ class DiaryService:
         # 在文件名中体现用户ID
         base_filename = f"diary_{user_id}_{date_str}"
         
-        # 检查是否已存在同名文件，如有需要添加序号
-        index = 1
-        filename = f"{base_filename}.txt"
-        file_path = os.path.join(memory_dir, filename)
+        # 序号0对应不带序号的文件名，之后依次为 _1、_2 ...
+        key = (avatar_name, user_id, date_str)
+        with self._locks_guard:
+            index = self._diary_counters.get(key)
+            if index is None:
+                # 当天首次生成时扫描一次目录，从已有的最大序号之后继续
+                pattern = re.compile(rf"{re.escape(base_filename)}(?:_(\d+))?\.txt")
+                index = 0
+                for name in os.listdir(memory_dir):
+                    match = pattern.fullmatch(name)
+                    if match:
+                        index = max(index, int(match.group(1) or 0) + 1)
+            self._diary_counters[key] = index + 1
         
-        while os.path.exists(file_path):
-            filename = f"{base_filename}_{index}.txt"
-            file_path = os.path.join(memory_dir, filename)
-            index += 1
-            
-        return file_path
+        filename = f"{base_filename}_{index}.txt" if index else f"{base_filename}.txt"
+        return os.path.join(memory_dir, filename)
     
+    def generate_diary_async(self, avatar_name: str, user_id: str) -> Future:
+        """
+        在后台线程中生成日记，立即返回Future
+
+        Returns:
+            Future: 结果为 generate_diary 的返回值
+        """
+        return self._executor.submit(self.generate_diary, avatar_name, user_id)
+
     def generate_diary(self, avatar_name: str, user_id: str) -> str:
         """
         根据最近对话和角色设定生成日记
@@ -92,6 +127,14 @@ class DiaryService:
         Returns:
             str: 生成的日记内容，如果发生错误则返回错误消息
         """
+        # 同一角色与用户组合的日记不会并发生成，避免重复写入同一文件
+        with self._locks_guard:
+            lock = self._user_locks.setdefault((avatar_name, user_id), threading.Lock())
+        with lock:
+            return self._generate_diary(avatar_name, user_id)
+
+    def _generate_diary(self, avatar_name: str, user_id: str) -> str:
+        """生成日记并保存到文件"""
         try:
             # 读取短期记忆
             short_memory_path = self._get_short_memory_path(avatar_name, user_id)
@@ -100,10 +143,10 @@ class DiaryService:
                 return "无法找到最近的对话记录，无法生成日记。"
             
             try:
-                with open(short_memory_path, "r", encoding="utf-8") as f:
-                    short_memory = json.load(f)
-            except json.JSONDecodeError as e:
-                logger.error(f"短期记忆文件格式错误: {str(e)}")
+                # 只保留最近15轮对话
+                short_memory = deque(iter_short_memory(short_memory_path), maxlen=15)
+            except Exception as e:
+                logger.error(f"读取短期记忆文件失败: {str(e)}")
                 return "对话记录格式错误，无法生成日记。"
             
             if not short_memory:
@@ -124,26 +167,18 @@ class DiaryService:
                 return f"读取角色设定文件失败: {str(e)}"
             
             # 获取最近15轮对话（或全部，如果不足15轮）
-            recent_conversations = "\n".join([
-                f"用户: {conv.get('user', '')}\n"
-                f"回复: {conv.get('bot', '')}" 
-                for conv in short_memory[-15:]  # 使用最近15轮对话
-            ])
+            recent_conversations = "\n".join(
+                f"用户: {conv['user']}\n回复: {conv['bot']}"
+                for conv in short_memory  # 使用最近15轮对话
+            )
             
             # 读取外部日记提示词
             try:
-                # 从当前文件位置获取项目根目录
-                current_dir = os.path.dirname(os.path.abspath(__file__))
-                project_root = os.path.dirname(os.path.dirname(current_dir))
-                diary_prompt_path = os.path.join(project_root, "data", "base", "diary.md")
-                
-                if not os.path.exists(diary_prompt_path):
-                    logger.error(f"日记提示词文件不存在: {diary_prompt_path}")
-                    return "日记提示词文件不存在，无法生成日记。"
-                    
-                with open(diary_prompt_path, "r", encoding="utf-8") as f:
-                    diary_prompt_template = f.read().strip()
-                    logger.debug(f"已加载日记提示词模板，长度: {len(diary_prompt_template)} 字节")
+                diary_prompt_template = load_prompt(_DIARY_PROMPT_PATH)
+                logger.debug(f"已加载日记提示词模板，长度: {len(diary_prompt_template)} 字节")
+            except FileNotFoundError:
+                logger.error(f"日记提示词文件不存在: {_DIARY_PROMPT_PATH}")
+                return "日记提示词文件不存在，无法生成日记。"
             except Exception as e:
                 logger.error(f"读取日记提示词模板失败: {str(e)}")
                 return f"读取日记提示词模板失败，无法生成日记: {str(e)}"
@@ -184,8 +219,7 @@ class DiaryService:
             # 保存日记到文件
             diary_path = self._get_diary_filename(avatar_name, user_id)
             try:
-                with open(diary_path, "w", encoding="utf-8") as f:
-                    f.write(diary_content)
+                atomic_write(diary_path, diary_content.encode("utf-8"), fsync=True)
                 logger.info(f"已生成{avatar_name}小日记 用户: {user_id} 并保存至: {diary_path}")
             except Exception as e:
                 logger.error(f"保存日记文件失败: {str(e)}")
@@ -212,16 +246,11 @@ class DiaryService:
         if not content or not content.strip():
             return ""
             
-        # 移除可能存在的多余空行和特殊字符
-        lines = []
-        for line in content.split('\n'):
-            # 清理每行内容
-            line = line.strip()
-            # 移除特殊字符和表情符号
-            line = re.sub(r'\[.*?\]', '', line)  # 移除表情标签
-            line = re.sub(r'[^\w\s\u4e00-\u9fff，。！？、：；""''（）【】《》\n]', '', line)  # 只保留中文、英文、数字和基本标点
-            if line:
-                lines.append(line)
+        # 移除特殊字符和表情符号
+        content = _RE_KEEP.sub('', _RE_BRACKET.sub('', content))
+        
+        # 移除可能存在的多余空行
+        lines = [line for line in (line.strip() for line in content.split('\n')) if line]
         
         if not lines:
             return ""
@@ -235,28 +264,17 @@ class DiaryService:
             if len(parts) > 1:
                 diary_content = f"{parts[0]}\n\n{parts[1]}"
         
-        # 将内容按句子分割
-        sentences = re.split(r'([。！？])', diary_content)
+        # 将内容按句子分割，并把句末标点合并回句子
+        parts = _RE_SENT.split(diary_content)
+        sentences = [sentence for sentence in (''.join(parts[i:i + 2]) for i in range(0, len(parts), 2)) if sentence]
         
-        # 重新组织内容，每3-5句话一行
+        # 重新组织内容，每3-5句话一行，每行只生成一次随机句数
         formatted_lines = []
-        current_line = []
-        sentence_count = 0
-        
-        for i in range(0, len(sentences), 2):
-            if i + 1 < len(sentences):
-                sentence = sentences[i] + sentences[i + 1]
-            else:
-                sentence = sentences[i]
-            
-            current_line.append(sentence)
-            sentence_count += 1
-            
-            # 每3-5句话换行
-            if sentence_count >= random.randint(3, 5) or i + 2 >= len(sentences):
-                formatted_lines.append(''.join(current_line))
-                current_line = []
-                sentence_count = 0
+        start = 0
+        while start < len(sentences):
+            line_size = random.randint(3, 5)
+            formatted_lines.append(''.join(sentences[start:start + line_size]))
+            start += line_size
         
         # 合并所有行
         diary_content = '\n'.join(formatted_lines)
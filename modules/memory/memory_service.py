@@ -1,20 +1,75 @@
 import os
-import json
 import logging
-from typing import List, Dict, Optional
+import threading
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import List, Dict, Optional, Tuple, Iterator
 from datetime import datetime
-from src.services.ai.llm_service import LLMService
+from src.services.ai.llm_service import get_shared_llm_service
+from src.utils import json_utils
+from src.utils.prompt_loader import load_prompt
 
 # 获取日志记录器
 logger = logging.getLogger('memory')
 
+# 项目根目录及核心记忆提示词路径
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_MEMORY_PROMPT_PATH = os.path.join(_PROJECT_ROOT, "data", "base", "memory.md")
+
+# 短期记忆文件名（JSON Lines格式，每行一轮对话）
+SHORT_MEMORY_FILE = "short_memory.jsonl"
+# 旧版短期记忆文件名（整个列表保存为一个JSON数组）
+LEGACY_SHORT_MEMORY_FILE = "short_memory.json"
+
+
+def _normalize_conversation(conv: Dict) -> Dict:
+    """
+    统一对话记录格式，确保 user/bot 字段为字符串
+    兼容旧格式中 {"user": {"content": ...}} 形式的记录
+    """
+    for field in ("user", "bot"):
+        value = conv.get(field, "")
+        if isinstance(value, dict):
+            conv[field] = value.get("content", "")
+        elif field not in conv:
+            conv[field] = ""
+    return conv
+
+
+def iter_short_memory(path: str) -> Iterator[Dict]:
+    """逐行读取短期记忆文件，跳过空行和损坏的记录，记录格式已统一"""
+    with open(path, "rb") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield _normalize_conversation(json_utils.loads(line))
+            except json_utils.JSONDecodeError:
+                logger.warning(f"跳过损坏的短期记忆记录: {path}")
+
+
 class MemoryService:
     """
     新版记忆服务模块，包含两种记忆类型:
     1. 短期记忆：用于保存最近对话，在程序重启后加载到上下文
     2. 核心记忆：精简的用户核心信息摘要(50-100字)
     每个用户拥有独立的记忆存储空间
+    
+    记忆文件在首次读取后缓存于内存中，短期记忆以追加方式写入
     """
+    # 短期记忆保留的对话轮数
+    SHORT_MEMORY_LIMIT = 50
+    # 短期记忆文件行数超过该值时，压缩为最近 SHORT_MEMORY_LIMIT 轮
+    COMPACT_THRESHOLD = 200
+    # 核心记忆批量更新：待更新数量达到 CORE_UPDATE_BATCH_SIZE 或等待超过 CORE_UPDATE_INTERVAL 秒时提交
+    CORE_UPDATE_BATCH_SIZE = 4
+    CORE_UPDATE_INTERVAL = 5.0
+    # 批量更新时同时进行的LLM请求数量上限
+    CORE_UPDATE_CONCURRENCY = 4
+    # 内存中最多缓存的角色与用户组合数量，超出时移出最久未访问的组合
+    CACHE_MAX_ENTRIES = 256
+
     def __init__(self, root_dir: str, api_key: str, base_url: str, model: str, max_token: int, temperature: float, max_groups: int = 10):
         self.root_dir = root_dir
         self.api_key = api_key
@@ -26,6 +81,26 @@ class MemoryService:
         self.llm_client = None
         self.conversation_count = {}  # 记录每个角色与用户组合的对话计数: {avatar_name_user_id: count}
 
+        # 记忆缓存: {(avatar_name, user_id): 数据}，以及缓存对应的文件修改时间
+        self._short_cache: Dict[Tuple[str, str], deque] = {}
+        self._core_cache: Dict[Tuple[str, str], dict] = {}
+        self._cache_mtime: Dict[str, int] = {}
+        self._short_line_count: Dict[Tuple[str, str], int] = {}  # 短期记忆文件当前行数
+        self._migrated_paths = set()  # 已检查过旧版格式的短期记忆路径
+        self._ensured_dirs = set()  # 已确认存在的记忆目录
+        self._cache_lock = threading.RLock()
+        self._user_locks: Dict[Tuple[str, str], threading.Lock] = {}  # 每个角色与用户组合的核心记忆更新锁
+        self._cache_order: OrderedDict = OrderedDict()  # 按最近访问顺序排列的角色与用户组合
+
+        # 待更新核心记忆的队列，由后台线程批量处理: {(avatar_name, user_id): 最近的短期记忆}
+        self._pending_core_updates: Dict[Tuple[str, str], List[Dict]] = {}
+        self._core_update_cond = threading.Condition()
+        self._core_update_worker = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.CORE_UPDATE_CONCURRENCY,
+            thread_name_prefix="memory"
+        )
+
     def initialize_memory_files(self, avatar_name: str, user_id: str):
         """初始化角色的记忆文件，确保文件存在"""
         try:
@@ -36,8 +111,7 @@ class MemoryService:
             
             # 初始化短期记忆文件（如果不存在）
             if not os.path.exists(short_memory_path):
-                with open(short_memory_path, "w", encoding="utf-8") as f:
-                    json.dump([], f, ensure_ascii=False, indent=2)
+                open(short_memory_path, "w", encoding="utf-8").close()
                 logger.info(f"创建短期记忆文件: {short_memory_path}")
             
             # 初始化核心记忆文件（如果不存在）
@@ -46,8 +120,7 @@ class MemoryService:
                     "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                     "content": ""  # 初始为空字符串
                 }
-                with open(core_memory_path, "w", encoding="utf-8") as f:
-                    json.dump(initial_core_data, f, ensure_ascii=False, indent=2)
+                json_utils.atomic_write_json(core_memory_path, initial_core_data)
                 logger.info(f"创建核心记忆文件: {core_memory_path}")
         
         except Exception as e:
@@ -56,7 +129,7 @@ class MemoryService:
     def _get_llm_client(self):
         """获取或创建LLM客户端"""
         if not self.llm_client:
-            self.llm_client = LLMService(
+            self.llm_client = get_shared_llm_service(
                 api_key=self.api_key,
                 base_url=self.base_url,
                 model=self.model,
@@ -70,19 +143,176 @@ class MemoryService:
     def _get_avatar_memory_dir(self, avatar_name: str, user_id: str) -> str:
         """获取角色记忆目录，如果不存在则创建"""
         avatar_memory_dir = os.path.join(self.root_dir, "data", "avatars", avatar_name, "memory", user_id)
-        os.makedirs(avatar_memory_dir, exist_ok=True)
+        if avatar_memory_dir not in self._ensured_dirs:
+            os.makedirs(avatar_memory_dir, exist_ok=True)
+            self._ensured_dirs.add(avatar_memory_dir)
         return avatar_memory_dir
     
     def _get_short_memory_path(self, avatar_name: str, user_id: str) -> str:
         """获取短期记忆文件路径"""
         memory_dir = self._get_avatar_memory_dir(avatar_name, user_id)
-        return os.path.join(memory_dir, "short_memory.json")
+        path = os.path.join(memory_dir, SHORT_MEMORY_FILE)
+        if path not in self._migrated_paths:
+            self._migrate_legacy_short_memory(memory_dir, path)
+            self._migrated_paths.add(path)
+        return path
+    
+    def _migrate_legacy_short_memory(self, memory_dir: str, path: str):
+        """将旧版 short_memory.json 转换为 JSON Lines 格式"""
+        legacy_path = os.path.join(memory_dir, LEGACY_SHORT_MEMORY_FILE)
+        if not os.path.exists(legacy_path):
+            return
+        try:
+            if not os.path.exists(path):
+                with open(legacy_path, "rb") as f:
+                    short_memory = json_utils.loads(f.read())
+                json_utils.atomic_write(path, b"".join(
+                    json_utils.dumps(conv) + b"\n" for conv in short_memory[-self.SHORT_MEMORY_LIMIT:]
+                ))
+                logger.info(f"已将短期记忆转换为JSONL格式: {path}")
+            os.remove(legacy_path)
+        except Exception as e:
+            logger.error(f"转换旧版短期记忆失败: {legacy_path}, {str(e)}")
     
     def _get_core_memory_path(self, avatar_name: str, user_id: str) -> str:
         """获取核心记忆文件路径"""
         memory_dir = self._get_avatar_memory_dir(avatar_name, user_id)
         return os.path.join(memory_dir, "core_memory.json")
     
+    def _file_mtime(self, path: str) -> Optional[int]:
+        """获取文件修改时间，文件不存在时返回None"""
+        try:
+            return os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _load_short(self, avatar_name: str, user_id: str) -> Optional[deque]:
+        """
+        读取短期记忆（优先使用缓存）
+        文件被外部修改（如Web界面编辑）后会重新加载；文件不存在时返回None
+        """
+        key = (avatar_name, user_id)
+        path = self._get_short_memory_path(avatar_name, user_id)
+        with self._cache_lock:
+            mtime = self._file_mtime(path)
+            if mtime is None:
+                self._short_cache.pop(key, None)
+                return None
+            self._touch_cache(key)
+            if key in self._short_cache and self._cache_mtime.get(path) == mtime:
+                return self._short_cache[key]
+            short_memory = deque(maxlen=self.SHORT_MEMORY_LIMIT)
+            line_count = 0
+            for conv in iter_short_memory(path):
+                short_memory.append(conv)
+                line_count += 1
+            self._short_cache[key] = short_memory
+            self._short_line_count[key] = line_count
+            self._cache_mtime[path] = mtime
+            return short_memory
+
+    def _append_short(self, avatar_name: str, user_id: str, conversation: Dict) -> deque:
+        """追加一轮对话到短期记忆文件，文件过长时压缩，返回缓存中的短期记忆"""
+        key = (avatar_name, user_id)
+        path = self._get_short_memory_path(avatar_name, user_id)
+        with self._cache_lock:
+            short_memory = self._load_short(avatar_name, user_id)
+            if short_memory is None:
+                short_memory = deque(maxlen=self.SHORT_MEMORY_LIMIT)
+                self._touch_cache(key)
+                self._short_cache[key] = short_memory
+                self._short_line_count[key] = 0
+            
+            with open(path, "ab") as f:
+                f.write(json_utils.dumps(conversation) + b"\n")
+            short_memory.append(conversation)
+            self._short_line_count[key] += 1
+            
+            if self._short_line_count[key] > self.COMPACT_THRESHOLD:
+                self._write_short(key, path, short_memory)
+            else:
+                self._cache_mtime[path] = self._file_mtime(path)
+            return short_memory
+
+    def _write_short(self, key: Tuple[str, str], path: str, short_memory: deque):
+        """用缓存中的短期记忆重写整个文件"""
+        with self._cache_lock:
+            json_utils.atomic_write(path, b"".join(json_utils.dumps(conv) + b"\n" for conv in short_memory))
+            self._touch_cache(key)
+            self._short_cache[key] = short_memory
+            self._short_line_count[key] = len(short_memory)
+            self._cache_mtime[path] = self._file_mtime(path)
+
+    def get_short_memory(self, avatar_name: str, user_id: str, count: Optional[int] = None) -> List[Dict]:
+        """获取最近的短期记忆，count为空时返回全部"""
+        with self._cache_lock:
+            short_memory = self._load_short(avatar_name, user_id)
+            if not short_memory:
+                return []
+            short_memory = list(short_memory)
+        return short_memory[-count:] if count else short_memory
+
+    def reset_short_memory(self, avatar_name: str, user_id: str):
+        """清空短期记忆"""
+        key = (avatar_name, user_id)
+        path = self._get_short_memory_path(avatar_name, user_id)
+        self._write_short(key, path, deque(maxlen=self.SHORT_MEMORY_LIMIT))
+
+    def _load_core(self, avatar_name: str, user_id: str) -> Optional[dict]:
+        """读取核心记忆（优先使用缓存），文件不存在时返回None"""
+        key = (avatar_name, user_id)
+        path = self._get_core_memory_path(avatar_name, user_id)
+        with self._cache_lock:
+            mtime = self._file_mtime(path)
+            if mtime is None:
+                self._core_cache.pop(key, None)
+                return None
+            self._touch_cache(key)
+            if key in self._core_cache and self._cache_mtime.get(path) == mtime:
+                return self._core_cache[key]
+            with open(path, "rb") as f:
+                core_data = json_utils.loads(f.read())
+            self._core_cache[key] = core_data
+            self._cache_mtime[path] = mtime
+            return core_data
+
+    def _save_core(self, avatar_name: str, user_id: str, core_data: dict):
+        """写入核心记忆并更新缓存"""
+        key = (avatar_name, user_id)
+        path = self._get_core_memory_path(avatar_name, user_id)
+        with self._cache_lock:
+            # 核心记忆更新频率低，写入时同步到磁盘
+            json_utils.atomic_write_json(path, core_data, fsync=True)
+            self._touch_cache(key)
+            self._core_cache[key] = core_data
+            self._cache_mtime[path] = self._file_mtime(path)
+
+    def _touch_cache(self, key: Tuple[str, str]):
+        """记录角色与用户组合的访问，缓存的组合超过 CACHE_MAX_ENTRIES 时移出最久未访问的（调用方需持有 _cache_lock）"""
+        self._cache_order[key] = None
+        self._cache_order.move_to_end(key)
+        while len(self._cache_order) > self.CACHE_MAX_ENTRIES:
+            oldest, _ = self._cache_order.popitem(last=False)
+            self._evict(oldest)
+
+    def _evict(self, key: Tuple[str, str]):
+        """将指定角色与用户组合的记忆及相关状态移出缓存，下次访问时重新从文件读取"""
+        avatar_name, user_id = key
+        memory_dir = os.path.join(self.root_dir, "data", "avatars", avatar_name, "memory", user_id)
+        short_path = os.path.join(memory_dir, SHORT_MEMORY_FILE)
+        self._short_cache.pop(key, None)
+        self._short_line_count.pop(key, None)
+        self._core_cache.pop(key, None)
+        self._cache_mtime.pop(short_path, None)
+        self._cache_mtime.pop(os.path.join(memory_dir, "core_memory.json"), None)
+        self._migrated_paths.discard(short_path)
+        self._ensured_dirs.discard(memory_dir)
+        # 正在更新核心记忆的组合保留其锁，避免同一组合出现两把锁
+        lock = self._user_locks.get(key)
+        if lock is not None and lock.acquire(blocking=False):
+            del self._user_locks[key]
+            lock.release()
+    
     def add_conversation(self, avatar_name: str, user_message: str, bot_reply: str, user_id: str, is_system_message: bool = False):
         """
         添加对话到短期记忆，并更新对话计数。
@@ -106,22 +336,11 @@ class MemoryService:
             return
             
         try:
-            # 确保记忆目录存在
-            memory_dir = self._get_avatar_memory_dir(avatar_name, user_id)
             short_memory_path = self._get_short_memory_path(avatar_name, user_id)
             
             logger.info(f"保存对话到用户记忆: 角色={avatar_name}, 用户ID={user_id}")
             logger.debug(f"记忆存储路径: {short_memory_path}")
             
-            # 读取现有短期记忆
-            short_memory = []
-            if os.path.exists(short_memory_path):
-                try:
-                    with open(short_memory_path, "r", encoding="utf-8") as f:
-                        short_memory = json.load(f)
-                except json.JSONDecodeError:
-                    logger.warning(f"短期记忆文件损坏，重置为空列表: {short_memory_path}")
-            
             # 添加新对话
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             new_conversation = {
@@ -129,15 +348,9 @@ class MemoryService:
                 "user": user_message,
                 "bot": bot_reply
             }
-            short_memory.append(new_conversation)
-            
-            # 保留最近50轮对话
-            if len(short_memory) > 50:
-                short_memory = short_memory[-50:]
             
-            # 保存更新后的短期记忆
-            with open(short_memory_path, "w", encoding="utf-8") as f:
-                json.dump(short_memory, f, ensure_ascii=False, indent=2)
+            # 追加到短期记忆，超出的旧对话在文件压缩时移除
+            short_memory = self._append_short(avatar_name, user_id, new_conversation)
             
             # 更新对话计数
             self.conversation_count[conversation_key] += 1
@@ -146,26 +359,86 @@ class MemoryService:
             
             # 每10轮对话更新一次核心记忆
             if self.conversation_count[conversation_key] >= 10:
-                logger.info(f"角色 {avatar_name} 为用户 {user_id} 达到10轮对话，开始更新核心记忆")
-                self.update_core_memory(avatar_name, user_id)
+                logger.info(f"角色 {avatar_name} 为用户 {user_id} 达到10轮对话，加入核心记忆更新队列")
+                # 直接传入内存中的短期记忆，更新时无需重新读取
+                with self._cache_lock:
+                    recent_memory = list(short_memory)[-10:]
+                self._enqueue_core_update(avatar_name, user_id, recent_memory)
                 self.conversation_count[conversation_key] = 0
                 
         except Exception as e:
             logger.error(f"添加对话到短期记忆失败: {str(e)}")
     
-    def update_core_memory(self, avatar_name: str, user_id: str):
+    def _enqueue_core_update(self, avatar_name: str, user_id: str, short_memory: List[Dict]):
+        """将核心记忆更新加入队列，由后台线程批量提交"""
+        with self._core_update_cond:
+            # 同一用户重复加入时只保留最新的短期记忆
+            self._pending_core_updates[(avatar_name, user_id)] = short_memory
+            if self._core_update_worker is None:
+                self._core_update_worker = threading.Thread(
+                    target=self._core_update_loop,
+                    name="core-memory-updater",
+                    daemon=True
+                )
+                self._core_update_worker.start()
+            self._core_update_cond.notify()
+
+    def _core_update_loop(self):
+        """后台批量更新核心记忆"""
+        while True:
+            with self._core_update_cond:
+                self._core_update_cond.wait_for(lambda: self._pending_core_updates)
+                # 等待更多请求加入同一批次，直到达到批量大小或超时
+                self._core_update_cond.wait_for(
+                    lambda: len(self._pending_core_updates) >= self.CORE_UPDATE_BATCH_SIZE,
+                    timeout=self.CORE_UPDATE_INTERVAL
+                )
+                batch = self._pending_core_updates
+                self._pending_core_updates = {}
+            
+            logger.info(f"批量更新核心记忆，共 {len(batch)} 个用户")
+            futures = [
+                self.update_core_memory_async(avatar_name, user_id, short_memory)
+                for (avatar_name, user_id), short_memory in batch.items()
+            ]
+            for future in futures:
+                future.result()
+
+    def _get_user_lock(self, avatar_name: str, user_id: str) -> threading.Lock:
+        """获取角色与用户组合对应的锁"""
+        key = (avatar_name, user_id)
+        with self._cache_lock:
+            self._touch_cache(key)
+            return self._user_locks.setdefault(key, threading.Lock())
+
+    def update_core_memory_async(self, avatar_name: str, user_id: str,
+                                 short_memory: Optional[List[Dict]] = None) -> Future:
+        """在后台线程中更新核心记忆，立即返回Future"""
+        return self._executor.submit(self.update_core_memory, avatar_name, user_id, short_memory)
+
+    def update_core_memory(self, avatar_name: str, user_id: str, short_memory: Optional[List[Dict]] = None):
         """
         更新核心记忆，将短期记忆和现有核心记忆整合，生成新的核心记忆摘要
+        同一角色与用户组合的更新不会并发执行
+        
+        Args:
+            avatar_name: 角色名称
+            user_id: 用户ID
+            short_memory: 已读取的短期记忆，为空时从记忆存储中读取
         """
+        with self._get_user_lock(avatar_name, user_id):
+            self._update_core_memory(avatar_name, user_id, short_memory)
+
+    def _update_core_memory(self, avatar_name: str, user_id: str, short_memory: Optional[List[Dict]] = None):
+        """生成并保存新的核心记忆"""
         try:
-            short_memory_path = self._get_short_memory_path(avatar_name, user_id)
             core_memory_path = self._get_core_memory_path(avatar_name, user_id)
             
-            # 读取短期记忆
-            short_memory = []
-            if os.path.exists(short_memory_path):
-                with open(short_memory_path, "r", encoding="utf-8") as f:
-                    short_memory = json.load(f)
+            # 读取短期记忆（仅使用最近10轮对话）
+            if short_memory is None:
+                short_memory = self.get_short_memory(avatar_name, user_id, 10)
+            else:
+                short_memory = short_memory[-10:]
             
             if not short_memory:
                 logger.info(f"短期记忆为空，跳过核心记忆更新: {avatar_name} 用户: {user_id}")
@@ -173,36 +446,27 @@ class MemoryService:
             
             # 读取现有核心记忆
             core_memory = ""
-            if os.path.exists(core_memory_path):
-                try:
-                    with open(core_memory_path, "r", encoding="utf-8") as f:
-                        core_data = json.load(f)
-                        core_memory = core_data.get("content", "")
-                except (json.JSONDecodeError, KeyError):
-                    logger.warning(f"核心记忆文件损坏或格式错误，将重新生成: {core_memory_path}")
-            
-            # 构建最近对话内容（适配新的记忆格式）
-            recent_conversations = "\n".join([
-                f"用户: {conv.get('user', {}).get('content', '') if isinstance(conv.get('user'), dict) else conv.get('user', '')}\n"
-                f"回复: {conv.get('bot', {}).get('content', '') if isinstance(conv.get('bot'), dict) else conv.get('bot', '')}" 
-                for conv in short_memory[-10:]  # 仅使用最近10轮对话
-            ])
+            try:
+                core_data = self._load_core(avatar_name, user_id)
+                if core_data:
+                    core_memory = core_data.get("content", "")
+            except (json_utils.JSONDecodeError, KeyError):
+                logger.warning(f"核心记忆文件损坏或格式错误，将重新生成: {core_memory_path}")
+            
+            # 构建最近对话内容（记录格式在读取时已统一）
+            recent_conversations = "\n".join(
+                f"用户: {conv['user']}\n回复: {conv['bot']}"
+                for conv in short_memory  # 仅使用最近10轮对话
+            )
             
             # 读取外部提示词文件
             try:
-                # 从当前文件位置获取项目根目录
-                current_dir = os.path.dirname(os.path.abspath(__file__))
-                project_root = os.path.dirname(os.path.dirname(current_dir))
-                prompt_path = os.path.join(project_root, "data", "base", "memory.md")
-                
-                if not os.path.exists(prompt_path):
-                    logger.error(f"核心记忆提示词文件不存在: {prompt_path}")
-                    logger.info(f"跳过核心记忆更新: {avatar_name} 用户: {user_id}")
-                    return
-                    
-                with open(prompt_path, "r", encoding="utf-8") as f:
-                    memory_prompt_template = f.read().strip()
-                    logger.debug(f"已加载记忆提示词模板，长度: {len(memory_prompt_template)} 字节")
+                memory_prompt_template = load_prompt(_MEMORY_PROMPT_PATH)
+                logger.debug(f"已加载记忆提示词模板，长度: {len(memory_prompt_template)} 字节")
+            except FileNotFoundError:
+                logger.error(f"核心记忆提示词文件不存在: {_MEMORY_PROMPT_PATH}")
+                logger.info(f"跳过核心记忆更新: {avatar_name} 用户: {user_id}")
+                return
             except Exception as e:
                 logger.error(f"读取记忆提示词模板失败: {str(e)}")
                 logger.info(f"跳过核心记忆更新: {avatar_name} 用户: {user_id}")
@@ -236,9 +500,7 @@ class MemoryService:
                 "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                 "content": new_core_memory
             }
-            
-            with open(core_memory_path, "w", encoding="utf-8") as f:
-                json.dump(core_data, f, ensure_ascii=False, indent=2)
+            self._save_core(avatar_name, user_id, core_data)
             
             logger.info(f"已更新角色 {avatar_name} 为用户 {user_id} 的核心记忆")
             
@@ -248,20 +510,17 @@ class MemoryService:
     def get_core_memory(self, avatar_name: str, user_id: str) -> str:
         """获取角色的核心记忆内容"""
         try:
-            core_memory_path = self._get_core_memory_path(avatar_name, user_id)
+            core_data = self._load_core(avatar_name, user_id)
             
-            if not os.path.exists(core_memory_path):
+            if core_data is None:
                 logger.info(f"核心记忆不存在: {avatar_name} 用户: {user_id}")
                 return ""
             
             logger.debug(f"获取用户核心记忆: 角色={avatar_name}, 用户ID={user_id}")
-            logger.debug(f"核心记忆路径: {core_memory_path}")
             
-            with open(core_memory_path, "r", encoding="utf-8") as f:
-                core_data = json.load(f)
-                core_memory = core_data.get("content", "")
-                logger.debug(f"核心记忆长度: {len(core_memory)} 字节")
-                return core_memory
+            core_memory = core_data.get("content", "")
+            logger.debug(f"核心记忆长度: {len(core_memory)} 字节")
+            return core_memory
                 
         except Exception as e:
             logger.info(f"获取核心记忆失败: {str(e)}")
@@ -283,18 +542,18 @@ class MemoryService:
             max_groups = llm_client.config["max_groups"]
             logger.info(f"使用LLM配置的对话轮数: {max_groups}")
             
-            short_memory_path = self._get_short_memory_path(avatar_name, user_id)
+            with self._cache_lock:
+                short_memory = self._load_short(avatar_name, user_id)
+                if short_memory is not None:
+                    short_memory = list(short_memory)[-max_groups:]  # 使用max_groups轮对话
             
-            if not os.path.exists(short_memory_path):
+            if short_memory is None:
                 logger.info(f"短期记忆不存在: {avatar_name} 用户: {user_id}")
                 return []
             
-            with open(short_memory_path, "r", encoding="utf-8") as f:
-                short_memory = json.load(f)
-            
             # 转换为LLM接口要求的消息格式
             context = []
-            for conv in short_memory[-max_groups:]:  # 使用max_groups轮对话
+            for conv in short_memory:
                 context.append({"role": "user", "content": conv["user"]})
                 context.append({"role": "assistant", "content": conv["bot"]})
             
@@ -3,21 +3,38 @@
 负责管理和执行提醒任务
 """
 
+import os
 import logging
 import time
 import random
 from datetime import datetime
-from typing import Dict
+from typing import List, Optional
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.triggers.date import DateTrigger
 from src.utils.console import print_status
 
 logger = logging.getLogger('main')
 
+# 当前运行的提醒服务实例，持久化的任务触发时通过它发送提醒
+_active_service = None
+
+
+def _fire_reminder(chat_id: str, prompt: str, content: str, sender_name: str):
+    """
+    提醒任务的执行入口
+    任务存储只能保存模块级函数的引用，因此不能直接使用绑定方法
+    """
+    if _active_service is None:
+        logger.warning(f"提醒服务未启动，无法发送提醒: {content}")
+        return
+    _active_service.send_reminder(chat_id, prompt, content, sender_name)
+
+
 class ReminderService:
    
     def __init__(self, message_handler):
-        # 添加调度器配置，容忍任务错过时间
+        # 添加调度器配置，容忍任务错过时间（提醒任务在添加时单独取消延迟上限）
         job_defaults = {
             'misfire_grace_time': 60,  # 允许任务最多延迟60秒执行
             'coalesce': True           # 合并错过的执行
@@ -28,6 +45,10 @@ class ReminderService:
             'default': {'type': 'threadpool'}  # 使用默认值
         }
         
+        # 默认使用内存任务存储；只有机器人主进程通过 enable_persistence 启用SQLite存储，
+        # 避免多个进程的调度器共用同一个任务库导致提醒重复触发
+        self._jobstore = 'default'
+        
         # 创建调度器时应用上述配置
         self.scheduler = BackgroundScheduler(
             job_defaults=job_defaults,
@@ -38,10 +59,33 @@ class ReminderService:
         logging.getLogger('apscheduler').setLevel(logging.ERROR)
         
         self.message_handler = message_handler
-        self.active_reminders: Dict[str, dict] = {}
+        global _active_service
+        _active_service = self
         self.scheduler.start()
         logger.info("统一提醒服务已启动")
 
+    def enable_persistence(self) -> bool:
+        """
+        使用SQLite保存提醒任务，程序重启后未到期的提醒仍会执行
+        同一个任务库只能由一个调度器使用，因此只应在机器人主进程中调用
+        Returns:
+            bool: 是否启用成功
+        """
+        if self._jobstore == 'persistent':
+            return True
+        try:
+            db_path = os.path.join(self.message_handler.root_dir, "data", "reminders.sqlite")
+            self.scheduler.add_jobstore(
+                SQLAlchemyJobStore(url=f"sqlite:///{db_path}"),
+                alias='persistent'
+            )
+            self._jobstore = 'persistent'
+            logger.info(f"提醒任务持久化已启用: {db_path}")
+            return True
+        except Exception as e:
+            logger.error(f"启用提醒任务持久化失败: {str(e)}")
+            return False
+
     def add_reminder(self, chat_id: str, target_time: datetime, 
                     content: str, sender_name: str, silent: bool = True) -> bool:
         """
@@ -58,20 +102,21 @@ class ReminderService:
         try:
             task_id = f"reminder_{chat_id}_{datetime.now().timestamp()}"
             
-            job = self.scheduler.add_job(
-                self.send_reminder,
+            # 提醒提示词在添加时生成，任务触发时直接发送
+            prompt = self._get_reminder_prompt(content)
+            
+            # 一次性任务执行后由调度器自动从任务存储中删除；
+            # 不限制延迟，程序停止期间到期的提醒在重启后补发
+            self.scheduler.add_job(
+                _fire_reminder,
                 trigger=DateTrigger(run_date=target_time),
-                args=[chat_id, content, sender_name],
-                id=task_id
+                args=[chat_id, prompt, content, sender_name],
+                id=task_id,
+                jobstore=self._jobstore,
+                misfire_grace_time=None,
+                replace_existing=True
             )
             
-            self.active_reminders[task_id] = {
-                'chat_id': chat_id,
-                'time': target_time,
-                'content': content,
-                'sender_name': sender_name
-            }
-            
             self._print_task_info(task_id, "新建", sender_name, target_time, content)
             logger.info(f"已添加提醒任务: {task_id}")
             return True
@@ -81,11 +126,16 @@ class ReminderService:
             print_status(f"添加提醒任务失败: {str(e)}", "error", "CROSS")
             return False
 
-    def send_reminder(self, chat_id: str, content: str, sender_name: str):
-        """发送提醒消息"""
+    def send_reminder(self, chat_id: str, prompt: str, content: str, sender_name: str):
+        """
+        发送提醒消息
+        Args:
+            chat_id: 聊天ID
+            prompt: 添加提醒时生成的提醒提示词
+            content: 提醒内容
+            sender_name: 发送者名称
+        """
         try:
-            # 生成提醒提示词
-            prompt = self._get_reminder_prompt(content)
             logger.info(f"生成提醒消息 - 用户: {sender_name}, 提示词: {prompt}")
             
             # 直接使用提示词作为消息发送
@@ -105,9 +155,6 @@ class ReminderService:
             )
             logger.info(f"已发送提醒消息给 {sender_name}")
             
-            # 移除已完成的提醒
-            self._remove_reminder(chat_id, content)
-            
         except Exception as e:
             logger.error(f"发送提醒消息失败: {str(e)}")
 
@@ -121,20 +168,29 @@ class ReminderService:
         """
         return f"""现在时间到了，用户之前让你提醒他{content}。请以你的人设中的身份主动找用户聊天。保持角色设定的一致性和上下文的连贯性"""
 
-    def _remove_reminder(self, chat_id: str, content: str):
+    def get_reminders(self, chat_id: Optional[str] = None) -> List[dict]:
         """
-        移除已完成的提醒
+        获取未执行的提醒任务
         Args:
-            chat_id: 聊天ID
-            content: 提醒内容
+            chat_id: 聊天ID，为空时返回全部提醒
+        Returns:
+            List[dict]: 提醒信息列表
         """
-        task_id = next(
-            (tid for tid, task in self.active_reminders.items() 
-             if task['chat_id'] == chat_id and task['content'] == content),
-            None
-        )
-        if task_id:
-            del self.active_reminders[task_id]
+        reminders = []
+        for job in self.scheduler.get_jobs():
+            if job.func is not _fire_reminder:
+                continue
+            job_chat_id, _, content, sender_name = job.args
+            if chat_id is not None and job_chat_id != chat_id:
+                continue
+            reminders.append({
+                'task_id': job.id,
+                'chat_id': job_chat_id,
+                'time': job.next_run_time,
+                'content': content,
+                'sender_name': sender_name
+            })
+        return reminders
 
     def _print_task_info(self, task_id: str, action: str, 
                         sender_name: str, target_time: datetime, content: str):
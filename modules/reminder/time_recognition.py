@@ -3,16 +3,34 @@
 负责识别消息中的时间信息和提醒意图
 """
 
-import json
 import os
+import re
 import logging
+import functools
 from datetime import datetime
 from typing import Optional, List, Tuple
+from src.utils import json_utils
+from src.utils.prompt_loader import load_prompt
 
 # 使用main日志器
 logger = logging.getLogger('main')
 
+# 项目根目录
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 消息队列添加的时间戳（如 "[2025-01-01 12:00:00]"），不参与时间意图判断
+_TIMESTAMP_RE = re.compile(r'\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\]')
+# 时间或提醒相关的关键词，不包含任何关键词的消息不调用LLM识别
+_TIME_HINT_RE = re.compile(r'[点分秒时天晚早午周号月年]|星期|礼拜|提醒|叫我|记得|别忘|待会|一会|等下|稍后|\d')
+
+
+class _RecognitionFailed(Exception):
+    """LLM调用或响应解析失败；以异常抛出，使 lru_cache 不缓存本次结果"""
+
 class TimeRecognitionService:
+    # 时间识别提示词路径，内容由 load_prompt 缓存，所有实例共享
+    PROMPT_PATH = os.path.join(_PROJECT_ROOT, "data", "base", "reminder.md")
+
     def __init__(self, llm_service):
         """
         初始化时间识别服务
@@ -22,11 +40,10 @@ class TimeRecognitionService:
         self.llm_service = llm_service
         
         # 从文件读取提示词
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        root_dir = os.path.dirname(os.path.dirname(current_dir))
-        prompt_path = os.path.join(root_dir, "data", "base", "reminder.md")
-        with open(prompt_path, "r", encoding="utf-8") as f:
-            self.system_prompt = f.read().strip()
+        self.system_prompt = load_prompt(self.PROMPT_PATH)
+
+        # 同一分钟内的相同消息复用识别结果: {(消息, 分钟): 结果}，失败的识别不会被缓存
+        self._recognize_cached = functools.lru_cache(maxsize=1024)(self._recognize)
 
     def recognize_time(self, message: str) -> Optional[List[Tuple[datetime, str]]]:
         """
@@ -36,6 +53,28 @@ class TimeRecognitionService:
         Returns:
             Optional[list]: [(目标时间, 提醒内容), ...] 或 None
         """
+        message = _TIMESTAMP_RE.sub('', message).strip()
+        if not message or _TIME_HINT_RE.search(message) is None:
+            return None
+
+        minute = datetime.now().strftime('%Y-%m-%d %H:%M')
+        try:
+            reminders = self._recognize_cached(message, minute)
+        except _RecognitionFailed:
+            return None
+        return list(reminders) if reminders else None
+
+    def _recognize(self, message: str, minute: str) -> Optional[Tuple[Tuple[datetime, str], ...]]:
+        """
+        调用LLM识别时间信息，结果按 (message, minute) 缓存
+        Args:
+            message: 去除时间戳后的用户消息
+            minute: 当前时间（精确到分钟），仅作为缓存键
+        Returns:
+            Optional[tuple]: ((目标时间, 提醒内容), ...) 或 None
+        Raises:
+            _RecognitionFailed: LLM调用失败或响应无法解析，此时结果不应被缓存
+        """
         current_time = datetime.now()
         user_prompt = f"""当前时间是：{current_time.strftime('%Y-%m-%d %H:%M:%S')}
 请严格按照JSON格式分析这条消息中的提醒请求：{message}"""
@@ -46,10 +85,18 @@ class TimeRecognitionService:
             user_id="time_recognition_system"
         )
 
-        # 如果没有有效响应或明确不是时间相关
-        if not response or response == "NOT_TIME_RELATED":
+        # 没有有效响应或LLM服务返回错误信息
+        if not response or response.startswith("Error"):
+            raise _RecognitionFailed(response)
+
+        # 明确不是时间相关
+        if response == "NOT_TIME_RELATED":
             return None
 
+        # 不包含提醒字段的响应不符合约定格式，视为识别失败
+        if "reminders" not in response:
+            raise _RecognitionFailed(response)
+
         # 提取和解析JSON
         try:
             # 清理响应
@@ -60,16 +107,16 @@ class TimeRecognitionService:
             # 检查是否找到了有效的JSON边界
             if start == -1 or end == -1 or start >= end:
                 logger.debug(f"响应中未找到有效的JSON: {response[:100]}...")
-                return None
+                raise _RecognitionFailed(response)
                 
             json_str = response[start:end + 1]
             
             # 解析JSON
-            result = json.loads(json_str)
+            result = json_utils.loads(json_str)
             
             # 提取提醒信息
             if "reminders" not in result or not isinstance(result["reminders"], list):
-                return None
+                raise _RecognitionFailed(response)
                 
             reminders = []
             for reminder in result["reminders"]:
@@ -79,15 +126,15 @@ class TimeRecognitionService:
                 if "target_time" not in reminder or "reminder_content" not in reminder:
                     continue
                     
-                target_time = datetime.strptime(
-                    reminder["target_time"], 
-                    "%Y-%m-%d %H:%M:%S"
-                )
+                # 格式为 "%Y-%m-%d %H:%M:%S"，fromisoformat 比 strptime 快得多
+                target_time = datetime.fromisoformat(reminder["target_time"])
                 reminders.append((target_time, reminder["reminder_content"]))
                 
-            return reminders if reminders else None
+            return tuple(reminders) if reminders else None
             
+        except _RecognitionFailed:
+            raise
         except Exception as e:
             logger.error(f"处理时间识别响应失败: {str(e)}")
             logger.debug(f"错误的响应内容: {response[:200]}...")
-            return None
+            raise _RecognitionFailed(response) from e
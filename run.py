@@ -2,116 +2,219 @@
 主程序入口文件
 负责启动聊天机器人程序，包括:
 - 初始化Python路径
-- 禁用字节码缓存
 - 清理缓存文件
 - 启动主程序
 """
 
 import os
 import sys
+import json
 import time
-from colorama import init
-import codecs
-from src.utils.console import print_status, print_banner
+import threading
+import importlib.util
+
+# 设置 KOURI_TRACE_IMPORTS=1 时记录各模块导入耗时，退出时写入 .kouri_imports.json
+if os.environ.get("KOURI_TRACE_IMPORTS"):
+    from src.utils.import_tracer import install as _install_import_tracer
+    _install_import_tracer(os.path.join(os.path.dirname(os.path.abspath(__file__)), '.kouri_imports.json'))
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from src.utils.console import print_status, print_banner, StatusBatcher
 
 # 设置系统默认编码为 UTF-8
 if sys.platform.startswith('win'):
-    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer)
-    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer)
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.stderr.reconfigure(encoding='utf-8')
 
-# 初始化colorama
-init()
-
-# 禁止生成__pycache__文件夹
-sys.dont_write_bytecode = True
+    # 初始化colorama（仅Windows控制台需要转换ANSI颜色代码）
+    from colorama import init
+    init()
 
 # 将src目录添加到Python路径
-src_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
-sys.path.append(src_path)
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+src_path = os.path.join(ROOT_DIR, 'src')
+# 启动时需要确保存在的目录
+REQUIRED_DIRS = tuple(os.path.join(ROOT_DIR, d) for d in ('data', 'logs', 'src/config'))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+def _lazy_import(name):
+    """注册一个延迟加载的模块，首次访问其属性时才真正执行模块代码"""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"找不到模块: {name}")
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+def _load_cleanup_settings():
+    """读取启动清理所需的配置项，优先使用 src.config 写出的缓存文件，过期或缺失时再加载完整配置"""
+    config_path = os.path.join(ROOT_DIR, 'src', 'config', 'config.json')
+    try:
+        with open(os.path.join(ROOT_DIR, 'data', '.runtime_urls.json'), 'r', encoding='utf-8') as f:
+            settings = json.load(f)
+        if settings.get('config_mtime') == os.path.getmtime(config_path):
+            return settings
+    except (OSError, ValueError):
+        pass
+
+    from src.config import config
+    return {
+        'llm_configured': bool(config.llm.api_key),
+        'base_url': config.llm.base_url,
+        'image_model': config.media.image_generation.model,
+        'tts_api_url': config.media.text_to_speech.tts_api_url
+    }
+
+def _has_update_leftovers():
+    """判断是否需要运行更新器清理：存在更新残留目录，或版本号与上次清理字节码缓存时记录的不同"""
+    try:
+        with os.scandir(ROOT_DIR) as it:
+            for entry in it:
+                name = entry.name
+                if (name in ('temp_update', 'backup')
+                        or name.startswith(('KouriChat-', 'Kourichat-'))
+                        or 'Kourichat-Festival-Test' in name):
+                    if entry.is_dir():
+                        return True
+    except OSError:
+        return True
+
+    # 云端检查每次都会重写 version.json，因此比较版本号而不是修改时间
+    cloud_dir = os.path.join(ROOT_DIR, 'src', 'autoupdate', 'cloud')
+    try:
+        with open(os.path.join(cloud_dir, 'version.json'), 'r', encoding='utf-8') as f:
+            current_version = json.load(f).get('version', '0.0.0')
+        with open(os.path.join(cloud_dir, '.pycache_version'), 'r', encoding='utf-8') as f:
+            return f.read().strip() != current_version
+    except (OSError, ValueError, AttributeError):
+        return True
+
+# 只预热没有导入副作用的第三方依赖；src.main 及其处理器在导入时会创建配置、数据库和微信实例，
+# 必须等清理和目录检查完成后再导入
+_PRELOAD_MODULES = ('requests', 'openai')
+
+def _preload_in_background(module_names=_PRELOAD_MODULES):
+    """在后台线程中预先导入无副作用的依赖模块，返回等待导入完成的函数"""
+    def _load():
+        for name in module_names:
+            try:
+                importlib.import_module(name)
+            except Exception:
+                # 预热失败不影响启动，真正导入时会再报告错误
+                pass
+
+    thread = threading.Thread(target=_load, name="preload-deps", daemon=True)
+    thread.start()
+    return thread.join
 
 def initialize_system():
     """初始化系统"""
     try:
-        from src.utils.cleanup import cleanup_pycache
-        from src.main import main
-        from src.autoupdate.updater import Updater  # 导入更新器
-
         print_banner()
         print_status("系统初始化中...", "info", "LAUNCH")
         print("-" * 50)
 
-        # 检查Python路径
-        print_status("检查系统路径...", "info", "FILE")
-        if src_path not in sys.path:
-            print_status("添加src目录到Python路径", "info", "FILE")
-        print_status("系统路径检查完成", "success", "CHECK")
+        # 主程序会加载全部聊天相关模块，这里只登记模块，真正的导入推迟到调用 main 时
+        main_module = _lazy_import('src.main')
+        # 类 Unix 系统上让依赖库的导入与下面的清理 I/O 并行进行；Windows 上收益较小，保持原样
+        wait_deps_loaded = None
+        if os.name != 'nt':
+            wait_deps_loaded = _preload_in_background()
 
-        # 检查缓存设置
-        print_status("检查缓存设置...", "info", "CONFIG")
-        if sys.dont_write_bytecode:
-            print_status("已禁用字节码缓存", "success", "CHECK")
+        # 检查Python路径
+        with StatusBatcher():
+            # src目录已在模块加载时加入Python路径
+            print_status("检查系统路径...", "info", "FILE")
+            print_status("系统路径检查完成", "success", "CHECK")
 
         # 清理缓存文件
-        print_status("清理系统缓存...", "info", "CLEAN")
-        try:
-            cleanup_pycache()
-            
-            from src.utils.logger import LoggerConfig
-            from src.utils.cleanup import CleanupUtils
-            from src.handlers.image import ImageHandler
-            from src.handlers.voice import VoiceHandler
-            from src.config import config
+        with StatusBatcher():
+            print_status("清理系统缓存...", "info", "CLEAN")
+            try:
+                from src.utils.logger import LoggerConfig
+                from src.utils.cleanup import CleanupUtils
+                from src.handlers.image import ImageHandler
+                from src.handlers.voice import VoiceHandler
             
-            root_dir = os.path.dirname(src_path)
-            logger_config = LoggerConfig(root_dir)
-            cleanup_utils = CleanupUtils(root_dir)
-            image_handler = ImageHandler(
-                root_dir=root_dir,
-                api_key=config.llm.api_key,
-                base_url=config.llm.base_url,
-                image_model=config.media.image_generation.model
-            )
-            voice_handler = VoiceHandler(
-                root_dir=root_dir,
-                tts_api_url=config.media.text_to_speech.tts_api_url
-            )
-
-            logger_config.cleanup_old_logs()
-            cleanup_utils.cleanup_all()
-            image_handler.cleanup_temp_dir()
-            voice_handler.cleanup_voice_dir()
+                logger_config = LoggerConfig(ROOT_DIR)
+                cleanup_utils = CleanupUtils(ROOT_DIR)
+
+                # 各清理任务处理的目录互不相关，并行执行
+                cleanup_tasks = {
+                    "日志文件": logger_config.cleanup_old_logs,
+                    "临时文件": cleanup_utils.cleanup_all,
+                }
+                # 未配置对应功能时不创建处理器，也无需清理其缓存
+                settings = _load_cleanup_settings()
+                if settings.get('llm_configured') and settings.get('image_model'):
+                    # 这里只做清理，不会发起请求，因此无需传入 API 密钥
+                    image_handler = ImageHandler(
+                        root_dir=ROOT_DIR,
+                        api_key='',
+                        base_url=settings.get('base_url', ''),
+                        image_model=settings['image_model']
+                    )
+                    cleanup_tasks["图片缓存"] = image_handler.cleanup_temp_dir
+                if settings.get('tts_api_url'):
+                    voice_handler = VoiceHandler(
+                        root_dir=ROOT_DIR,
+                        tts_api_url=settings['tts_api_url']
+                    )
+                    cleanup_tasks["语音缓存"] = voice_handler.cleanup_voice_dir
+
+                with ThreadPoolExecutor(max_workers=min(6, os.cpu_count() or 2)) as executor:
+                    futures = {executor.submit(task): name for name, task in cleanup_tasks.items()}
+                    for future in as_completed(futures):
+                        try:
+                            future.result()
+                        except OSError as e:
+                            print_status(f"清理{futures[future]}失败: {str(e)}", "warning", "CROSS")
             
-            # 清理更新残留文件
-            print_status("清理更新残留文件...", "info", "CLEAN")
-            try:
-                updater = Updater()
-                updater.cleanup()  # 调用清理功能
-                print_status("更新残留文件清理完成", "success", "CHECK")
-            except Exception as e:
-                print_status(f"清理更新残留文件失败: {str(e)}", "warning", "CROSS")
+                # 清理更新残留文件
+                print_status("清理更新残留文件...", "info", "CLEAN")
+                if _has_update_leftovers():
+                    try:
+                        from src.autoupdate.updater import Updater  # 导入更新器
+                        updater = Updater()
+                        updater.cleanup()  # 调用清理功能
+                        print_status("更新残留文件清理完成", "success", "CHECK")
+                    except Exception as e:
+                        print_status(f"清理更新残留文件失败: {str(e)}", "warning", "CROSS")
+                else:
+                    print_status("没有需要清理的更新残留文件", "success", "CHECK")
                 
-        except Exception as e:
-            print_status(f"清理缓存失败: {str(e)}", "warning", "CROSS")
-        print_status("缓存清理完成", "success", "CHECK")
+            except Exception as e:
+                print_status(f"清理缓存失败: {str(e)}", "warning", "CROSS")
+            print_status("缓存清理完成", "success", "CHECK")
 
         # 检查必要目录
-        print_status("检查必要目录...", "info", "FILE")
-        required_dirs = ['data', 'logs', 'src/config']
-        for dir_name in required_dirs:
-            dir_path = os.path.join(os.path.dirname(src_path), dir_name)
-            if not os.path.exists(dir_path):
-                os.makedirs(dir_path)
-                print_status(f"创建目录: {dir_name}", "info", "FILE")
-        print_status("目录检查完成", "success", "CHECK")
+        with StatusBatcher():
+            print_status("检查必要目录...", "info", "FILE")
+            for dir_path in REQUIRED_DIRS:
+                try:
+                    os.makedirs(dir_path)
+                    print_status(f"创建目录: {os.path.relpath(dir_path, ROOT_DIR)}", "info", "FILE")
+                except FileExistsError:
+                    pass
+            print_status("目录检查完成", "success", "CHECK")
 
         print("-" * 50)
         print_status("系统初始化完成", "success", "STAR_1")
-        time.sleep(1)  # 稍微停顿以便用户看清状态
+        if os.environ.get("KOURI_SPLASH"):
+            time.sleep(1)  # 设置 KOURI_SPLASH 时稍微停顿以便用户看清状态
 
         # 启动主程序
         print_status("启动主程序...", "info", "LAUNCH")
         print("=" * 50)
-        main()
+        if wait_deps_loaded is not None:
+            wait_deps_loaded()
+        main_module.main()
 
     except ImportError as e:
         print_status(f"导入模块失败: {str(e)}", "error", "CROSS")
@@ -10,10 +10,11 @@
 import os
 import sys
 import re
+from pathlib import Path
 import logging
 from flask import Flask, render_template, jsonify, request, send_from_directory, redirect, url_for, session, g
-import importlib
-import json
+from flask.json.provider import DefaultJSONProvider
+import importlib.metadata
 from colorama import init, Fore, Style
 from werkzeug.utils import secure_filename
 from typing import Dict, Any, List
@@ -23,7 +24,7 @@ import threading
 from src.autoupdate.updater import Updater
 import requests
 import time
-from queue import Queue
+from collections import deque
 import datetime
 from logging.config import dictConfig
 import shutil
@@ -32,9 +33,13 @@ import atexit
 import socket
 import webbrowser
 import hashlib
+import hmac
+import ipaddress
 import secrets
 from datetime import timedelta
-from src.utils.console import print_status
+from functools import lru_cache
+from src.utils.console import print_status, print_line, StatusBatcher
+from src.utils import json_utils
 from src.avatar_manager import avatar_manager  # 导入角色设定管理器
 from src.webui.routes.avatar import avatar_bp
 import ctypes
@@ -46,7 +51,9 @@ import win32process
 # 在文件开头添加全局变量声明
 bot_process = None
 bot_start_time = None
-bot_logs = Queue(maxsize=1000)
+BOT_LOG_MAXLEN = 1000
+bot_logs = deque(maxlen=BOT_LOG_MAXLEN)  # 超出长度时自动丢弃最旧的日志
+bot_logs_lock = threading.Lock()
 job_object = None  # 添加全局作业对象变量
 
 # 配置日志
@@ -88,24 +95,75 @@ init()
 ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(ROOT_DIR)
 
-# 定义配置文件路径
-config_path = os.path.join(ROOT_DIR, 'src/config/config.json')  # 将配置路径定义为全局常量
+# 定义配置文件及各目录路径，模块加载时计算一次
+CONFIG_PATH = os.path.join(ROOT_DIR, 'src/config/config.json')
+SECRET_KEY_PATH = os.path.join(ROOT_DIR, 'src/config/.secret_key')
+AVATAR_BASE_DIR = os.path.join(ROOT_DIR, 'data/avatars')
+TEMPLATES_DIR = os.path.join(ROOT_DIR, 'src/webui/templates')
+STATIC_DIR = os.path.join(ROOT_DIR, 'src/webui/static')
+UPLOAD_FOLDER = os.path.join(ROOT_DIR, 'src/webui/background_image')
+REQUIREMENTS_PATH = os.path.join(ROOT_DIR, 'requirements.txt')
+MODELS_CONFIG_PATH = os.path.join(ROOT_DIR, 'src/autoupdate/cloud/models.json')
 
 # 禁用Python的字节码缓存
 sys.dont_write_bytecode = True
 
+class OrjsonProvider(DefaultJSONProvider):
+    """使用 json_utils(优先 orjson)序列化 jsonify 响应，遇到不支持的类型时回退到 Flask 默认实现"""
+
+    compact = True  # 调试模式下也输出紧凑格式，不传 indent 参数
+    _FAST_DUMP_ARGS = frozenset(('separators',))
+
+    def dumps(self, obj, **kwargs):
+        if kwargs.keys() <= self._FAST_DUMP_ARGS:
+            try:
+                return json_utils.dumps(obj).decode('utf-8')
+            except TypeError:
+                pass
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return json_utils.loads(s)
+
 app = Flask(__name__,
-    template_folder=os.path.join(ROOT_DIR, 'src/webui/templates'),
-    static_folder=os.path.join(ROOT_DIR, 'src/webui/static'))
+    template_folder=TEMPLATES_DIR,
+    static_folder=STATIC_DIR)
+app.json = OrjsonProvider(app)
 
 # 添加配置
-app.config['UPLOAD_FOLDER'] = os.path.join(ROOT_DIR, 'src/webui/background_image')
+app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 
 # 确保上传目录存在
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+
+def _load_secret_key() -> bytes:
+    """读取持久化的session密钥，不存在时生成并保存，保证重启或多进程部署时session依然有效"""
+    key_path = SECRET_KEY_PATH
+    try:
+        key = Path(key_path).read_bytes()
+        if key:
+            return key
+    except FileNotFoundError:
+        pass
+
+    key = secrets.token_bytes(32)
+    try:
+        # 仅允许当前用户读写；O_EXCL 保证并发启动时只有一个进程写入
+        fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        existing = Path(key_path).read_bytes()
+        if existing:
+            return existing
+        fd = os.open(key_path, os.O_WRONLY | os.O_TRUNC)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(key)
+    os.chmod(key_path, 0o600)
+    return key
 
 # 生成密钥用于session加密
-app.secret_key = secrets.token_hex(16)
+app.secret_key = _load_secret_key()
 
 # 在 app 初始化后添加
 app.register_blueprint(avatar_manager)
@@ -119,11 +177,38 @@ ANNOUNCEMENT_CONFIG_PATH = os.path.join(ROOT_DIR, 'src/autoupdate/cloud/announce
 VERSION_CONFIG_PATH = os.path.join(ROOT_DIR, 'src/autoupdate/cloud/version.json')
 
 # 在应用启动时检查云端更新
+# 本地云端信息缓存的有效期（秒），在此期间启动时不再重新获取
+CLOUD_CHECK_MIN_INTERVAL = 3600
+
+# 标记本进程是否已经执行过启动时的云端检查
+_cloud_check_started = threading.Event()
+
 def check_cloud_updates_on_startup():
+    if os.environ.get("DISABLE_UPDATE_CHECK") == "1":
+        logger.info("已通过 DISABLE_UPDATE_CHECK 关闭启动时的云端更新检查")
+        return
+    if _cloud_check_started.is_set():
+        return
+    _cloud_check_started.set()
+
+    # 本地公告文件一小时内刚更新过时跳过网络请求，可用 FORCE_UPDATE_CHECK=1 强制检查
+    if os.environ.get("FORCE_UPDATE_CHECK") != "1":
+        try:
+            age = time.time() - os.stat(ANNOUNCEMENT_CONFIG_PATH).st_mtime
+            if age < CLOUD_CHECK_MIN_INTERVAL:
+                logger.info(f"云端信息在 {int(age)} 秒前已更新，跳过启动时检查")
+                return
+        except OSError:
+            pass
+
+    # 稍等片刻并加入随机抖动，让 Flask 先完成启动
+    import random
+    time.sleep(0.5 + random.uniform(0, 0.5))
     try:
         from src.autoupdate.updater import check_cloud_info
         logger.info("应用启动时检查云端更新...")
-        check_cloud_info()
+        with requests.Session() as http_session:
+            check_cloud_info(session=http_session, timeout=(2.0, 5.0))
         logger.info("云端更新检查完成")
     except Exception as e:
         logger.error(f"检查云端更新失败: {e}")
@@ -136,9 +221,35 @@ update_thread.start()
 # 添加全局标记，跟踪公告是否已在本应用实例中显示过
 announcement_shown_this_instance = False
 
+# 人设列表和配置分组的缓存，分别按人设目录和配置文件的修改时间判断是否失效
+_AVATARS_CACHE = {"mtime_ns": None, "value": None}
+_GROUPS_CACHE = {"key": None, "value": None}
+_groups_cache_lock = threading.Lock()
+
+def _avatar_dir_mtime_ns():
+    """返回人设根目录的修改时间，目录不存在时返回 None"""
+    try:
+        return os.stat(AVATAR_BASE_DIR).st_mtime_ns
+    except OSError:
+        return None
+
 def get_available_avatars() -> List[str]:
-    """获取可用的人设目录列表"""
-    avatar_base_dir = os.path.join(ROOT_DIR, "data/avatars")
+    """获取可用的人设目录列表，人设根目录未变化时直接返回上次的结果"""
+    mtime_ns = _avatar_dir_mtime_ns()
+    with _groups_cache_lock:
+        if mtime_ns is not None and _AVATARS_CACHE["mtime_ns"] == mtime_ns:
+            return list(_AVATARS_CACHE["value"])
+
+    avatars = _scan_available_avatars()
+    # 扫描过程中可能创建了默认人设，重新读取修改时间
+    with _groups_cache_lock:
+        _AVATARS_CACHE["mtime_ns"] = _avatar_dir_mtime_ns()
+        _AVATARS_CACHE["value"] = list(avatars)
+    return avatars
+
+def _scan_available_avatars() -> List[str]:
+    """扫描人设目录，补全缺失的文件并返回可用的人设列表"""
+    avatar_base_dir = AVATAR_BASE_DIR
     if not os.path.exists(avatar_base_dir):
         os.makedirs(avatar_base_dir, exist_ok=True)
         logger.info(f"创建人设目录: {avatar_base_dir}")
@@ -146,25 +257,37 @@ def get_available_avatars() -> List[str]:
 
     # 获取所有包含 avatar.md 和 emojis 目录的有效人设目录
     avatars = []
-    for item in os.listdir(avatar_base_dir):
-        avatar_dir = os.path.join(avatar_base_dir, item)
-        if os.path.isdir(avatar_dir):
-            avatar_md_path = os.path.join(avatar_dir, "avatar.md")
-            emojis_dir = os.path.join(avatar_dir, "emojis")
-
-            # 如果缺少必要文件，尝试创建
-            if not os.path.exists(emojis_dir):
-                os.makedirs(emojis_dir, exist_ok=True)
-                logger.info(f"为人设 {item} 创建表情包目录")
-
-            if not os.path.exists(avatar_md_path):
-                with open(avatar_md_path, 'w', encoding='utf-8') as f:
-                    f.write("# 任务\n请在此处描述角色的任务和目标\n\n# 角色\n请在此处描述角色的基本信息\n\n# 外表\n请在此处描述角色的外表特征\n\n# 经历\n请在此处描述角色的经历和背景故事\n\n# 性格\n请在此处描述角色的性格特点\n\n# 经典台词\n请在此处列出角色的经典台词\n\n# 喜好\n请在此处描述角色的喜好\n\n# 备注\n其他需要补充的信息")
-                logger.info(f"为人设 {item} 创建模板avatar.md文件")
-
-            # 检查文件和目录是否存在
-            if os.path.exists(avatar_md_path) and os.path.exists(emojis_dir):
-                avatars.append(f"data/avatars/{item}")
+    with os.scandir(avatar_base_dir) as it:
+        avatar_entries = [entry for entry in it if entry.is_dir(follow_symlinks=False)]
+    for avatar_entry in avatar_entries:
+        item = avatar_entry.name
+        avatar_dir = avatar_entry.path
+        avatar_md_path = os.path.join(avatar_dir, "avatar.md")
+        emojis_dir = os.path.join(avatar_dir, "emojis")
+
+        # 一次扫描拿到人设目录下的所有条目，代替逐个 exists 检查
+        try:
+            with os.scandir(avatar_dir) as sub:
+                names = {e.name: e for e in sub}
+        except OSError as e:
+            logger.error(f"读取人设目录失败 {avatar_dir}: {str(e)}")
+            continue
+
+        has_emojis = 'emojis' in names and names['emojis'].is_dir()
+        has_avatar_md = 'avatar.md' in names
+
+        # 如果缺少必要文件，尝试创建
+        if not has_emojis:
+            os.makedirs(emojis_dir, exist_ok=True)
+            logger.info(f"为人设 {item} 创建表情包目录")
+
+        if not has_avatar_md:
+            with open(avatar_md_path, 'w', encoding='utf-8') as f:
+                f.write("# 任务\n请在此处描述角色的任务和目标\n\n# 角色\n请在此处描述角色的基本信息\n\n# 外表\n请在此处描述角色的外表特征\n\n# 经历\n请在此处描述角色的经历和背景故事\n\n# 性格\n请在此处描述角色的性格特点\n\n# 经典台词\n请在此处列出角色的经典台词\n\n# 喜好\n请在此处描述角色的喜好\n\n# 备注\n其他需要补充的信息")
+            logger.info(f"为人设 {item} 创建模板avatar.md文件")
+
+        # 缺失的文件和目录已在上面补全
+        avatars.append(f"data/avatars/{item}")
 
     # 如果没有人设，创建默认人设
     if not avatars:
@@ -182,158 +305,108 @@ def get_available_avatars() -> List[str]:
 
     return avatars
 
+def invalidate_config_groups_cache():
+    """使配置分组缓存失效"""
+    with _groups_cache_lock:
+        _GROUPS_CACHE["key"] = None
+        _GROUPS_CACHE["value"] = None
+
 def parse_config_groups() -> Dict[str, Dict[str, Any]]:
-    """解析配置文件，将配置项按组分类"""
+    """解析配置文件，将配置项按组分类；缓存以配置文件和人设目录的修改时间为键，两者都未变化时返回缓存结果"""
+    try:
+        key = (os.stat(CONFIG_PATH).st_mtime_ns, _avatar_dir_mtime_ns())
+    except OSError:
+        return _build_config_groups()
+
+    with _groups_cache_lock:
+        if _GROUPS_CACHE["key"] == key:
+            return _GROUPS_CACHE["value"]
+
+    config_groups = _build_config_groups()
+    if config_groups:
+        with _groups_cache_lock:
+            _GROUPS_CACHE["key"] = key
+            _GROUPS_CACHE["value"] = config_groups
+    return config_groups
+
+# 配置分组中与当前配置值无关的元数据，模块加载时构建一次
+_CONFIG_GROUP_META = {
+    "基础配置": {
+        "LISTEN_LIST": {"description": "用户列表(请配置要和bot说话的账号的昵称或者群名，不要写备注！)"},
+        "DEEPSEEK_BASE_URL": {"description": "API注册地址"},
+        "MODEL": {"description": "AI模型选择"},
+        "DEEPSEEK_API_KEY": {"description": "API密钥"},
+        "MAX_TOKEN": {"description": "回复最大token数", "type": "number"},
+        "TEMPERATURE": {"type": "number", "description": "温度参数", "min": 0.0, "max": 1.7},
+        "TOP_P": {"type": "number", "description": "Top-p采样参数", "min": 0.1, "max": 1.0},
+        "FREQUENCY_PENALTY": {"type": "number", "description": "频率惩罚参数", "min": 0.0, "max": 2.0},
+    },
+    "图像识别API配置": {
+        "VISION_BASE_URL": {"description": "服务地址", "has_provider_options": True},
+        "VISION_API_KEY": {"description": "API密钥", "is_secret": False},
+        "VISION_MODEL": {"description": "模型名称", "has_model_options": True},
+        "VISION_TEMPERATURE": {"description": "温度参数", "type": "number", "min": 0.0, "max": 1.0},
+    },
+    "主动消息配置": {
+        "AUTO_MESSAGE": {"description": "自动消息内容"},
+        "MIN_COUNTDOWN_HOURS": {"description": "最小倒计时时间（小时）"},
+        "MAX_COUNTDOWN_HOURS": {"description": "最大倒计时时间（小时）"},
+        "QUIET_TIME_START": {"description": "安静时间开始"},
+        "QUIET_TIME_END": {"description": "安静时间结束"},
+    },
+    "消息配置": {
+        "QUEUE_TIMEOUT": {"description": "消息队列等待时间（秒）", "type": "number", "min": 8, "max": 20},
+    },
+    "Prompt配置": {
+        "MAX_GROUPS": {"description": "最大的上下文轮数"},
+        "AVATAR_DIR": {"description": "人设目录（自动包含 avatar.md 和 emojis 目录）", "type": "select"},
+    },
+}
+
+# 各配置项从 config 对象取值的方式
+_CONFIG_GROUP_VALUES = {
+    "LISTEN_LIST": lambda c: c.user.listen_list,
+    "DEEPSEEK_BASE_URL": lambda c: c.llm.base_url,
+    "MODEL": lambda c: c.llm.model,
+    "DEEPSEEK_API_KEY": lambda c: c.llm.api_key,
+    "MAX_TOKEN": lambda c: c.llm.max_tokens,
+    "TEMPERATURE": lambda c: float(c.llm.temperature),  # 确保是浮点数
+    "TOP_P": lambda c: float(c.llm.top_p),
+    "FREQUENCY_PENALTY": lambda c: float(c.llm.frequency_penalty),
+    "VISION_BASE_URL": lambda c: c.media.image_recognition.base_url,
+    "VISION_API_KEY": lambda c: c.media.image_recognition.api_key,
+    "VISION_MODEL": lambda c: c.media.image_recognition.model,
+    "VISION_TEMPERATURE": lambda c: float(c.media.image_recognition.temperature),
+    "AUTO_MESSAGE": lambda c: c.behavior.auto_message.content,
+    "MIN_COUNTDOWN_HOURS": lambda c: c.behavior.auto_message.min_hours,
+    "MAX_COUNTDOWN_HOURS": lambda c: c.behavior.auto_message.max_hours,
+    "QUIET_TIME_START": lambda c: c.behavior.quiet_time.start,
+    "QUIET_TIME_END": lambda c: c.behavior.quiet_time.end,
+    "QUEUE_TIMEOUT": lambda c: c.behavior.message_queue.timeout,
+    "MAX_GROUPS": lambda c: c.behavior.context.max_groups,
+    "AVATAR_DIR": lambda c: c.behavior.context.avatar_dir,
+}
+
+def _build_config_groups() -> Dict[str, Dict[str, Any]]:
+    """根据当前配置构建配置分组，只需填入各项的当前值，元数据来自 _CONFIG_GROUP_META"""
     from src.config import config
 
     try:
-        # 基础配置组
         config_groups = {
-            "基础配置": {},
-            "图像识别API配置": {},
-            "主动消息配置": {},
-            "消息配置": {},
-            "Prompt配置": {},
-        }
-
-        # 基础配置
-        config_groups["基础配置"].update(
-            {
-                "LISTEN_LIST": {
-                    "value": config.user.listen_list,
-                    "description": "用户列表(请配置要和bot说话的账号的昵称或者群名，不要写备注！)",
-                },
-                "DEEPSEEK_BASE_URL": {
-                    "value": config.llm.base_url,
-                    "description": "API注册地址",
-                },
-                "MODEL": {"value": config.llm.model, "description": "AI模型选择"},
-                "DEEPSEEK_API_KEY": {
-                    "value": config.llm.api_key,
-                    "description": "API密钥",
-                },
-                "MAX_TOKEN": {
-                    "value": config.llm.max_tokens,
-                    "description": "回复最大token数",
-                    "type": "number",
-                },
-                "TEMPERATURE": {
-                    "value": float(config.llm.temperature),  # 确保是浮点数
-                    "type": "number",
-                    "description": "温度参数",
-                    "min": 0.0,
-                    "max": 1.7,
-                },
-                "TOP_P": {
-                    "value": float(config.llm.top_p),
-                    "type": "number",
-                    "description": "Top-p采样参数",
-                    "min": 0.1,
-                    "max": 1.0,
-                },
-                "FREQUENCY_PENALTY": {
-                    "value": float(config.llm.frequency_penalty),
-                    "type": "number",
-                    "description": "频率惩罚参数",
-                    "min": 0.0,
-                    "max": 2.0,
-                },
-            }
-        )
-
-        # 图像识别API配置
-        config_groups["图像识别API配置"].update(
-            {
-                "VISION_BASE_URL": {
-                    "value": config.media.image_recognition.base_url,
-                    "description": "服务地址",
-                    "has_provider_options": True
-                },
-                "VISION_API_KEY": {
-                    "value": config.media.image_recognition.api_key,
-                    "description": "API密钥",
-                    "is_secret": False
-                },
-                "VISION_MODEL": {
-                    "value": config.media.image_recognition.model,
-                    "description": "模型名称",
-                    "has_model_options": True
-                },
-                "VISION_TEMPERATURE": {
-                    "value": float(config.media.image_recognition.temperature),
-                    "description": "温度参数",
-                    "type": "number",
-                    "min": 0.0,
-                    "max": 1.0
-                }
-            }
-        )
-
-        # 主动消息配置
-        config_groups["主动消息配置"].update(
-            {
-                "AUTO_MESSAGE": {
-                    "value": config.behavior.auto_message.content,
-                    "description": "自动消息内容",
-                },
-                "MIN_COUNTDOWN_HOURS": {
-                    "value": config.behavior.auto_message.min_hours,
-                    "description": "最小倒计时时间（小时）",
-                },
-                "MAX_COUNTDOWN_HOURS": {
-                    "value": config.behavior.auto_message.max_hours,
-                    "description": "最大倒计时时间（小时）",
-                },
-                "QUIET_TIME_START": {
-                    "value": config.behavior.quiet_time.start,
-                    "description": "安静时间开始",
-                },
-                "QUIET_TIME_END": {
-                    "value": config.behavior.quiet_time.end,
-                    "description": "安静时间结束",
-                },
-            }
-        )
-
-        # 消息配置
-        config_groups["消息配置"].update(
-            {
-                "QUEUE_TIMEOUT": {
-                    "value": config.behavior.message_queue.timeout,
-                    "description": "消息队列等待时间（秒）",
-                    "type": "number",
-                    "min": 8,
-                    "max": 20
-                }
+            group: {
+                key: {"value": _CONFIG_GROUP_VALUES[key](config), **meta}
+                for key, meta in fields.items()
             }
-        )
+            for group, fields in _CONFIG_GROUP_META.items()
+        }
 
-        # Prompt配置
-        available_avatars = get_available_avatars()
-        config_groups["Prompt配置"].update(
-            {
-                "MAX_GROUPS": {
-                    "value": config.behavior.context.max_groups,
-                    "description": "最大的上下文轮数",
-                },
-                "AVATAR_DIR": {
-                    "value": config.behavior.context.avatar_dir,
-                    "description": "人设目录（自动包含 avatar.md 和 emojis 目录）",
-                    "options": available_avatars,
-                    "type": "select"
-                }
-            }
-        )
+        # 人设目录的可选项需要实时扫描
+        config_groups["Prompt配置"]["AVATAR_DIR"]["options"] = get_available_avatars()
 
         # 直接从配置文件读取定时任务数据
         tasks = []
         try:
-            config_path = os.path.join(ROOT_DIR, 'src/config/config.json')
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config_data = json.load(f)
-                if 'categories' in config_data and 'schedule_settings' in config_data['categories']:
-                    if 'settings' in config_data['categories']['schedule_settings'] and 'tasks' in config_data['categories']['schedule_settings']['settings']:
-                        tasks = config_data['categories']['schedule_settings']['settings']['tasks'].get('value', [])
+            tasks = _get_config_tasks(_get_cached_config())
         except Exception as e:
             logger.error(f"读取任务数据失败: {str(e)}")
 
@@ -361,20 +434,130 @@ def index():
     """重定向到控制台"""
     return redirect(url_for('dashboard'))
 
+# 配置文件解析结果缓存，按文件修改时间和大小判断是否失效
+# raw 保存文件的原始字节，用于在不读盘的情况下解析出可修改的独立副本
+_CFG_CACHE = {"mtime_ns": 0, "size": 0, "data": None, "raw": None, "tasks_json": None, "task_index": None, "all_configs": None}
+_cfg_cache_lock = threading.Lock()
+
+def _update_config_cache(st, data, raw):
+    """用给定的文件状态、配置数据和原始字节更新缓存"""
+    with _cfg_cache_lock:
+        _CFG_CACHE["mtime_ns"] = st.st_mtime_ns
+        _CFG_CACHE["size"] = st.st_size
+        _CFG_CACHE["data"] = data
+        _CFG_CACHE["raw"] = raw
+        _CFG_CACHE["tasks_json"] = None
+        _CFG_CACHE["task_index"] = None
+        _CFG_CACHE["all_configs"] = None
+
+def _cached_config_entry(st):
+    """缓存与文件状态一致时返回 (data, raw)，否则返回 None"""
+    with _cfg_cache_lock:
+        if (_CFG_CACHE["data"] is not None
+                and _CFG_CACHE["mtime_ns"] == st.st_mtime_ns
+                and _CFG_CACHE["size"] == st.st_size):
+            return _CFG_CACHE["data"], _CFG_CACHE["raw"]
+    return None
+
+def _get_cached_config():
+    """获取缓存的配置数据，仅在配置文件变化时重新读取
+
+    返回的字典为共享对象，只能读取；需要修改配置时使用 load_config_file 获取独立副本。
+    """
+    st = os.stat(CONFIG_PATH)
+    cached = _cached_config_entry(st)
+    if cached is not None:
+        return cached[0]
+    raw = Path(CONFIG_PATH).read_bytes()
+    data = json_utils.loads(raw)
+    _update_config_cache(st, data, raw)
+    return data
+
+def _get_cached_tasks_json():
+    """获取定时任务列表的 JSON 字符串，配置未变化时复用上次序列化的结果"""
+    config_data = _get_cached_config()
+    with _cfg_cache_lock:
+        if _CFG_CACHE["data"] is config_data and _CFG_CACHE["tasks_json"] is not None:
+            return _CFG_CACHE["tasks_json"]
+
+    tasks_json = json_utils.dumps(_get_config_tasks(config_data)).decode('utf-8')
+
+    with _cfg_cache_lock:
+        if _CFG_CACHE["data"] is config_data:
+            _CFG_CACHE["tasks_json"] = tasks_json
+    return tasks_json
+
+def _find_tasks_node(config_data):
+    """取出配置中的定时任务配置项，不存在时返回 None"""
+    return config_data.get('categories', {}).get('schedule_settings', {}) \
+        .get('settings', {}).get('tasks')
+
+def _get_config_tasks(config_data) -> list:
+    """取出配置中的定时任务列表，不存在时返回空列表"""
+    tasks_node = _find_tasks_node(config_data)
+    return tasks_node.get('value', []) if tasks_node is not None else []
+
+def _ensure_tasks_node(config_data) -> dict:
+    """确保配置中存在定时任务配置项并返回它，缺少的各级结构按默认值补全"""
+    categories = config_data.setdefault('categories', {})
+    schedule_settings = categories.setdefault('schedule_settings', {'title': '定时任务配置', 'settings': {}})
+    settings = schedule_settings.setdefault('settings', {})
+    tasks_node = settings.setdefault('tasks', {
+        'value': [],
+        'type': 'array',
+        'description': '定时任务列表'
+    })
+    tasks_node.setdefault('value', [])
+    return tasks_node
+
+def _index_tasks(tasks) -> Dict[Any, int]:
+    """建立 task_id -> 列表下标 的索引，ID 重复时保留第一个"""
+    index = {}
+    for i, task in enumerate(tasks):
+        index.setdefault(task.get('task_id'), i)
+    return index
+
+def _get_cached_task_index() -> Dict[Any, int]:
+    """获取缓存配置中定时任务的 ID 索引，配置未变化时复用"""
+    config_data = _get_cached_config()
+    with _cfg_cache_lock:
+        if _CFG_CACHE["data"] is config_data and _CFG_CACHE["task_index"] is not None:
+            return _CFG_CACHE["task_index"]
+
+    index = _index_tasks(_get_config_tasks(config_data))
+
+    with _cfg_cache_lock:
+        if _CFG_CACHE["data"] is config_data:
+            _CFG_CACHE["task_index"] = index
+    return index
+
 def load_config_file():
-    """从配置文件加载配置数据"""
+    """从配置文件加载配置数据，返回可修改的独立副本；文件未变化时从缓存的原始字节解析，不读盘"""
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        st = os.stat(CONFIG_PATH)
+        cached = _cached_config_entry(st)
+        if cached is not None:
+            return json_utils.loads(cached[1])
+        raw = Path(CONFIG_PATH).read_bytes()
+        _update_config_cache(st, json_utils.loads(raw), raw)
+        return json_utils.loads(raw)
     except Exception as e:
         logger.error(f"加载配置失败: {str(e)}")
         return {"categories": {}}
 
 def save_config_file(config_data):
-    """保存配置数据到配置文件"""
+    """保存配置数据到配置文件，内容与磁盘上的文件一致时跳过写入"""
     try:
-        with open(config_path, 'w', encoding='utf-8') as f:
-            json.dump(config_data, f, ensure_ascii=False, indent=4)
+        raw = json_utils.dumps(config_data, indent=True)
+        st = os.stat(CONFIG_PATH) if os.path.exists(CONFIG_PATH) else None
+        cached = _cached_config_entry(st) if st is not None else None
+        if cached is not None and cached[1] == raw:
+            _update_config_cache(st, config_data, raw)
+            return True
+
+        # 先写临时文件再替换，避免写入中途退出留下不完整的配置文件
+        json_utils.atomic_write(CONFIG_PATH, raw)
+        _update_config_cache(os.stat(CONFIG_PATH), config_data, raw)
         return True
     except Exception as e:
         logger.error(f"保存配置失败: {str(e)}")
@@ -408,7 +591,10 @@ def save_config():
             }), 415
 
         # 获取JSON数据
-        config_data = request.get_json()
+        try:
+            config_data = json_utils.loads(request.get_data(cache=False))
+        except json_utils.JSONDecodeError:
+            config_data = None
         if not config_data:
             return jsonify({
                 "status": "error",
@@ -416,36 +602,20 @@ def save_config():
                 "title": "错误"
             }), 400
 
-        # 读取当前配置
+        # 读取当前配置，并记下原有任务列表用于判断是否需要重新初始化定时任务
         current_config = load_config_file()
+        previous_tasks = _get_config_tasks(current_config)
 
         # 处理配置更新
         for key, value in config_data.items():
             # 处理任务配置
             if key == 'TASKS':
                 try:
-                    tasks = value if isinstance(value, list) else (json.loads(value) if isinstance(value, str) else [])
+                    tasks = value if isinstance(value, list) else (json_utils.loads(value) if isinstance(value, str) else [])
                     logger.debug(f"处理任务数据: {tasks}")
 
-                    # 确保schedule_settings结构存在
-                    if 'categories' not in current_config:
-                        current_config['categories'] = {}
-                    if 'schedule_settings' not in current_config['categories']:
-                        current_config['categories']['schedule_settings'] = {
-                            'title': '定时任务配置',
-                            'settings': {}
-                        }
-                    if 'settings' not in current_config['categories']['schedule_settings']:
-                        current_config['categories']['schedule_settings']['settings'] = {}
-                    if 'tasks' not in current_config['categories']['schedule_settings']['settings']:
-                        current_config['categories']['schedule_settings']['settings']['tasks'] = {
-                            'value': [],
-                            'type': 'array',
-                            'description': '定时任务列表'
-                        }
-
-                    # 更新任务列表
-                    current_config['categories']['schedule_settings']['settings']['tasks']['value'] = tasks
+                    # 确保schedule_settings结构存在，并更新任务列表
+                    _ensure_tasks_node(current_config)['value'] = tasks
                 except Exception as e:
                     logger.error(f"处理定时任务配置失败: {str(e)}")
                     return jsonify({
@@ -454,11 +624,7 @@ def save_config():
                         "title": "错误"
                     }), 400
             # 处理其他配置项
-            elif key in ['LISTEN_LIST', 'DEEPSEEK_BASE_URL', 'MODEL', 'DEEPSEEK_API_KEY', 'MAX_TOKEN', 'TEMPERATURE',
-                       'TOP_P', 'FREQUENCY_PENALTY', 'VISION_API_KEY', 'VISION_BASE_URL', 'VISION_TEMPERATURE', 'VISION_MODEL',
-                       'VISION_TOP_P', 'VISION_FREQUENCY_PENALTY', 'IMAGE_MODEL', 'TEMP_IMAGE_DIR', 'AUTO_MESSAGE', 'MIN_COUNTDOWN_HOURS', 'MAX_COUNTDOWN_HOURS',
-                       'QUIET_TIME_START', 'QUIET_TIME_END', 'TTS_API_URL', 'VOICE_DIR', 'MAX_GROUPS', 'AVATAR_DIR',
-                       'QUEUE_TIMEOUT']:
+            elif key in _ALLOWED_KEYS:
                 update_config_value(current_config, key, value)
             else:
                 logger.warning(f"未知的配置项: {key}")
@@ -473,9 +639,11 @@ def save_config():
 
         # 立即重新加载配置
         g.config_data = current_config
+        invalidate_config_groups_cache()
 
-        # 重新初始化定时任务
-        reinitialize_tasks()
+        # 仅在任务列表有变化时重新初始化定时任务（内容未变化时上面也不会写盘）
+        if _get_config_tasks(current_config) != previous_tasks:
+            reinitialize_tasks()
 
         return jsonify({
             "status": "success",
@@ -491,94 +659,110 @@ def save_config():
             "title": "错误"
         }), 500
 
+# 配置项映射表 - 前端字段名到配置文件中的路径
+_CONFIG_KEY_PATHS = {
+    'LISTEN_LIST': ('categories', 'user_settings', 'settings', 'listen_list', 'value'),
+    'DEEPSEEK_BASE_URL': ('categories', 'llm_settings', 'settings', 'base_url', 'value'),
+    'MODEL': ('categories', 'llm_settings', 'settings', 'model', 'value'),
+    'DEEPSEEK_API_KEY': ('categories', 'llm_settings', 'settings', 'api_key', 'value'),
+    'MAX_TOKEN': ('categories', 'llm_settings', 'settings', 'max_tokens', 'value'),
+    'TEMPERATURE': ('categories', 'llm_settings', 'settings', 'temperature', 'value'),
+    'TOP_P': ('categories', 'llm_settings', 'settings', 'top_p', 'value'),
+    'FREQUENCY_PENALTY': ('categories', 'llm_settings', 'settings', 'frequency_penalty', 'value'),
+    'VISION_API_KEY': ('categories', 'media_settings', 'settings', 'image_recognition', 'api_key', 'value'),
+    'VISION_BASE_URL': ('categories', 'media_settings', 'settings', 'image_recognition', 'base_url', 'value'),
+    'VISION_TEMPERATURE': ('categories', 'media_settings', 'settings', 'image_recognition', 'temperature', 'value'),
+    'VISION_MODEL': ('categories', 'media_settings', 'settings', 'image_recognition', 'model', 'value'),
+    'VISION_TOP_P': ('categories', 'media_settings', 'settings', 'image_recognition', 'top_p', 'value'),
+    'VISION_FREQUENCY_PENALTY': ('categories', 'media_settings', 'settings', 'image_recognition', 'frequency_penalty', 'value'),
+    'IMAGE_MODEL': ('categories', 'media_settings', 'settings', 'image_generation', 'model', 'value'),
+    'TEMP_IMAGE_DIR': ('categories', 'media_settings', 'settings', 'image_generation', 'temp_dir', 'value'),
+    'TTS_API_URL': ('categories', 'media_settings', 'settings', 'text_to_speech', 'tts_api_url', 'value'),
+    'VOICE_DIR': ('categories', 'media_settings', 'settings', 'text_to_speech', 'voice_dir', 'value'),
+    'AUTO_MESSAGE': ('categories', 'behavior_settings', 'settings', 'auto_message', 'content', 'value'),
+    'MIN_COUNTDOWN_HOURS': ('categories', 'behavior_settings', 'settings', 'auto_message', 'countdown', 'min_hours', 'value'),
+    'MAX_COUNTDOWN_HOURS': ('categories', 'behavior_settings', 'settings', 'auto_message', 'countdown', 'max_hours', 'value'),
+    'QUIET_TIME_START': ('categories', 'behavior_settings', 'settings', 'quiet_time', 'start', 'value'),
+    'QUIET_TIME_END': ('categories', 'behavior_settings', 'settings', 'quiet_time', 'end', 'value'),
+    'QUEUE_TIMEOUT': ('categories', 'behavior_settings', 'settings', 'message_queue', 'timeout', 'value'),
+    'MAX_GROUPS': ('categories', 'behavior_settings', 'settings', 'context', 'max_groups', 'value'),
+    'AVATAR_DIR': ('categories', 'behavior_settings', 'settings', 'context', 'avatar_dir', 'value'),
+}
+
+# /save 接口允许更新的配置项
+_ALLOWED_KEYS = frozenset(_CONFIG_KEY_PATHS)
+
+# 需要从字符串转换为数字的配置项，其中一部分还需转为整数
+_NUMERIC_CONFIG_KEYS = frozenset((
+    'MAX_TOKEN', 'TEMPERATURE', 'TOP_P', 'FREQUENCY_PENALTY', 'VISION_TEMPERATURE',
+    'VISION_TOP_P', 'VISION_FREQUENCY_PENALTY', 'MIN_COUNTDOWN_HOURS', 'MAX_COUNTDOWN_HOURS', 'MAX_GROUPS',
+    'QUEUE_TIMEOUT'
+))
+_INT_CONFIG_KEYS = frozenset(('MAX_TOKEN', 'MAX_GROUPS', 'QUEUE_TIMEOUT'))
+
+def _make_config_setter(path):
+    """根据配置路径生成写入函数，缺失的中间层级自动创建"""
+    # 路径片段在各配置项间大量重复，统一驻留以便字典查找时按身份比较
+    path = tuple(sys.intern(part) for part in path)
+    parents, leaf = path[:-1], path[-1]
+
+    def setter(config_data, value):
+        current = config_data
+        for part in parents:
+            current = current.setdefault(part, {})
+        current[leaf] = value
+
+    return setter
+
+def _make_llm_setter(name):
+    """API相关配置直接替换整个配置项，并确保llm_settings结构存在"""
+    name = sys.intern(name)
+
+    def setter(config_data, value):
+        categories = config_data.setdefault('categories', {})
+        llm_settings = categories.setdefault('llm_settings', {'title': '大语言模型配置', 'settings': {}})
+        llm_settings.setdefault('settings', {})[name] = {'value': value}
+
+    return setter
+
+# 每个配置项对应的写入函数，在模块加载时生成一次
+_CONFIG_SETTERS = {key: _make_config_setter(path) for key, path in _CONFIG_KEY_PATHS.items()}
+_CONFIG_SETTERS['DEEPSEEK_BASE_URL'] = _make_llm_setter('base_url')
+_CONFIG_SETTERS['MODEL'] = _make_llm_setter('model')
+_CONFIG_SETTERS['DEEPSEEK_API_KEY'] = _make_llm_setter('api_key')
+
 def update_config_value(config_data, key, value):
     """更新配置值到正确的位置"""
     try:
-        # 配置项映射表 - 修正路径以匹配实际配置结构
-        mapping = {
-            'LISTEN_LIST': ['categories', 'user_settings', 'settings', 'listen_list', 'value'],
-            'DEEPSEEK_BASE_URL': ['categories', 'llm_settings', 'settings', 'base_url', 'value'],
-            'MODEL': ['categories', 'llm_settings', 'settings', 'model', 'value'],
-            'DEEPSEEK_API_KEY': ['categories', 'llm_settings', 'settings', 'api_key', 'value'],
-            'MAX_TOKEN': ['categories', 'llm_settings', 'settings', 'max_tokens', 'value'],
-            'TEMPERATURE': ['categories', 'llm_settings', 'settings', 'temperature', 'value'],
-            'TOP_P': ['categories', 'llm_settings', 'settings', 'top_p', 'value'],
-            'FREQUENCY_PENALTY': ['categories', 'llm_settings', 'settings', 'frequency_penalty', 'value'],
-            'VISION_API_KEY': ['categories', 'media_settings', 'settings', 'image_recognition', 'api_key', 'value'],
-            'VISION_BASE_URL': ['categories', 'media_settings', 'settings', 'image_recognition', 'base_url', 'value'],
-            'VISION_TEMPERATURE': ['categories', 'media_settings', 'settings', 'image_recognition', 'temperature', 'value'],
-            'VISION_MODEL': ['categories', 'media_settings', 'settings', 'image_recognition', 'model', 'value'],
-            'VISION_TOP_P': ['categories', 'media_settings', 'settings', 'image_recognition', 'top_p', 'value'],
-            'VISION_FREQUENCY_PENALTY': ['categories', 'media_settings', 'settings', 'image_recognition', 'frequency_penalty', 'value'],
-            'IMAGE_MODEL': ['categories', 'media_settings', 'settings', 'image_generation', 'model', 'value'],
-            'TEMP_IMAGE_DIR': ['categories', 'media_settings', 'settings', 'image_generation', 'temp_dir', 'value'],
-            'TTS_API_URL': ['categories', 'media_settings', 'settings', 'text_to_speech', 'tts_api_url', 'value'],
-            'VOICE_DIR': ['categories', 'media_settings', 'settings', 'text_to_speech', 'voice_dir', 'value'],
-            'AUTO_MESSAGE': ['categories', 'behavior_settings', 'settings', 'auto_message', 'content', 'value'],
-            'MIN_COUNTDOWN_HOURS': ['categories', 'behavior_settings', 'settings', 'auto_message', 'countdown', 'min_hours', 'value'],
-            'MAX_COUNTDOWN_HOURS': ['categories', 'behavior_settings', 'settings', 'auto_message', 'countdown', 'max_hours', 'value'],
-            'QUIET_TIME_START': ['categories', 'behavior_settings', 'settings', 'quiet_time', 'start', 'value'],
-            'QUIET_TIME_END': ['categories', 'behavior_settings', 'settings', 'quiet_time', 'end', 'value'],
-            'QUEUE_TIMEOUT': ['categories', 'behavior_settings', 'settings', 'message_queue', 'timeout', 'value'],
-            'MAX_GROUPS': ['categories', 'behavior_settings', 'settings', 'context', 'max_groups', 'value'],
-            'AVATAR_DIR': ['categories', 'behavior_settings', 'settings', 'context', 'avatar_dir', 'value'],
-        }
+        setter = _CONFIG_SETTERS.get(key)
+        if setter is None:
+            logger.warning(f"未知的配置项: {key}")
+            return
 
-        if key in mapping:
-            path = mapping[key]
-            current = config_data
-
-            # 特殊处理 LISTEN_LIST，确保它始终是列表类型
-            if key == 'LISTEN_LIST' and isinstance(value, str):
-                value = value.split(',')
-                value = [item.strip() for item in value if item.strip()]
-
-            # 特殊处理API相关配置
-            if key in ['DEEPSEEK_BASE_URL', 'MODEL', 'DEEPSEEK_API_KEY']:
-                # 确保llm_settings结构存在
-                if 'categories' not in current:
-                    current['categories'] = {}
-                if 'llm_settings' not in current['categories']:
-                    current['categories']['llm_settings'] = {'title': '大语言模型配置', 'settings': {}}
-                if 'settings' not in current['categories']['llm_settings']:
-                    current['categories']['llm_settings']['settings'] = {}
-
-                # 更新对应的配置项
-                if key == 'DEEPSEEK_BASE_URL':
-                    current['categories']['llm_settings']['settings']['base_url'] = {'value': value}
-                elif key == 'MODEL':
-                    current['categories']['llm_settings']['settings']['model'] = {'value': value}
-                elif key == 'DEEPSEEK_API_KEY':
-                    current['categories']['llm_settings']['settings']['api_key'] = {'value': value}
-                return
+        # 特殊处理 LISTEN_LIST，确保它始终是列表类型
+        if key == 'LISTEN_LIST' and isinstance(value, str):
+            value = [item.strip() for item in value.split(',') if item.strip()]
 
-            # 遍历路径直到倒数第二个元素
-            for part in path[:-1]:
-                if part not in current:
-                    current[part] = {}
-                current = current[part]
+        # 确保数值类型正确
+        elif isinstance(value, str) and key in _NUMERIC_CONFIG_KEYS:
+            try:
+                # 尝试转换为数字
+                value = float(value)
+                # 对于整数类型配置，转为整数
+                if key in _INT_CONFIG_KEYS:
+                    value = int(value)
+            except ValueError:
+                pass
 
-            # 设置最终值，确保类型正确
-            if isinstance(value, str) and key in ['MAX_TOKEN', 'TEMPERATURE', 'TOP_P', 'FREQUENCY_PENALTY', 'VISION_TEMPERATURE',
-                                               'VISION_TOP_P', 'VISION_FREQUENCY_PENALTY', 'MIN_COUNTDOWN_HOURS', 'MAX_COUNTDOWN_HOURS', 'MAX_GROUPS',
-                                               'QUEUE_TIMEOUT']:
-                try:
-                    # 尝试转换为数字
-                    value = float(value)
-                    # 对于整数类型配置，转为整数
-                    if key in ['MAX_TOKEN', 'MAX_GROUPS', 'QUEUE_TIMEOUT']:
-                        value = int(value)
-                except ValueError:
-                    pass
-
-            current[path[-1]] = value
-            logger.debug(f"已更新配置 {key}: {value}")
-        else:
-            logger.warning(f"未知的配置项: {key}")
+        setter(config_data, value)
+        logger.debug(f"已更新配置 {key}: {value}")
 
     except Exception as e:
         logger.error(f"更新配置值失败 {key}: {str(e)}")
 
+# 当前背景图片文件名，按上传目录的修改时间判断是否需要重新扫描
+_BG = {"mtime_ns": 0, "name": None}
+
 # 添加上传处理路由
 @app.route('/upload_background', methods=['POST'])
 def upload_background():
@@ -594,11 +778,16 @@ def upload_background():
         return jsonify({"status": "error", "message": "文件名无效"})
 
     filename = secure_filename(file.filename)
-    # 清理旧的背景图片
-    for old_file in os.listdir(app.config['UPLOAD_FOLDER']):
-        os.remove(os.path.join(app.config['UPLOAD_FOLDER'], old_file))
+    dest = os.path.join(UPLOAD_FOLDER, filename)
+    # 清理旧的背景图片，同名文件会被直接覆盖，无需先删除
+    with os.scandir(UPLOAD_FOLDER) as it:
+        for entry in it:
+            if entry.name != filename and entry.is_file():
+                os.unlink(entry.path)
     # 保存新图片
-    file.save(os.path.join(app.config['UPLOAD_FOLDER'], filename))
+    file.save(dest)
+    _BG["name"] = filename
+    _BG["mtime_ns"] = os.stat(UPLOAD_FOLDER).st_mtime_ns
     return jsonify({
         "status": "success",
         "message": "背景图片已更新",
@@ -608,20 +797,25 @@ def upload_background():
 # 添加背景图片目录的路由
 @app.route('/background_image/<filename>')
 def background_image(filename):
-    return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+    return send_from_directory(UPLOAD_FOLDER, filename)
 
 # 添加获取背景图片路由
 @app.route('/get_background')
 def get_background():
     """获取当前背景图片"""
     try:
-        # 获取背景图片目录中的第一个文件
-        files = os.listdir(app.config['UPLOAD_FOLDER'])
-        if files:
+        # 目录未变化时直接使用缓存的文件名，否则取背景图片目录中的第一个文件
+        mtime_ns = os.stat(UPLOAD_FOLDER).st_mtime_ns
+        if mtime_ns != _BG["mtime_ns"]:
+            with os.scandir(UPLOAD_FOLDER) as it:
+                _BG["name"] = next((entry.name for entry in it if entry.is_file()), None)
+            _BG["mtime_ns"] = mtime_ns
+        first_file = _BG["name"]
+        if first_file:
             # 返回找到的第一个图片
             return jsonify({
                 "status": "success",
-                "path": f"/background_image/{files[0]}"
+                "path": f"/background_image/{first_file}"
             })
         return jsonify({
             "status": "success",
@@ -637,9 +831,10 @@ def get_background():
 def load_config():
     """在每次请求之前加载配置"""
     try:
-        g.config_data = load_config_file()
+        g.config_data = _get_cached_config()
     except Exception as e:
         logger.error(f"加载配置失败: {str(e)}")
+        g.config_data = {"categories": {}}
 
 @app.route('/dashboard')
 def dashboard():
@@ -652,70 +847,91 @@ def dashboard():
     if show_announcement_now:
         announcement_shown_this_instance = True # 标记为已显示
 
-    # 使用 g 中的配置数据 (如果之前有)
-    config_groups = g.config_data.get('categories', {})
-
+    # 控制台模板不渲染配置分组，无需准备配置数据
     return render_template(
         'dashboard.html',
         is_local=is_local_network(),
         active_page='dashboard',
-        config_groups=config_groups,
         show_announcement=show_announcement_now # 将显示标记传递给模板
     )
 
+# 系统信息快照，由后台采样线程每秒整体替换一次
+_SYS_SNAPSHOT = {}
+_SYS_SAMPLE_INTERVAL = 1.0
+_sys_sampler_thread = None
+_sys_sampler_lock = threading.Lock()
+
+def _sample_system_info(last_bytes):
+    """采集一次系统信息，返回 (快照, 本次网络计数)"""
+    cpu_percent = psutil.cpu_percent()
+    memory = psutil.virtual_memory()
+    disk = psutil.disk_usage('/')
+    net = psutil.net_io_counters()
+
+    # 计算网络速度
+    current_time = time.time()
+    time_delta = (current_time - last_bytes['time']) or _SYS_SAMPLE_INTERVAL
+
+    # 计算每秒的字节数并转换为 KB/s
+    upload_speed = (net.bytes_sent - last_bytes['sent']) / time_delta / 1024
+    download_speed = (net.bytes_recv - last_bytes['recv']) / time_delta / 1024
+
+    snapshot = {
+        'cpu': cpu_percent,
+        'memory': {
+            'total': round(memory.total / (1024**3), 2),
+            'used': round(memory.used / (1024**3), 2),
+            'percent': memory.percent
+        },
+        'disk': {
+            'total': round(disk.total / (1024**3), 2),
+            'used': round(disk.used / (1024**3), 2),
+            'percent': disk.percent
+        },
+        'network': {
+            'upload': round(upload_speed, 2),
+            'download': round(download_speed, 2)
+        }
+    }
+    current_bytes = {
+        'sent': net.bytes_sent,
+        'recv': net.bytes_recv,
+        'time': current_time
+    }
+    return snapshot, current_bytes
+
+def _system_info_sampler(last_bytes):
+    """后台采样线程，定期刷新系统信息快照"""
+    global _SYS_SNAPSHOT
+    while True:
+        time.sleep(_SYS_SAMPLE_INTERVAL)
+        try:
+            _SYS_SNAPSHOT, last_bytes = _sample_system_info(last_bytes)
+        except Exception as e:
+            logger.error(f"采集系统信息失败: {str(e)}")
+
+def _ensure_system_info_sampler():
+    """首次请求时同步采集一次并启动后台采样线程"""
+    global _SYS_SNAPSHOT, _sys_sampler_thread
+    with _sys_sampler_lock:
+        if _sys_sampler_thread is not None:
+            return
+        snapshot, last_bytes = _sample_system_info({'sent': 0, 'recv': 0, 'time': time.time()})
+        _SYS_SNAPSHOT = snapshot
+        _sys_sampler_thread = threading.Thread(
+            target=_system_info_sampler,
+            args=(last_bytes,),
+            name="system-info-sampler",
+            daemon=True
+        )
+        _sys_sampler_thread.start()
+
 @app.route('/system_info')
 def system_info():
     """获取系统信息"""
     try:
-        # 创建静态变量存储上次的值
-        if not hasattr(system_info, 'last_bytes'):
-            system_info.last_bytes = {
-                'sent': 0,
-                'recv': 0,
-                'time': time.time()
-            }
-
-        cpu_percent = psutil.cpu_percent()
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
-        net = psutil.net_io_counters()
-
-        # 计算网络速度
-        current_time = time.time()
-        time_delta = current_time - system_info.last_bytes['time']
-
-        # 计算每秒的字节数
-        upload_speed = (net.bytes_sent - system_info.last_bytes['sent']) / time_delta
-        download_speed = (net.bytes_recv - system_info.last_bytes['recv']) / time_delta
-
-        # 更新上次的值
-        system_info.last_bytes = {
-            'sent': net.bytes_sent,
-            'recv': net.bytes_recv,
-            'time': current_time
-        }
-
-        # 转换为 KB/s
-        upload_speed = upload_speed / 1024
-        download_speed = download_speed / 1024
-
-        return jsonify({
-            'cpu': cpu_percent,
-            'memory': {
-                'total': round(memory.total / (1024**3), 2),
-                'used': round(memory.used / (1024**3), 2),
-                'percent': memory.percent
-            },
-            'disk': {
-                'total': round(disk.total / (1024**3), 2),
-                'used': round(disk.used / (1024**3), 2),
-                'percent': disk.percent
-            },
-            'network': {
-                'upload': round(upload_speed, 2),
-                'download': round(download_speed, 2)
-            }
-        })
+        _ensure_system_info_sampler()
+        return jsonify(_SYS_SNAPSHOT)
     except Exception as e:
         logger.error(f"获取系统信息失败: {str(e)}")
         return jsonify({
@@ -809,11 +1025,8 @@ def start_bot_process():
             [sys.executable, 'run.py'],
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
+            bufsize=0,  # 日志线程直接按块读取原始输出并自行解码
             env=env,
-            encoding='utf-8',
-            errors='replace',
             creationflags=creationflags if sys.platform.startswith('win') else 0,
             preexec_fn=preexec_fn
         )
@@ -837,37 +1050,85 @@ def start_bot_process():
         logger.error(f"启动机器人失败: {str(e)}")
         return False, str(e)
 
+# 每次从机器人输出管道读取的最大字节数
+LOG_READ_CHUNK_SIZE = 65536
+
 def start_log_reading_thread():
     """启动日志读取线程"""
+    process = bot_process
+
     def read_output():
         try:
-            while bot_process and bot_process.poll() is None:
-                if bot_process.stdout:
-                    line = bot_process.stdout.readline()
-                    if line:
-                        try:
-                            # 尝试解码并清理日志内容
-                            line = line.strip()
-                            if isinstance(line, bytes):
-                                line = line.decode('utf-8', errors='replace')
-                            timestamp = datetime.datetime.now().strftime('%H:%M:%S')
-                            bot_logs.put(f"[{timestamp}] {line}")
-                        except Exception as e:
-                            logger.error(f"日志处理错误: {str(e)}")
-                            continue
+            fd = process.stdout.fileno()
+            buffer = bytearray()
+            while True:
+                # 按块读取，一次系统调用可取回多行日志；返回空字节表示进程已关闭输出
+                chunk = os.read(fd, LOG_READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                buffer += chunk
+                # 同一块中的所有行先在本地格式化，最后一次加锁批量写入
+                batch = []
+                start = 0
+                newline = buffer.find(b'\n', start)
+                while newline != -1:
+                    _format_log_line(buffer[start:newline], batch)
+                    start = newline + 1
+                    newline = buffer.find(b'\n', start)
+                del buffer[:start]
+                if batch:
+                    push_bot_logs(batch)
+            # 输出末尾可能还有不带换行的最后一行
+            if buffer:
+                batch = []
+                _format_log_line(buffer, batch)
+                push_bot_logs(batch)
         except Exception as e:
             logger.error(f"读取日志失败: {str(e)}")
-            bot_logs.put(f"[ERROR] 读取日志失败: {str(e)}")
+            push_bot_log(f"[ERROR] 读取日志失败: {str(e)}")
 
     thread = threading.Thread(target=read_output, daemon=True)
     thread.start()
 
-def get_bot_uptime():
-    """获取机器人运行时间"""
-    if not bot_start_time or not bot_process or bot_process.poll() is not None:
-        return "0分钟"
+def push_bot_log(message: str):
+    """写入一条机器人日志，队列已满时丢弃最旧的一条，不阻塞日志读取线程"""
+    with bot_logs_lock:
+        bot_logs.append(message)
+
+def push_bot_logs(messages):
+    """批量写入机器人日志，整批只加一次锁"""
+    with bot_logs_lock:
+        bot_logs.extend(messages)
+
+# 最近一次格式化的 (秒, 时间字符串)，同一秒内的日志行复用
+_log_timestamp_cache = (-1, '')
+
+def _log_timestamp() -> str:
+    """返回当前时间的 HH:MM:SS 字符串，每秒只格式化一次"""
+    global _log_timestamp_cache
+    sec = int(time.time())
+    cached_sec, cached_str = _log_timestamp_cache
+    if sec != cached_sec:
+        cached_str = time.strftime('%H:%M:%S', time.localtime(sec))
+        _log_timestamp_cache = (sec, cached_str)
+    return cached_str
+
+def _format_log_line(raw_line, batch: list):
+    """解码并清理一行日志，加上时间戳后追加到 batch"""
+    try:
+        line = bytes(raw_line).decode('utf-8', errors='replace').strip()
+        batch.append(f"[{_log_timestamp()}] {line}")
+    except Exception as e:
+        logger.error(f"日志处理错误: {str(e)}")
 
-    delta = datetime.datetime.now() - bot_start_time
+# 机器人状态缓存 (时间, 进程对象, 启动时间, 是否运行, 运行时间字符串)，
+# 进程对象或启动时间变化时立即失效，否则在有效期内复用，合并前端的频繁轮询
+BOT_STATUS_TTL = 0.5
+_bot_status_cache = (0.0, None, None, False, "0分钟")
+
+def _format_uptime(start_time) -> str:
+    """将启动时间格式化为运行时长字符串"""
+    delta = datetime.datetime.now() - start_time
     total_seconds = int(delta.total_seconds())
     hours = total_seconds // 3600
     minutes = (total_seconds % 3600) // 60
@@ -880,6 +1141,25 @@ def get_bot_uptime():
     else:
         return f"{seconds}秒"
 
+def get_bot_status():
+    """获取机器人是否在运行及运行时间，返回 (is_running, uptime)"""
+    global _bot_status_cache
+    process, start_time = bot_process, bot_start_time
+    now = time.monotonic()
+    checked_at, cached_process, cached_start, running, uptime = _bot_status_cache
+    if (cached_process is process and cached_start is start_time
+            and now - checked_at < BOT_STATUS_TTL):
+        return running, uptime
+
+    running = process is not None and process.poll() is None
+    uptime = _format_uptime(start_time) if running and start_time else "0分钟"
+    _bot_status_cache = (now, process, start_time, running, uptime)
+    return running, uptime
+
+def get_bot_uptime():
+    """获取机器人运行时间"""
+    return get_bot_status()[1]
+
 @app.route('/start_bot')
 def start_bot():
     """启动机器人"""
@@ -892,15 +1172,18 @@ def start_bot():
 @app.route('/get_bot_logs')
 def get_bot_logs():
     """获取机器人日志"""
-    logs = []
-    while not bot_logs.empty():
-        logs.append(bot_logs.get())
+    global bot_logs
+    # 加锁换入新的空队列，再在锁外读取旧队列，一次请求只需获取一次锁
+    with bot_logs_lock:
+        pending, bot_logs = bot_logs, deque(maxlen=BOT_LOG_MAXLEN)
+    logs = list(pending)
+    is_running, uptime = get_bot_status()
 
     return jsonify({
         'status': 'success',
         'logs': logs,
-        'uptime': get_bot_uptime(),
-        'is_running': bot_process is not None and bot_process.poll() is None
+        'uptime': uptime,
+        'is_running': is_running
     })
 
 def terminate_bot_process(force=False):
@@ -911,6 +1194,17 @@ def terminate_bot_process(force=False):
         return False, "机器人未在运行"
 
     try:
+        is_windows = sys.platform.startswith('win')
+
+        # 机器人以独立进程组启动，先记下进程组ID，主进程退出后仍可清理组内残留进程
+        pgid = None
+        getpgid = getattr(os, 'getpgid', None)
+        if not is_windows and getpgid:
+            try:
+                pgid = getpgid(bot_process.pid)
+            except OSError:
+                pass
+
         # 首先尝试正常终止进程
         bot_process.terminate()
 
@@ -924,28 +1218,32 @@ def terminate_bot_process(force=False):
                 bot_process.wait()
 
         # 确保所有子进程都被终止
-        if sys.platform.startswith('win'):
-            subprocess.run(['taskkill', '/F', '/T', '/PID', str(bot_process.pid)],
-                         capture_output=True)
-        else:
+        if is_windows:
+            # 主进程已退出时 taskkill 也找不到进程树，只在仍在运行时调用
+            if bot_process.poll() is None:
+                subprocess.run(['taskkill', '/F', '/T', '/PID', str(bot_process.pid)],
+                             capture_output=True)
+        elif pgid is not None:
             # 使用 getattr 避免在 Windows 上直接引用不存在的属性
             killpg = getattr(os, 'killpg', None)
-            getpgid = getattr(os, 'getpgid', None)
-            if killpg and getpgid:
-                import signal
-                killpg(getpgid(bot_process.pid), signal.SIGTERM)
-            else:
-                bot_process.kill()
+            try:
+                killpg(pgid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass  # 进程组内已没有进程
+        elif bot_process.poll() is None:
+            bot_process.kill()
 
         # 清理进程对象
         bot_process = None
         bot_start_time = None
 
         # 添加日志记录
-        timestamp = datetime.datetime.now().strftime('%H:%M:%S')
-        bot_logs.put(f"[{timestamp}] 正在关闭监听线程...")
-        bot_logs.put(f"[{timestamp}] 正在关闭系统...")
-        bot_logs.put(f"[{timestamp}] 系统已退出")
+        timestamp = _log_timestamp()
+        push_bot_logs((
+            f"[{timestamp}] 正在关闭监听线程...",
+            f"[{timestamp}] 正在关闭系统...",
+            f"[{timestamp}] 系统已退出",
+        ))
 
         return True, "机器人已停止"
 
@@ -955,8 +1253,8 @@ def terminate_bot_process(force=False):
 
 def clear_bot_logs():
     """清空机器人日志队列"""
-    while not bot_logs.empty():
-        bot_logs.get()
+    with bot_logs_lock:
+        bot_logs.clear()
 
 @app.route('/stop_bot')
 def stop_bot():
@@ -974,49 +1272,25 @@ def config():
         return redirect(url_for('login'))
 
     # 直接从配置文件读取任务数据
-    tasks = []
+    tasks_json = '[]'
     try:
-        config_path = os.path.join(ROOT_DIR, 'src/config/config.json')
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config_data = json.load(f)
-            if 'categories' in config_data and 'schedule_settings' in config_data['categories']:
-                if 'settings' in config_data['categories']['schedule_settings'] and 'tasks' in config_data['categories']['schedule_settings']['settings']:
-                    tasks = config_data['categories']['schedule_settings']['settings']['tasks'].get('value', [])
+        tasks_json = _get_cached_tasks_json()
     except Exception as e:
         logger.error(f"读取任务数据失败: {str(e)}")
 
     config_groups = parse_config_groups()  # 获取配置组
 
-    logger.debug(f"传递给前端的任务列表: {tasks}")
+    logger.debug(f"传递给前端的任务列表: {tasks_json}")
 
     return render_template(
         'config.html',
         config_groups=config_groups,  # 传递配置组
-        tasks_json=json.dumps(tasks, ensure_ascii=False),  # 直接传递任务列表JSON
+        tasks_json=tasks_json,  # 直接传递任务列表JSON
         is_local=is_local_network(),
         active_page='config'
     )
 
-# 在 app 初始化后添加
-@app.route('/static/<path:filename>')
-def serve_static(filename):
-    """提供静态文件服务"""
-    static_folder = app.static_folder
-    if static_folder is None:
-        static_folder = os.path.join(ROOT_DIR, 'src/webui/static')
-    return send_from_directory(static_folder, filename)
-
-@app.route('/execute_command', methods=['POST'])
-def execute_command():
-    """执行控制台命令"""
-    try:
-        command = (request.json or {}).get('command', '').strip()
-
-        # 处理内置命令
-        if command.lower() == 'help':
-            return jsonify({
-                'status': 'success',
-                'output': '''可用命令:
+CONSOLE_HELP_TEXT = '''可用命令:
 help - 显示帮助信息
 clear - 清空日志
 status - 显示系统状态
@@ -1032,122 +1306,227 @@ cd - 切换目录
 echo - 显示消息
 type - 显示文件内容
 等...'''
-            })
 
-        elif command.lower() == 'clear':
-            # 清空日志队列
-            clear_bot_logs()
-            return jsonify({
-                'status': 'success',
-                'output': '',  # 返回空输出，让前端清空日志
-                'clear': True  # 添加标记，告诉前端需要清空日志
-            })
+def _cmd_help():
+    return jsonify({
+        'status': 'success',
+        'output': CONSOLE_HELP_TEXT
+    })
 
-        elif command.lower() == 'status':
-            if bot_process and bot_process.poll() is None:
-                return jsonify({
-                    'status': 'success',
-                    'output': f'机器人状态: 运行中\n运行时间: {get_bot_uptime()}'
-                })
-            else:
-                return jsonify({
-                    'status': 'success',
-                    'output': '机器人状态: 已停止'
-                })
+def _cmd_clear():
+    # 清空日志队列
+    clear_bot_logs()
+    return jsonify({
+        'status': 'success',
+        'output': '',  # 返回空输出，让前端清空日志
+        'clear': True  # 添加标记，告诉前端需要清空日志
+    })
 
-        elif command.lower() == 'version':
-            return jsonify({
-                'status': 'success',
-                'output': 'KouriChat v1.3.1'
-            })
+def _cmd_status():
+    is_running, uptime = get_bot_status()
+    if is_running:
+        return jsonify({
+            'status': 'success',
+            'output': f'机器人状态: 运行中\n运行时间: {uptime}'
+        })
+    return jsonify({
+        'status': 'success',
+        'output': '机器人状态: 已停止'
+    })
 
-        elif command.lower() == 'memory':
-            memory = psutil.virtual_memory()
+def _cmd_version():
+    return jsonify({
+        'status': 'success',
+        'output': 'KouriChat v1.3.1'
+    })
+
+# 内存采样缓存 (采样时间, 输出文本)，有效期内的重复查询直接复用
+MEMORY_SAMPLE_TTL = 0.5
+MEMORY_OUTPUT_FORMAT = '内存使用: {percent}% ({used:.1f}GB/{total:.1f}GB)'
+_memory_output_cache = (-MEMORY_SAMPLE_TTL, '')
+
+def _cmd_memory():
+    global _memory_output_cache
+    now = time.monotonic()
+    sampled_at, output = _memory_output_cache
+    if now - sampled_at >= MEMORY_SAMPLE_TTL:
+        memory = psutil.virtual_memory()
+        output = MEMORY_OUTPUT_FORMAT.format(
+            percent=memory.percent,
+            used=memory.used / 1024**3,
+            total=memory.total / 1024**3
+        )
+        _memory_output_cache = (now, output)
+    return jsonify({
+        'status': 'success',
+        'output': output
+    })
+
+def _cmd_start():
+    success, message = start_bot_process()
+    return jsonify({
+        'status': 'success' if success else 'error',
+        'output' if success else 'error': message
+    })
+
+def _cmd_stop():
+    success, message = terminate_bot_process(force=True)
+    return jsonify({
+        'status': 'success' if success else 'error',
+        'output' if success else 'error': message
+    })
+
+def _cmd_restart():
+    # 先停止；force=True 时 terminate_bot_process 会等待进程退出后才返回，无需额外等待
+    if bot_process and bot_process.poll() is None:
+        success, _ = terminate_bot_process(force=True)
+        if not success:
             return jsonify({
-                'status': 'success',
-                'output': f'内存使用: {memory.percent}% ({memory.used/1024/1024/1024:.1f}GB/{memory.total/1024/1024/1024:.1f}GB)'
+                'status': 'error',
+                'error': '重启失败: 无法停止当前进程'
             })
 
-        elif command.lower() == 'start':
-            success, message = start_bot_process()
+    # 然后重新启动
+    success, message = start_bot_process()
+    if success:
+        return jsonify({
+            'status': 'success',
+            'output': '机器人已重启'
+        })
+    return jsonify({
+        'status': 'error',
+        'error': f'重启失败: {message}'
+    })
+
+# 控制台命令的超时时间(秒)和每个输出流最多保留的字节数
+COMMAND_TIMEOUT = 30
+COMMAND_OUTPUT_LIMIT = 1024 * 1024
+COMMAND_TRUNCATED_MARK = "\n...（输出过长，已截断）"
+
+def _drain_pipe(pipe, buffer: bytearray, truncated: list):
+    """按块读取管道直到关闭，只保留前 COMMAND_OUTPUT_LIMIT 字节
+
+    超出部分继续读取并丢弃，避免子进程因管道写满而挂起。
+    管道由读取线程在退出时关闭，避免文件描述符在读取期间被关闭后复用。
+    """
+    try:
+        fd = pipe.fileno()
+        while True:
+            chunk = os.read(fd, LOG_READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            room = COMMAND_OUTPUT_LIMIT - len(buffer)
+            if room > 0:
+                buffer += chunk[:room]
+            if len(chunk) > room and not truncated:
+                truncated.append(True)
+    except OSError:
+        pass
+    finally:
+        pipe.close()
+
+def _decode_command_output(buffer: bytearray, truncated: list) -> str:
+    # 后台进程仍持有管道时读取线程可能还在追加数据，先取快照再解码
+    text = bytes(buffer).decode('utf-8', errors='replace')
+    return text + COMMAND_TRUNCATED_MARK if truncated else text
+
+def _kill_command_tree(process):
+    """结束命令进程及其启动的全部子进程，使它们持有的管道能够关闭"""
+    try:
+        if sys.platform.startswith('win'):
+            subprocess.run(['taskkill', '/F', '/T', '/PID', str(process.pid)],
+                           capture_output=True)
+        else:
+            # 命令在独立会话中启动，进程组ID即其PID
+            killpg = getattr(os, 'killpg', None)
+            killpg(process.pid, signal.SIGKILL)
+    except OSError:
+        pass  # 进程组内已没有进程
+    if process.poll() is None:
+        process.kill()
+    process.wait()
+
+def _run_shell_command(command: str):
+    """执行CMD命令并返回输出"""
+    try:
+        # 使用subprocess执行命令，由两个线程分别读取 stdout 和 stderr；
+        # 命令放在独立的进程组中，超时时可以连同其子进程一起结束
+        process = subprocess.Popen(
+            command,
+            shell=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=0,
+            creationflags=0x00000200 if sys.platform.startswith('win') else 0,  # CREATE_NEW_PROCESS_GROUP
+            start_new_session=not sys.platform.startswith('win')
+        )
+        stdout, stderr = bytearray(), bytearray()
+        stdout_truncated, stderr_truncated = [], []
+        readers = [
+            threading.Thread(target=_drain_pipe, args=(process.stdout, stdout, stdout_truncated), daemon=True),
+            threading.Thread(target=_drain_pipe, args=(process.stderr, stderr, stderr_truncated), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+
+        try:
+            process.wait(timeout=COMMAND_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            _kill_command_tree(process)
             return jsonify({
-                'status': 'success' if success else 'error',
-                'output' if success else 'error': message
+                'status': 'error',
+                'error': '命令执行超时'
             })
-
-        elif command.lower() == 'stop':
-            success, message = terminate_bot_process(force=True)
+        finally:
+            # 命令启动的后台进程可能仍持有管道，读取线程最多再等一秒；
+            # 未退出的线程会在管道关闭后自行结束并关闭管道
+            for reader in readers:
+                reader.join(timeout=1)
+
+        # 如果有错误输出
+        if stderr:
             return jsonify({
-                'status': 'success' if success else 'error',
-                'output' if success else 'error': message
+                'status': 'error',
+                'error': _decode_command_output(stderr, stderr_truncated)
             })
 
-        elif command.lower() == 'restart':
-            # 先停止
-            if bot_process and bot_process.poll() is None:
-                success, _ = terminate_bot_process(force=True)
-                if not success:
-                    return jsonify({
-                        'status': 'error',
-                        'error': '重启失败: 无法停止当前进程'
-                    })
+        # 返回命令执行结果
+        return jsonify({
+            'status': 'success',
+            'output': _decode_command_output(stdout, stdout_truncated) or '命令执行成功，无输出'
+        })
 
-            time.sleep(2)  # 等待进程完全停止
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'error': f'执行命令失败: {str(e)}'
+        })
 
-            # 然后重新启动
-            success, message = start_bot_process()
-            if success:
-                return jsonify({
-                    'status': 'success',
-                    'output': '机器人已重启'
-                })
-            else:
-                return jsonify({
-                    'status': 'error',
-                    'error': f'重启失败: {message}'
-                })
+# 内置命令表，键为小写的命令名
+_BUILTIN_CMDS = {
+    'help': _cmd_help,
+    'clear': _cmd_clear,
+    'status': _cmd_status,
+    'version': _cmd_version,
+    'memory': _cmd_memory,
+    'start': _cmd_start,
+    'stop': _cmd_stop,
+    'restart': _cmd_restart,
+}
 
-        # 执行CMD命令
-        else:
-            try:
-                # 使用subprocess执行命令并捕获输出
-                process = subprocess.Popen(
-                    command,
-                    shell=True,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                    encoding='utf-8',
-                    errors='replace'
-                )
-
-                # 获取命令输出
-                stdout, stderr = process.communicate(timeout=30)
-
-                # 如果有错误输出
-                if stderr:
-                    return jsonify({
-                        'status': 'error',
-                        'error': stderr
-                    })
+@app.route('/execute_command', methods=['POST'])
+def execute_command():
+    """执行控制台命令"""
+    try:
+        command = (request.json or {}).get('command', '').strip()
 
-                # 返回命令执行结果
-                return jsonify({
-                    'status': 'success',
-                    'output': stdout or '命令执行成功，无输出'
-                })
+        # 处理内置命令
+        handler = _BUILTIN_CMDS.get(command.lower())
+        if handler is not None:
+            return handler()
 
-            except subprocess.TimeoutExpired:
-                process.kill()
-                return jsonify({
-                    'status': 'error',
-                    'error': '命令执行超时'
-                })
-            except Exception as e:
-                return jsonify({
-                    'status': 'error',
-                    'error': f'执行命令失败: {str(e)}'
-                })
+        # 执行CMD命令
+        return _run_shell_command(command)
 
     except Exception as e:
         return jsonify({
@@ -1155,6 +1534,66 @@ type - 显示文件内容
             'error': f'执行命令失败: {str(e)}'
         })
 
+# 依赖检查缓存：按 requirements.txt 的 mtime 失效，已安装包另设有效期以感知手动安装
+INSTALLED_PACKAGES_TTL = 60
+_DEPS_CACHE = {'mtime_ns': None, 'required': frozenset(), 'installed': frozenset(), 'checked_at': 0.0}
+_deps_cache_lock = threading.Lock()
+_PACKAGE_NAME_SEP = re.compile(r'[-_.]+')
+# requirements.txt 行首的包名，后面的版本约束、extras 和环境标记都忽略
+_REQ_RE = re.compile(r'^([A-Za-z0-9._-]+)')
+
+def _normalize_package_name(name: str) -> str:
+    """按 PEP 503 规范化包名，便于比较"""
+    return _PACKAGE_NAME_SEP.sub('-', name).lower()
+
+def _read_required_packages(requirements_path: str) -> frozenset:
+    """读取requirements.txt，只获取有效的包名"""
+    required_packages = set()
+    with open(requirements_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            # 跳过无效行：空行、注释、镜像源配置、-r 开头的文件包含
+            if (not line or
+                line.startswith('#') or
+                line.startswith('-i ') or
+                line.startswith('-r ') or
+                line.startswith('--')):
+                continue
+
+            # 只取包名，忽略版本信息和其他选项
+            pkg_match = _REQ_RE.match(line)
+            if pkg_match:
+                required_packages.add(_normalize_package_name(pkg_match.group(1)))
+    return frozenset(required_packages)
+
+def _read_installed_packages() -> frozenset:
+    """直接读取 dist-info 元数据获取已安装的包，无需启动 pip 子进程"""
+    installed = set()
+    for dist in importlib.metadata.distributions():
+        name = dist.metadata['Name']
+        if name:
+            installed.add(_normalize_package_name(name))
+    return frozenset(installed)
+
+def invalidate_dependency_cache():
+    """安装依赖后调用，使下一次检查重新读取已安装的包"""
+    with _deps_cache_lock:
+        _DEPS_CACHE['checked_at'] = 0.0
+
+def get_dependency_snapshot(requirements_path: str):
+    """返回 (需要的包, 已安装的包)，requirements.txt 未变化时直接使用缓存"""
+    mtime_ns = os.stat(requirements_path).st_mtime_ns
+    now = time.monotonic()
+    with _deps_cache_lock:
+        if _DEPS_CACHE['mtime_ns'] != mtime_ns:
+            _DEPS_CACHE['required'] = _read_required_packages(requirements_path)
+            _DEPS_CACHE['mtime_ns'] = mtime_ns
+            _DEPS_CACHE['checked_at'] = 0.0
+        if not _DEPS_CACHE['checked_at'] or now - _DEPS_CACHE['checked_at'] > INSTALLED_PACKAGES_TTL:
+            _DEPS_CACHE['installed'] = _read_installed_packages()
+            _DEPS_CACHE['checked_at'] = now
+        return _DEPS_CACHE['required'], _DEPS_CACHE['installed']
+
 @app.route('/check_dependencies')
 def check_dependencies():
     """检查Python和pip环境"""
@@ -1167,7 +1606,7 @@ def check_dependencies():
         has_pip = pip_path is not None
 
         # 检查requirements.txt是否存在
-        requirements_path = os.path.join(ROOT_DIR, 'requirements.txt')
+        requirements_path = REQUIREMENTS_PATH
         has_requirements = os.path.exists(requirements_path)
 
         # 如果requirements.txt存在，检查是否所有依赖都已安装
@@ -1175,46 +1614,9 @@ def check_dependencies():
         missing_deps = []
         if has_requirements and has_pip:
             try:
-                # 获取已安装的包列表
-                process = subprocess.Popen(
-                    [sys.executable, '-m', 'pip', 'list'],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                )
-                stdout, stderr = process.communicate()
-
-                # 解码字节数据为字符串
-                stdout = stdout.decode('utf-8')
-                stderr = stderr.decode('utf-8')
-
-                # 解析pip list的输出，只获取包名
-                installed_packages = {
-                    line.split()[0].lower()
-                    for line in stdout.split('\n')[2:]
-                    if line.strip()
-                }
+                required_packages, installed_packages = get_dependency_snapshot(requirements_path)
 
                 logger.debug(f"已安装的包: {installed_packages}")
-
-                # 读取requirements.txt，只获取有效的包名
-                with open(requirements_path, 'r', encoding='utf-8') as f:
-                    required_packages = set()
-                    for line in f:
-                        line = line.strip()
-                        # 跳过无效行：空行、注释、镜像源配置、-r 开头的文件包含
-                        if (not line or
-                            line.startswith('#') or
-                            line.startswith('-i ') or
-                            line.startswith('-r ') or
-                            line.startswith('--')):
-                            continue
-
-                        # 只取包名，忽略版本信息和其他选项
-                        pkg = line.split('=')[0].split('>')[0].split('<')[0].split('~')[0].split('[')[0]
-                        pkg = pkg.strip().lower()
-                        if pkg:  # 确保包名不为空
-                            required_packages.add(pkg)
-
                 logger.debug(f"需要的包: {required_packages}")
 
                 # 检查缺失的依赖
@@ -1260,86 +1662,105 @@ def favicon():
         mimetype='image/vnd.microsoft.icon'
     )
 
+def _snapshot_descendants(root_pids):
+    """遍历一次进程表，返回 {根PID: [后代进程对象]}，不在进程表中的根返回空列表"""
+    children_map = {}
+    for proc in psutil.process_iter(['ppid']):
+        children_map.setdefault(proc.info['ppid'], []).append(proc)
+
+    result = {}
+    for root in root_pids:
+        descendants = []
+        stack = [root]
+        seen = {root}
+        while stack:
+            for child in children_map.get(stack.pop(), ()):
+                if child.pid not in seen:
+                    seen.add(child.pid)
+                    descendants.append(child)
+                    stack.append(child.pid)
+        result[root] = descendants
+    return result
+
+def _terminate_procs(procs):
+    """先终止、等待，再强制结束仍在运行的进程"""
+    for proc in procs:
+        try:
+            logger.info(f"正在终止子进程 (PID: {proc.pid})...")
+            proc.terminate()
+        except psutil.NoSuchProcess:
+            pass
+        except Exception:
+            try:
+                logger.info(f"正在强制终止子进程 (PID: {proc.pid})...")
+                proc.kill()
+            except Exception as e:
+                logger.error(f"终止子进程 (PID: {proc.pid}) 失败: {str(e)}")
+
+    try:
+        gone, alive = psutil.wait_procs(procs, timeout=3)
+
+        # 强制结束仍在运行的进程
+        for proc in alive:
+            try:
+                logger.info(f"正在强制终止进程 (PID: {proc.pid})...")
+                proc.kill()
+            except Exception as e:
+                logger.error(f"强制终止进程 (PID: {proc.pid}) 失败: {str(e)}")
+    except Exception as e:
+        logger.error(f"等待进程结束失败: {str(e)}")
+
 def cleanup_processes():
     """清理所有相关进程"""
     try:
-        # 清理机器人进程
         global bot_process, job_object
+        is_windows = sys.platform.startswith('win')
+        current_pid = os.getpid()
+
+        # 只遍历一次进程表，同时得到机器人进程树和当前进程的全部子进程
+        try:
+            roots = [current_pid] + ([bot_process.pid] if bot_process else [])
+            tree = _snapshot_descendants(roots)
+        except Exception as e:
+            logger.error(f"获取进程列表失败: {str(e)}")
+            tree = {}
+
+        # 清理机器人进程
+        bot_pids = set()
         if bot_process:
             try:
                 logger.info(f"正在终止机器人进程 (PID: {bot_process.pid})...")
+                bot_pids = {bot_process.pid}
+                bot_pids.update(proc.pid for proc in tree.get(bot_process.pid, ()))
 
-                # 获取进程组
-                parent = psutil.Process(bot_process.pid)
-                children = parent.children(recursive=True)
-
-                # 终止子进程
-                for child in children:
-                    try:
-                        logger.info(f"正在终止子进程 (PID: {child.pid})...")
-                        child.terminate()
-                    except:
-                        try:
-                            logger.info(f"正在强制终止子进程 (PID: {child.pid})...")
-                            child.kill()
-                        except Exception as e:
-                            logger.error(f"终止子进程 (PID: {child.pid}) 失败: {str(e)}")
-
-                # 终止主进程
-                bot_process.terminate()
-
-                # 等待进程结束
-                try:
-                    gone, alive = psutil.wait_procs(children + [parent], timeout=3)
-
-                    # 强制结束仍在运行的进程
-                    for p in alive:
-                        try:
-                            logger.info(f"正在强制终止进程 (PID: {p.pid})...")
-                            p.kill()
-                        except Exception as e:
-                            logger.error(f"强制终止进程 (PID: {p.pid}) 失败: {str(e)}")
-                except Exception as e:
-                    logger.error(f"等待进程结束失败: {str(e)}")
-
-                # 如果在Windows上，使用taskkill强制终止进程树
-                if sys.platform.startswith('win'):
+                if is_windows:
+                    # taskkill /T 会连同子进程一起终止，无需逐个处理
                     try:
                         logger.info(f"使用taskkill终止进程树 (PID: {bot_process.pid})...")
                         subprocess.run(['taskkill', '/F', '/T', '/PID', str(bot_process.pid)],
                                      capture_output=True)
                     except Exception as e:
                         logger.error(f"使用taskkill终止进程失败: {str(e)}")
+                else:
+                    children = tree.get(bot_process.pid, [])
+                    bot_process.terminate()
+                    _terminate_procs(children)
+                    try:
+                        bot_process.wait(timeout=3)
+                    except subprocess.TimeoutExpired:
+                        logger.info(f"正在强制终止进程 (PID: {bot_process.pid})...")
+                        bot_process.kill()
 
                 bot_process = None
 
             except Exception as e:
                 logger.error(f"清理机器人进程失败: {str(e)}")
 
-        # 清理当前进程的所有子进程
+        # 清理当前进程的其余子进程
         try:
-            current_process = psutil.Process()
-            children = current_process.children(recursive=True)
-
-            for child in children:
-                try:
-                    logger.info(f"正在终止子进程 (PID: {child.pid})...")
-                    child.terminate()
-                except:
-                    try:
-                        logger.info(f"正在强制终止子进程 (PID: {child.pid})...")
-                        child.kill()
-                    except Exception as e:
-                        logger.error(f"终止子进程 (PID: {child.pid}) 失败: {str(e)}")
-
-            # 等待所有子进程结束
-            gone, alive = psutil.wait_procs(children, timeout=3)
-            for p in alive:
-                try:
-                    logger.info(f"正在强制终止进程 (PID: {p.pid})...")
-                    p.kill()
-                except Exception as e:
-                    logger.error(f"强制终止进程 (PID: {p.pid}) 失败: {str(e)}")
+            others = [proc for proc in tree.get(current_pid, ()) if proc.pid not in bot_pids]
+            if others:
+                _terminate_procs(others)
         except Exception as e:
             logger.error(f"清理子进程失败: {str(e)}")
 
@@ -1432,6 +1853,10 @@ def setup_console_control_handler():
     except Exception as e:
         logger.error(f"设置控制台关闭事件处理器失败: {str(e)}")
 
+# 启动信息中的分隔线
+BANNER_RULE = "=" * 50
+BANNER_DIVIDER = "-" * 50
+
 def main():
     """主函数"""
     from src.config import config
@@ -1440,9 +1865,10 @@ def main():
     if sys.platform.startswith('win'):
         os.system("@chcp 65001 >nul")  # 使用 >nul 来隐藏输出而不清屏
 
-    print("\n" + "="*50)
-    print_status("配置管理系统启动中...", "info", "LAUNCH")
-    print("-"*50)
+    with StatusBatcher():
+        print_line("\n" + BANNER_RULE)
+        print_status("配置管理系统启动中...", "info", "LAUNCH")
+        print_line(BANNER_DIVIDER)
 
     # 创建作业对象来管理子进程
     create_job_object()
@@ -1450,19 +1876,20 @@ def main():
     # 设置控制台关闭事件处理
     setup_console_control_handler()
 
-    # 检查必要目录
-    print_status("检查系统目录...", "info", "FILE")
-    if not os.path.exists(os.path.join(ROOT_DIR, 'src/webui/templates')):
-        print_status("错误：模板目录不存在！", "error", "CROSS")
-        return
-    print_status("系统目录检查完成", "success", "CHECK")
-
-    # 检查配置文件
-    print_status("检查配置文件...", "info", "CONFIG")
-    if not os.path.exists(config.config_path):
-        print_status("错误：配置文件不存在！", "error", "CROSS")
-        return
-    print_status("配置文件检查完成", "success", "CHECK")
+    with StatusBatcher():
+        # 检查必要目录
+        print_status("检查系统目录...", "info", "FILE")
+        if not os.path.exists(TEMPLATES_DIR):
+            print_status("错误：模板目录不存在！", "error", "CROSS")
+            return
+        print_status("系统目录检查完成", "success", "CHECK")
+
+        # 检查配置文件
+        print_status("检查配置文件...", "info", "CONFIG")
+        if not os.path.exists(config.config_path):
+            print_status("错误：配置文件不存在！", "error", "CROSS")
+            return
+        print_status("配置文件检查完成", "success", "CHECK")
 
     # 修改启动 Web 服务器的部分
     try:
@@ -1475,27 +1902,28 @@ def main():
     host = '0.0.0.0'
     port = 8502
 
-    print_status("正在启动Web服务...", "info", "INTERNET")
-    print("-"*50)
-    print_status("配置管理系统已就绪！", "success", "STAR_1")
+    with StatusBatcher():
+        print_status("正在启动Web服务...", "info", "INTERNET")
+        print_line(BANNER_DIVIDER)
+        print_status("配置管理系统已就绪！", "success", "STAR_1")
 
-    # 显示所有可用的访问地址
-    print_status("可通过以下地址访问:", "info", "CHAIN")
-    print(f"  Local:   http://localhost:{port}")
-    print(f"  Local:   http://127.0.0.1:{port}")
+        # 显示所有可用的访问地址
+        print_status("可通过以下地址访问:", "info", "CHAIN")
+        print_line(f"  Local:   http://localhost:{port}\n  Local:   http://127.0.0.1:{port}")
 
-    # 获取本地IP地址
-    hostname = socket.gethostname()
-    try:
-        addresses = socket.getaddrinfo(hostname, None)
-        for addr in addresses:
-            ip = addr[4][0]
-            if isinstance(ip, str) and '.' in ip and ip != '127.0.0.1':
-                print(f"  Network: http://{ip}:{port}")
-    except Exception as e:
-        logger.error(f"获取IP地址失败: {str(e)}")
+        # 获取本地IP地址，直接枚举网卡地址，不经过 DNS 解析
+        try:
+            seen = set()
+            for addrs in psutil.net_if_addrs().values():
+                for addr in addrs:
+                    ip = addr.address
+                    if addr.family == socket.AF_INET and not ip.startswith('127.') and ip not in seen:
+                        seen.add(ip)
+                        print_line(f"  Network: http://{ip}:{port}")
+        except Exception as e:
+            logger.error(f"获取IP地址失败: {str(e)}")
 
-    print("="*50 + "\n")
+        print_line(BANNER_RULE + "\n")
 
     # 启动浏览器
     open_browser(port)
@@ -1515,7 +1943,7 @@ def install_dependencies():
 
         # 安装依赖
         output.append("正在安装依赖，请耐心等待...")
-        requirements_path = os.path.join(ROOT_DIR, 'requirements.txt')
+        requirements_path = REQUIREMENTS_PATH
 
         if not os.path.exists(requirements_path):
             return jsonify({
@@ -1529,6 +1957,7 @@ def install_dependencies():
             stderr=subprocess.PIPE,
         )
         stdout, stderr = process.communicate()
+        invalidate_dependency_cache()
 
         # 解码字节数据为字符串
         stdout = stdout.decode('utf-8')
@@ -1564,34 +1993,65 @@ def hash_password(password: str) -> str:
     # 对密码进行哈希处理
     return hashlib.sha256(password.encode()).hexdigest()
 
+# 管理员密码哈希缓存，密码只能通过 /init_password 设置，设置后在此处同步更新
+_admin_password_hash = None
+_admin_password_lock = threading.Lock()
+
+def get_admin_password_hash() -> str:
+    """获取管理员密码哈希，首次调用时从配置读取"""
+    global _admin_password_hash
+    if _admin_password_hash is None:
+        with _admin_password_lock:
+            if _admin_password_hash is None:
+                from src.config import config
+                _admin_password_hash = config.auth.admin_password or ''
+    return _admin_password_hash
+
+def set_admin_password_hash(password_hash: str):
+    """密码更新后刷新缓存的哈希值"""
+    global _admin_password_hash
+    with _admin_password_lock:
+        _admin_password_hash = password_hash or ''
+
+# 视为本地网络的地址段：回环地址和私有网段
+_LOCAL_NETS = tuple(ipaddress.ip_network(net) for net in (
+    '127.0.0.0/8', '192.168.0.0/16', '10.0.0.0/8', '172.16.0.0/12'
+))
+
+@lru_cache(maxsize=256)
+def _is_local_address(client_ip: str) -> bool:
+    """判断地址是否属于本地网络，结果按地址缓存"""
+    try:
+        addr = ipaddress.ip_address(client_ip)
+    except ValueError:
+        return False
+    return any(addr in net for net in _LOCAL_NETS)
+
 def is_local_network() -> bool:
     # 检查是否是本地网络访问
     client_ip = request.remote_addr
     if client_ip is None:
         return True
-    return (
-        client_ip == '127.0.0.1' or
-        client_ip.startswith('192.168.') or
-        client_ip.startswith('10.') or
-        client_ip.startswith('172.16.')
-    )
+    return _is_local_address(client_ip)
+
+# 不需要验证登录状态的路由
+_PUBLIC_ENDPOINTS = frozenset(('login', 'static', 'init_password'))
 
 @app.before_request
 def check_auth():
     # 请求前验证登录状态
     # 排除不需要验证的路由
-    public_routes = ['login', 'static', 'init_password']
-    if request.endpoint in public_routes:
+    if request.endpoint in _PUBLIC_ENDPOINTS:
         return
 
     # 检查是否需要初始化密码
-    from src.config import config
-    if not config.auth.admin_password:
+    if not get_admin_password_hash():
         return redirect(url_for('init_password'))
 
-    # 如果是本地网络访问，自动登录
+    # 如果是本地网络访问，自动登录；已登录时不再写入，避免每次请求都重新签发会话 Cookie
     if is_local_network():
-        session['logged_in'] = True
+        if not session.get('logged_in'):
+            session['logged_in'] = True
         return
 
     if not session.get('logged_in'):
@@ -1600,10 +2060,10 @@ def check_auth():
 @app.route('/login', methods=['GET', 'POST'])
 def login():
     # 处理登录请求
-    from src.config import config
+    stored_hash = get_admin_password_hash()
 
     # 首先检查是否需要初始化密码
-    if not config.auth.admin_password:
+    if not stored_hash:
         return redirect(url_for('init_password'))
 
     if request.method == 'GET':
@@ -1620,12 +2080,11 @@ def login():
 
     # POST请求处理
     data = request.get_json()
-    password = data.get('password')
+    password = data.get('password') or ''
     remember_me = data.get('remember_me', False)
 
-    # 正常登录验证
-    stored_hash = config.auth.admin_password
-    if hash_password(password) == stored_hash:
+    # 正常登录验证，使用常量时间比较避免时序泄露
+    if hmac.compare_digest(hash_password(password), stored_hash):
         session.clear()  # 清除旧会话
         session['logged_in'] = True
         if remember_me:
@@ -1670,16 +2129,13 @@ def init_password():
         # 保存新密码的哈希值
         hashed_password = hash_password(password)
         if config.update_password(hashed_password):
-            # 重新加载配置
-            importlib.reload(sys.modules['src.config'])
-            from src.config import config
-
             # 验证密码是否正确保存
             if not config.auth.admin_password:
                 return jsonify({
                     'status': 'error',
                     'message': '密码保存失败'
                 })
+            set_admin_password_hash(config.auth.admin_password)
 
             # 设置登录状态
             session.clear()
@@ -1704,54 +2160,98 @@ def logout():
     session.clear()
     return redirect(url_for('login'))
 
+# 模型配置缓存：过期后先返回旧数据，同时在后台刷新，请求不会阻塞在云端获取上
+MODEL_CONFIGS_TTL = 60
+_MODEL_CFG_CACHE = {'time': 0.0, 'data': None}
+_model_cfg_lock = threading.Lock()
+_model_cfg_refreshing = False
+
+def _build_model_configs():
+    """获取模型列表并过滤排序，返回可直接返回给前端的配置；本地文件不存在时返回 None"""
+    # 先尝试从云端获取模型列表
+    from src.autoupdate.updater import check_cloud_info
+    cloud_info = check_cloud_info()
+
+    # 如果云端获取成功，使用云端模型列表
+    if cloud_info['models']:
+        configs = cloud_info['models']
+        logger.info("使用云端模型列表")
+    else:
+        # 如果云端获取失败，使用本地模型列表
+        models_path = MODELS_CONFIG_PATH
+
+        if not os.path.exists(models_path):
+            return None
+
+        configs = json_utils.loads(Path(models_path).read_bytes())
+        logger.info("使用本地模型列表")
+
+    # 过滤和排序提供商
+    active_providers = [p for p in configs['api_providers']
+                      if p.get('status') == 'active']
+    active_providers.sort(key=lambda x: x.get('priority', 999))
+
+    # 构建返回配置
+    return_configs = {
+        'api_providers': active_providers,
+        'models': {}
+    }
+
+    # 只包含活动模型
+    for provider in active_providers:
+        provider_id = provider['id']
+        if provider_id in configs['models']:
+            return_configs['models'][provider_id] = [
+                m for m in configs['models'][provider_id]
+                if m.get('status') == 'active'
+            ]
+
+    return return_configs
+
+def _store_model_configs(data):
+    with _model_cfg_lock:
+        _MODEL_CFG_CACHE['data'] = data
+        _MODEL_CFG_CACHE['time'] = time.monotonic()
+
+def _refresh_model_configs():
+    """后台刷新模型配置缓存"""
+    global _model_cfg_refreshing
+    try:
+        data = _build_model_configs()
+        if data is not None:
+            _store_model_configs(data)
+    except Exception as e:
+        logger.error(f"刷新模型配置失败: {str(e)}")
+    finally:
+        with _model_cfg_lock:
+            _model_cfg_refreshing = False
+
 @app.route('/get_model_configs')
 def get_model_configs():
     """获取模型和API配置"""
+    global _model_cfg_refreshing
     try:
-        # 先尝试从云端获取模型列表
-        from src.autoupdate.updater import check_cloud_info
-        cloud_info = check_cloud_info()
-
-        # 如果云端获取成功，使用云端模型列表
-        if cloud_info['models']:
-            configs = cloud_info['models']
-            logger.info("使用云端模型列表")
-        else:
-            # 如果云端获取失败，使用本地模型列表
-            models_path = os.path.join(ROOT_DIR, 'src/autoupdate/cloud/models.json')
-
-            if not os.path.exists(models_path):
+        with _model_cfg_lock:
+            data = _MODEL_CFG_CACHE['data']
+            stale = time.monotonic() - _MODEL_CFG_CACHE['time'] >= MODEL_CONFIGS_TTL
+            start_refresh = data is not None and stale and not _model_cfg_refreshing
+            if start_refresh:
+                _model_cfg_refreshing = True
+
+        if start_refresh:
+            threading.Thread(target=_refresh_model_configs, name="model-configs-refresh", daemon=True).start()
+
+        if data is None:
+            # 首次请求时同步获取
+            data = _build_model_configs()
+            if data is None:
                 return jsonify({
                     'status': 'error',
                     'message': '配置文件不存在'
                 })
+            _store_model_configs(data)
 
-            with open(models_path, 'r', encoding='utf-8') as f:
-                configs = json.load(f)
-            logger.info("使用本地模型列表")
-
-
-        # 过滤和排序提供商
-        active_providers = [p for p in configs['api_providers']
-                          if p.get('status') == 'active']
-        active_providers.sort(key=lambda x: x.get('priority', 999))
-
-        # 构建返回配置
-        return_configs = {
-            'api_providers': active_providers,
-            'models': {}
-        }
-
-        # 只包含活动模型
-        for provider in active_providers:
-            provider_id = provider['id']
-            if provider_id in configs['models']:
-                return_configs['models'][provider_id] = [
-                    m for m in configs['models'][provider_id]
-                    if m.get('status') == 'active'
-                ]
-
-        return jsonify(return_configs)
+        return jsonify(data)
 
     except Exception as e:
         return jsonify({
@@ -1767,12 +2267,7 @@ def save_quick_setup():
         from src.config import config
 
         # 读取当前配置
-        config_path = os.path.join(ROOT_DIR, 'src/config/config.json')
-        try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                current_config = json.load(f)
-        except:
-            current_config = {"categories": {}}
+        current_config = load_config_file()
 
         # 确保基本结构存在
         if "categories" not in current_config:
@@ -1832,11 +2327,12 @@ def save_quick_setup():
                 }
 
         # 保存更新后的配置
-        with open(config_path, 'w', encoding='utf-8') as f:
-            json.dump(current_config, f, ensure_ascii=False, indent=4)
+        if not save_config_file(current_config):
+            return jsonify({"status": "error", "message": "保存配置文件失败"})
 
-        # 重新加载配置
-        importlib.reload(sys.modules['src.config'])
+        # 原地重新加载配置，不重新执行整个模块
+        from src.config import reload_config
+        reload_config()
 
         return jsonify({"status": "success", "message": "设置已保存"})
 
@@ -1849,42 +2345,63 @@ def quick_setup():
     """快速设置页面"""
     return render_template('quick_setup.html')
 
+# 已确认存在的目录，避免每次请求都重复检查或创建
+_KNOWN_DIRS = set()
+
+def ensure_dir(path: str):
+    """确保目录存在，同一进程内每个目录只检查一次"""
+    if path not in _KNOWN_DIRS:
+        os.makedirs(path, exist_ok=True)
+        _KNOWN_DIRS.add(path)
+
 # 添加获取可用人设列表的路由
 @app.route('/get_available_avatars')
 def get_available_avatars_route():
     """获取可用的人设目录列表"""
     try:
         # 使用绝对路径
-        avatar_base_dir = os.path.join(ROOT_DIR, "data", "avatars")
+        avatar_base_dir = AVATAR_BASE_DIR
 
-        # 检查目录是否存在
-        if not os.path.exists(avatar_base_dir):
-            # 尝试创建目录
-            try:
-                os.makedirs(avatar_base_dir)
-                logger.info(f"已创建人设目录: {avatar_base_dir}")
-            except Exception as e:
-                logger.error(f"创建人设目录失败: {str(e)}")
-                return jsonify({
-                    'status': 'error',
-                    'message': f"人设目录不存在且无法创建: {str(e)}"
-                })
+        # 检查目录是否存在，确认过一次后不再重复检查
+        if avatar_base_dir not in _KNOWN_DIRS:
+            if not os.path.exists(avatar_base_dir):
+                # 尝试创建目录
+                try:
+                    os.makedirs(avatar_base_dir)
+                    logger.info(f"已创建人设目录: {avatar_base_dir}")
+                except Exception as e:
+                    logger.error(f"创建人设目录失败: {str(e)}")
+                    return jsonify({
+                        'status': 'error',
+                        'message': f"人设目录不存在且无法创建: {str(e)}"
+                    })
+            _KNOWN_DIRS.add(avatar_base_dir)
 
         # 获取所有包含 avatar.md 和 emojis 目录的有效人设目录
         avatars = []
-        for item in os.listdir(avatar_base_dir):
-            avatar_dir = os.path.join(avatar_base_dir, item)
-            if os.path.isdir(avatar_dir):
-                avatar_md_path = os.path.join(avatar_dir, "avatar.md")
-                emojis_dir = os.path.join(avatar_dir, "emojis")
+        with os.scandir(avatar_base_dir) as it:
+            for entry in it:
+                # 目录类型由 scandir 直接给出，先用它过滤掉普通文件
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                item = entry.name
+                emojis_dir = os.path.join(entry.path, "emojis")
+
+                # 一次扫描拿到人设目录下的所有条目，代替逐个路径检查
+                try:
+                    with os.scandir(entry.path) as sub:
+                        sub_names = {e.name: e for e in sub}
+                except OSError as e:
+                    logger.error(f"读取人设目录失败 {entry.path}: {str(e)}")
+                    continue
 
                 # 检查 avatar.md 文件
-                if not os.path.exists(avatar_md_path):
+                if "avatar.md" not in sub_names:
                     logger.warning(f"人设 {item} 缺少 avatar.md 文件")
                     continue
 
                 # 检查 emojis 目录
-                if not os.path.exists(emojis_dir):
+                if not ("emojis" in sub_names and sub_names["emojis"].is_dir()):
                     logger.warning(f"人设 {item} 缺少 emojis 目录")
                     try:
                         os.makedirs(emojis_dir)
@@ -1909,45 +2426,40 @@ def get_available_avatars_route():
         })
 
 # 修改加载指定人设内容的路由
+# 新建人设时写入的 avatar.md 模板
+AVATAR_TEMPLATE_CONTENT = "# Task\n请在此输入任务描述\n\n# Role\n请在此输入角色设定\n\n# Appearance\n请在此输入外表描述\n\n"
+
+# avatar.md 中以 "# " 开头的行为各部分标题
+_AVATAR_SECTION_RE = re.compile(r'^# ', re.MULTILINE)
+
+def parse_avatar_sections(raw_content: str) -> Dict[str, str]:
+    """将 avatar.md 内容按一级标题拆分为 {小写标题: 内容}，第一个标题之前的内容忽略"""
+    sections = {}
+    for part in _AVATAR_SECTION_RE.split(raw_content)[1:]:
+        header, _, body = part.partition('\n')
+        header = header.strip()
+        if header:
+            sections[header.lower()] = body.strip()
+    return sections
+
 @app.route('/load_avatar_content')
 def load_avatar_content():
     """加载指定人设的内容"""
     try:
         avatar_name = request.args.get('avatar', 'MONO')
-        avatar_path = os.path.join(ROOT_DIR, 'data', 'avatars', avatar_name, 'avatar.md')
+        avatar_path = os.path.join(AVATAR_BASE_DIR, avatar_name, 'avatar.md')
 
-        # 确保目录存在
-        os.makedirs(os.path.dirname(avatar_path), exist_ok=True)
-
-        # 如果文件不存在，创建一个空文件
-        if not os.path.exists(avatar_path):
+        # 只读取一次文件，原始内容用于前端显示，同时在内存中解析各部分
+        try:
+            with open(avatar_path, 'r', encoding='utf-8') as file:
+                raw_content = file.read()
+        except FileNotFoundError:
+            # 文件不存在时才创建目录和模板文件
+            ensure_dir(os.path.dirname(avatar_path))
+            raw_content = AVATAR_TEMPLATE_CONTENT
             with open(avatar_path, 'w', encoding='utf-8') as f:
-                f.write("# Task\n请在此输入任务描述\n\n# Role\n请在此输入角色设定\n\n# Appearance\n请在此输入外表描述\n\n")
-
-        # 读取角色设定文件并解析内容
-        sections = {}
-        current_section = None
-
-        with open(avatar_path, 'r', encoding='utf-8') as file:
-            content = ""
-            for line in file:
-                if line.startswith('# '):
-                    # 如果已有部分，保存它
-                    if current_section:
-                        sections[current_section.lower()] = content.strip()
-                    # 开始新部分
-                    current_section = line[2:].strip()
-                    content = ""
-                else:
-                    content += line
-
-            # 保存最后一个部分
-            if current_section:
-                sections[current_section.lower()] = content.strip()
-
-        # 获取原始文件内容，用于前端显示
-        with open(avatar_path, 'r', encoding='utf-8') as file:
-            raw_content = file.read()
+                f.write(raw_content)
+        sections = parse_avatar_sections(raw_content)
 
         return jsonify({
             'status': 'success',
@@ -1965,12 +2477,7 @@ def load_avatar_content():
 def get_tasks():
     """获取定时任务列表"""
     try:
-        config_data = load_config_file()
-
-        tasks = []
-        if 'categories' in config_data and 'schedule_settings' in config_data['categories']:
-            if 'settings' in config_data['categories']['schedule_settings'] and 'tasks' in config_data['categories']['schedule_settings']['settings']:
-                tasks = config_data['categories']['schedule_settings']['settings']['tasks'].get('value', [])
+        tasks = _get_config_tasks(_get_cached_config())
 
         return jsonify({
             'status': 'success',
@@ -2001,45 +2508,18 @@ def save_task():
         # 读取配置
         config_data = load_config_file()
 
-        # 确保必要的配置结构存在
-        if 'categories' not in config_data:
-            config_data['categories'] = {}
-
-        if 'schedule_settings' not in config_data['categories']:
-            config_data['categories']['schedule_settings'] = {
-                'title': '定时任务配置',
-                'settings': {
-                    'tasks': {
-                        'value': [],
-                        'type': 'array',
-                        'description': '定时任务列表'
-                    }
-                }
-            }
-        elif 'settings' not in config_data['categories']['schedule_settings']:
-            config_data['categories']['schedule_settings']['settings'] = {
-                'tasks': {
-                    'value': [],
-                    'type': 'array',
-                    'description': '定时任务列表'
-                }
-            }
-        elif 'tasks' not in config_data['categories']['schedule_settings']['settings']:
-            config_data['categories']['schedule_settings']['settings']['tasks'] = {
-                'value': [],
-                'type': 'array',
-                'description': '定时任务列表'
-            }
-
-        # 获取当前任务列表
-        tasks = config_data['categories']['schedule_settings']['settings']['tasks']['value']
+        # 确保必要的配置结构存在，获取当前任务列表
+        tasks = _ensure_tasks_node(config_data)['value']
 
         # 检查是否存在相同ID的任务
-        task_index = None
-        for i, task in enumerate(tasks):
-            if task.get('task_id') == task_data['task_id']:
-                task_index = i
-                break
+        task_index = _index_tasks(tasks).get(task_data['task_id'])
+
+        # 任务内容没有变化时无需保存，也无需重新初始化定时任务
+        if task_index is not None and tasks[task_index] == task_data:
+            return jsonify({
+                'status': 'success',
+                'message': '任务已保存'
+            })
 
         # 更新或添加任务
         if task_index is not None:
@@ -2047,9 +2527,6 @@ def save_task():
         else:
             tasks.append(task_data)
 
-        # 更新配置
-        config_data['categories']['schedule_settings']['settings']['tasks']['value'] = tasks
-
         # 保存配置
         if not save_config_file(config_data):
             return jsonify({
@@ -2084,34 +2561,36 @@ def delete_task():
                 'message': '未提供任务ID'
             })
 
+        # 任务本就不存在时无需改写配置文件，也无需重新初始化定时任务
+        if _find_tasks_node(_get_cached_config()) is not None and task_id not in _get_cached_task_index():
+            return jsonify({
+                'status': 'success',
+                'message': '任务已删除'
+            })
+
         # 读取配置
         config_data = load_config_file()
 
         # 获取任务列表
-        if 'categories' in config_data and 'schedule_settings' in config_data['categories']:
-            if 'settings' in config_data['categories']['schedule_settings'] and 'tasks' in config_data['categories']['schedule_settings']['settings']:
-                tasks = config_data['categories']['schedule_settings']['settings']['tasks']['value']
-
-                # 查找并删除任务
-                new_tasks = [task for task in tasks if task.get('task_id') != task_id]
+        tasks_node = _find_tasks_node(config_data)
+        if tasks_node is not None:
+            # 查找并删除任务
+            tasks_node['value'] = [task for task in tasks_node['value'] if task.get('task_id') != task_id]
 
-                # 更新配置
-                config_data['categories']['schedule_settings']['settings']['tasks']['value'] = new_tasks
-
-                # 保存配置
-                if not save_config_file(config_data):
-                    return jsonify({
-                        'status': 'error',
-                        'message': '保存配置文件失败'
-                    }), 500
+            # 保存配置
+            if not save_config_file(config_data):
+                return jsonify({
+                    'status': 'error',
+                    'message': '保存配置文件失败'
+                }), 500
 
-                # 重新初始化定时任务
-                reinitialize_tasks()
+            # 重新初始化定时任务
+            reinitialize_tasks()
 
-                return jsonify({
-                    'status': 'success',
-                    'message': '任务已删除'
-                })
+            return jsonify({
+                'status': 'success',
+                'message': '任务已删除'
+            })
 
         return jsonify({
             'status': 'error',
@@ -2124,137 +2603,98 @@ def delete_task():
             'message': str(e)
         })
 
+# get_all_configs 返回的配置组及其来源分类，分类存在时即使没有字段也返回空组
+_ALL_CONFIGS_GROUPS = (
+    ('基础配置', 'user_settings'),
+    ('图像识别API配置', 'media_settings'),
+    ('主动消息配置', 'behavior_settings'),
+    ('消息配置', 'behavior_settings'),
+    ('Prompt配置', 'behavior_settings'),
+)
+
+# (配置组, 返回的键, 在 categories 中的路径)，保留完整配置项（包括元数据）
+_ALL_CONFIGS_FIELD_MAP = (
+    ('基础配置', 'LISTEN_LIST', ('user_settings', 'settings', 'listen_list')),
+    ('基础配置', 'DEEPSEEK_API_KEY', ('llm_settings', 'settings', 'api_key')),
+    ('基础配置', 'DEEPSEEK_BASE_URL', ('llm_settings', 'settings', 'base_url')),
+    ('基础配置', 'MODEL', ('llm_settings', 'settings', 'model')),
+    ('基础配置', 'MAX_TOKEN', ('llm_settings', 'settings', 'max_tokens')),
+    ('基础配置', 'TEMPERATURE', ('llm_settings', 'settings', 'temperature')),
+    ('图像识别API配置', 'VISION_API_KEY', ('media_settings', 'settings', 'image_recognition', 'api_key')),
+    ('图像识别API配置', 'VISION_BASE_URL', ('media_settings', 'settings', 'image_recognition', 'base_url')),
+    ('图像识别API配置', 'VISION_TEMPERATURE', ('media_settings', 'settings', 'image_recognition', 'temperature')),
+    ('图像识别API配置', 'VISION_MODEL', ('media_settings', 'settings', 'image_recognition', 'model')),
+    ('图像识别API配置', 'VISION_TOP_P', ('media_settings', 'settings', 'image_recognition', 'top_p')),
+    ('图像识别API配置', 'VISION_FREQUENCY_PENALTY', ('media_settings', 'settings', 'image_recognition', 'frequency_penalty')),
+    ('主动消息配置', 'AUTO_MESSAGE', ('behavior_settings', 'settings', 'auto_message', 'content')),
+    ('主动消息配置', 'MIN_COUNTDOWN_HOURS', ('behavior_settings', 'settings', 'auto_message', 'countdown', 'min_hours')),
+    ('主动消息配置', 'MAX_COUNTDOWN_HOURS', ('behavior_settings', 'settings', 'auto_message', 'countdown', 'max_hours')),
+    ('主动消息配置', 'QUIET_TIME_START', ('behavior_settings', 'settings', 'quiet_time', 'start')),
+    ('主动消息配置', 'QUIET_TIME_END', ('behavior_settings', 'settings', 'quiet_time', 'end')),
+    ('消息配置', 'QUEUE_TIMEOUT', ('behavior_settings', 'settings', 'message_queue', 'timeout')),
+    ('Prompt配置', 'MAX_GROUPS', ('behavior_settings', 'settings', 'context', 'max_groups')),
+    ('Prompt配置', 'AVATAR_DIR', ('behavior_settings', 'settings', 'context', 'avatar_dir')),
+)
+
+def _lookup_path(node, path):
+    """沿路径逐级取值，任一级不存在时返回 None"""
+    for key in path:
+        if not isinstance(node, dict):
+            return None
+        node = node.get(key)
+    return node
+
+def _build_all_configs(config_data) -> dict:
+    """将配置数据解析为 get_all_configs 返回给前端的格式"""
+    categories = config_data.get('categories', {})
+
+    configs = {}
+    for group, category in _ALL_CONFIGS_GROUPS:
+        if 'settings' in categories.get(category, {}):
+            configs[group] = {}
+
+    for group, key, path in _ALL_CONFIGS_FIELD_MAP:
+        value = _lookup_path(categories, path)
+        if value is not None:
+            configs.setdefault(group, {})[key] = value
+
+    # 定时任务
+    tasks = _get_config_tasks(config_data)
+
+    logger.debug(f"获取到的所有配置数据: {configs}")
+    logger.debug(f"获取到的任务数据: {tasks}")
+
+    return {
+        'status': 'success',
+        'configs': configs,
+        'tasks': tasks
+    }
+
+def _get_cached_all_configs():
+    """获取序列化后的 get_all_configs 响应体及其 ETag，配置未变化时复用"""
+    config_data = _get_cached_config()
+    with _cfg_cache_lock:
+        if _CFG_CACHE["data"] is config_data and _CFG_CACHE["all_configs"] is not None:
+            return _CFG_CACHE["all_configs"]
+
+    body = json_utils.dumps(_build_all_configs(config_data))
+    entry = (body, hashlib.blake2b(body, digest_size=8).hexdigest())
+
+    with _cfg_cache_lock:
+        if _CFG_CACHE["data"] is config_data:
+            _CFG_CACHE["all_configs"] = entry
+    return entry
+
 @app.route('/get_all_configs')
 def get_all_configs():
     """获取所有最新的配置数据"""
     try:
-        # 直接从配置文件读取所有配置数据
-        config_path = os.path.join(ROOT_DIR, 'src/config/config.json')
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config_data = json.load(f)
-
-        # 解析配置数据为前端需要的格式
-        configs = {}
-        tasks = []
-
-        # 处理用户设置
-        if 'categories' in config_data:
-            # 用户设置
-            if 'user_settings' in config_data['categories'] and 'settings' in config_data['categories']['user_settings']:
-                configs['基础配置'] = {}
-                if 'listen_list' in config_data['categories']['user_settings']['settings']:
-                    configs['基础配置']['LISTEN_LIST'] = config_data['categories']['user_settings']['settings']['listen_list']
-
-            # LLM设置
-            if 'llm_settings' in config_data['categories'] and 'settings' in config_data['categories']['llm_settings']:
-                llm_settings = config_data['categories']['llm_settings']['settings']
-                if 'api_key' in llm_settings:
-                    configs['基础配置']['DEEPSEEK_API_KEY'] = llm_settings['api_key']
-                if 'base_url' in llm_settings:
-                    configs['基础配置']['DEEPSEEK_BASE_URL'] = llm_settings['base_url']
-                if 'model' in llm_settings:
-                    configs['基础配置']['MODEL'] = llm_settings['model']
-                if 'max_tokens' in llm_settings:
-                    configs['基础配置']['MAX_TOKEN'] = llm_settings['max_tokens']
-                if 'temperature' in llm_settings:
-                    configs['基础配置']['TEMPERATURE'] = llm_settings['temperature']
-
-            # 媒体设置
-            if 'media_settings' in config_data['categories'] and 'settings' in config_data['categories']['media_settings']:
-                media_settings = config_data['categories']['media_settings']['settings']
-
-                # 图像识别设置
-                configs['图像识别API配置'] = {}
-                if 'image_recognition' in media_settings:
-                    img_recog = media_settings['image_recognition']
-                    if 'api_key' in img_recog:
-                        # 保留完整配置，包括元数据
-                        configs['图像识别API配置']['VISION_API_KEY'] = img_recog['api_key']
-                    if 'base_url' in img_recog:
-                        configs['图像识别API配置']['VISION_BASE_URL'] = img_recog['base_url']
-                    if 'temperature' in img_recog:
-                        configs['图像识别API配置']['VISION_TEMPERATURE'] = img_recog['temperature']
-                    if 'model' in img_recog:
-                        configs['图像识别API配置']['VISION_MODEL'] = img_recog['model']
-                    if 'top_p' in img_recog:
-                        configs['图像识别API配置']['VISION_TOP_P'] = img_recog['top_p']
-                    if 'frequency_penalty' in img_recog:
-                        configs['图像识别API配置']['VISION_FREQUENCY_PENALTY'] = img_recog['frequency_penalty']
-
-                # 图像生成设置
-                '''
-                configs['图像生成配置'] = {}
-                if 'image_generation' in media_settings:
-                    img_gen = media_settings['image_generation']
-                    if 'model' in img_gen:
-                        configs['图像生成配置']['IMAGE_MODEL'] = {'value': img_gen['model'].get('value', '')}
-                    if 'temp_dir' in img_gen:
-                        configs['图像生成配置']['TEMP_IMAGE_DIR'] = {'value': img_gen['temp_dir'].get('value', '')}
-                '''
-
-                # 语音设置
-                '''
-                configs['语音配置'] = {}
-                if 'text_to_speech' in media_settings:
-                    tts = media_settings['text_to_speech']
-                    if 'tts_api_url' in tts:
-                        configs['语音配置']['TTS_API_URL'] = {'value': tts['tts_api_url'].get('value', '')}
-                    if 'voice_dir' in tts:
-                        configs['语音配置']['VOICE_DIR'] = {'value': tts['voice_dir'].get('value', '')}
-                '''
-
-            # 行为设置
-            if 'behavior_settings' in config_data['categories'] and 'settings' in config_data['categories']['behavior_settings']:
-                behavior = config_data['categories']['behavior_settings']['settings']
-
-                # 主动消息配置
-                configs['主动消息配置'] = {}
-                if 'auto_message' in behavior:
-                    auto_msg = behavior['auto_message']
-                    if 'content' in auto_msg:
-                        configs['主动消息配置']['AUTO_MESSAGE'] = auto_msg['content']
-                    if 'countdown' in auto_msg:
-                        if 'min_hours' in auto_msg['countdown']:
-                            configs['主动消息配置']['MIN_COUNTDOWN_HOURS'] = auto_msg['countdown']['min_hours']
-                        if 'max_hours' in auto_msg['countdown']:
-                            configs['主动消息配置']['MAX_COUNTDOWN_HOURS'] = auto_msg['countdown']['max_hours']
-
-                if 'quiet_time' in behavior:
-                    quiet = behavior['quiet_time']
-                    if 'start' in quiet:
-                        configs['主动消息配置']['QUIET_TIME_START'] = quiet['start']
-                    if 'end' in quiet:
-                        configs['主动消息配置']['QUIET_TIME_END'] = quiet['end']
-
-                # 消息队列配置
-                configs['消息配置'] = {}
-                if 'message_queue' in behavior:
-                    msg_queue = behavior['message_queue']
-                    if 'timeout' in msg_queue:
-                        configs['消息配置']['QUEUE_TIMEOUT'] = msg_queue['timeout']
-
-                # Prompt配置
-                configs['Prompt配置'] = {}
-                if 'context' in behavior:
-                    context = behavior['context']
-                    if 'max_groups' in context:
-                        configs['Prompt配置']['MAX_GROUPS'] = context['max_groups']
-                    if 'avatar_dir' in context:
-                        configs['Prompt配置']['AVATAR_DIR'] = context['avatar_dir']
-
-            # 定时任务
-            if 'schedule_settings' in config_data['categories'] and 'settings' in config_data['categories']['schedule_settings']:
-                if 'tasks' in config_data['categories']['schedule_settings']['settings']:
-                    tasks = config_data['categories']['schedule_settings']['settings']['tasks'].get('value', [])
-
-        logger.debug(f"获取到的所有配置数据: {configs}")
-        logger.debug(f"获取到的任务数据: {tasks}")
-
-        return jsonify({
-            'status': 'success',
-            'configs': configs,
-            'tasks': tasks
-        })
+        body, etag = _get_cached_all_configs()
+        response = app.response_class(body, mimetype='application/json')
+        response.set_etag(etag)
+        # 浏览器每次都需要验证，配置未变化时返回 304 且不带响应体
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
     except Exception as e:
         logger.error(f"获取所有配置数据失败: {str(e)}")
         return jsonify({
@@ -2262,81 +2702,109 @@ def get_all_configs():
             'message': str(e)
         })
 
+# 公告缓存：有效期内直接返回上次生成的结果；云端获取失败时继续使用之前的云端结果
+ANNOUNCEMENT_CACHE_TTL = 300
+_ANN_CACHE = {"expires": 0.0, "payload": None, "from_cloud": False}
+_ann_cache_lock = threading.Lock()
+
+def _build_announcement():
+    """获取公告和版本信息并生成最终公告，返回 (公告, 是否来自云端)"""
+    # 默认公告内容
+    local_announcement = {
+        'enabled': True,
+        'title': '系统公告',
+        'content': '欢迎使用KouriChat！'
+    }
+
+    # 使用updater模块从云端获取公告和版本信息
+    from src.autoupdate.updater import check_cloud_info
+    cloud_info = check_cloud_info()
+    from_cloud = bool(cloud_info['announcement'] or cloud_info['version'])
+
+    # 如果云端获取失败，尝试从本地读取公告
+    if not cloud_info['announcement'] and os.path.exists(ANNOUNCEMENT_CONFIG_PATH):
+        try:
+            local_announcement = json_utils.loads(Path(ANNOUNCEMENT_CONFIG_PATH).read_bytes())
+            logger.info("从本地读取公告信息成功")
+        except Exception as e:
+            logger.error(f"读取本地公告文件失败: {e}")
+    elif cloud_info['announcement']:
+        # 使用云端公告
+        local_announcement = cloud_info['announcement']
+        logger.info("使用云端公告信息")
+
+    # 如果云端获取失败，尝试从本地读取版本信息
+    version_info = cloud_info['version']
+    if not version_info and os.path.exists(VERSION_CONFIG_PATH):
+        try:
+            version_info = json_utils.loads(Path(VERSION_CONFIG_PATH).read_bytes())
+            logger.info("从本地读取版本信息成功")
+        except Exception as e:
+            logger.error(f"读取本地版本信息失败: {e}")
+
+    # 如果成功获取版本信息，将其添加到公告中
+    if version_info:
+        # 获取版本信息
+        version = version_info.get('version', '未知')
+        last_update = version_info.get('last_update', '未知')
+        description = version_info.get('description', [])
+
+        # 如果云端版本信息包含公告，使用云端公告
+        if 'announcement' in version_info:
+            cloud_announcement = version_info.get('announcement', {})
+            if cloud_announcement:
+                local_announcement['title'] = cloud_announcement.get('title', local_announcement['title'])
+                local_announcement['content'] = cloud_announcement.get('content', local_announcement['content'])
+                local_announcement['enabled'] = cloud_announcement.get('enabled', local_announcement['enabled'])
+
+        # 将版本信息添加到公告内容中
+        version_html = f"""
+        <div class="mt-4 pt-3 border-top">
+            <h5 class="mb-3">当前版本信息</h5>
+            <p><strong>版本号:</strong> {version}</p>
+            <p><strong>更新日期:</strong> {last_update}</p>
+            <p><strong>更新内容:</strong></p>
+        """
+
+        if isinstance(description, list):
+            version_html += "<ul class='ps-3'>"
+            for item in description:
+                version_html += f"<li>{item}</li>"
+            version_html += "</ul>"
+        else:
+            version_html += f"<p>{description}</p>"
+
+        version_html += "</div>"
+
+        # 将版本信息附加到公告内容
+        local_announcement['content'] += version_html
+
+    return local_announcement, from_cloud
+
 @app.route('/get_announcement')
 def get_announcement():
     try:
-        # 默认公告内容
-        local_announcement = {
-            'enabled': True,
-            'title': '系统公告',
-            'content': '欢迎使用KouriChat！'
-        }
-
-        # 使用updater模块从云端获取公告和版本信息
-        from src.autoupdate.updater import check_cloud_info
-        cloud_info = check_cloud_info()
+        with _ann_cache_lock:
+            now = time.monotonic()
+            if _ANN_CACHE["payload"] is not None and now < _ANN_CACHE["expires"]:
+                return jsonify(_ANN_CACHE["payload"])
 
-        # 如果云端获取失败，尝试从本地读取公告
-        if not cloud_info['announcement'] and os.path.exists(ANNOUNCEMENT_CONFIG_PATH):
             try:
-                with open(ANNOUNCEMENT_CONFIG_PATH, 'r', encoding='utf-8') as f:
-                    local_announcement = json.load(f)
-                logger.info("从本地读取公告信息成功")
+                payload, from_cloud = _build_announcement()
             except Exception as e:
-                logger.error(f"读取本地公告文件失败: {e}")
-        elif cloud_info['announcement']:
-            # 使用云端公告
-            local_announcement = cloud_info['announcement']
-            logger.info("使用云端公告信息")
-
-        # 如果云端获取失败，尝试从本地读取版本信息
-        version_info = cloud_info['version']
-        if not version_info and os.path.exists(VERSION_CONFIG_PATH):
-            try:
-                with open(VERSION_CONFIG_PATH, 'r', encoding='utf-8') as f:
-                    version_info = json.load(f)
-                logger.info("从本地读取版本信息成功")
-            except Exception as e:
-                logger.error(f"读取本地版本信息失败: {e}")
-
-        # 如果成功获取版本信息，将其添加到公告中
-        if version_info:
-            # 获取版本信息
-            version = version_info.get('version', '未知')
-            last_update = version_info.get('last_update', '未知')
-            description = version_info.get('description', [])
-
-            # 如果云端版本信息包含公告，使用云端公告
-            if 'announcement' in version_info:
-                cloud_announcement = version_info.get('announcement', {})
-                if cloud_announcement:
-                    local_announcement['title'] = cloud_announcement.get('title', local_announcement['title'])
-                    local_announcement['content'] = cloud_announcement.get('content', local_announcement['content'])
-                    local_announcement['enabled'] = cloud_announcement.get('enabled', local_announcement['enabled'])
-
-            # 将版本信息添加到公告内容中
-            version_html = f"""
-            <div class="mt-4 pt-3 border-top">
-                <h5 class="mb-3">当前版本信息</h5>
-                <p><strong>版本号:</strong> {version}</p>
-                <p><strong>更新日期:</strong> {last_update}</p>
-                <p><strong>更新内容:</strong></p>
-            """
-
-            if isinstance(description, list):
-                version_html += "<ul class='ps-3'>"
-                for item in description:
-                    version_html += f"<li>{item}</li>"
-                version_html += "</ul>"
+                if _ANN_CACHE["payload"] is None:
+                    raise
+                logger.error(f"刷新公告失败，继续使用缓存: {str(e)}")
+                payload, from_cloud = _ANN_CACHE["payload"], _ANN_CACHE["from_cloud"]
+            if not from_cloud and _ANN_CACHE["from_cloud"]:
+                # 云端暂时不可用，继续使用之前的云端公告
+                payload = _ANN_CACHE["payload"]
             else:
-                version_html += f"<p>{description}</p>"
-
-            version_html += "</div>"
-
-            # 将版本信息附加到公告内容
-            local_announcement['content'] += version_html
+                _ANN_CACHE["payload"] = payload
+                _ANN_CACHE["from_cloud"] = from_cloud
+            _ANN_CACHE["expires"] = now + ANNOUNCEMENT_CACHE_TTL
 
-        return jsonify(local_announcement)
+        return jsonify(payload)
     except Exception as e:
         logger.error(f"获取公告时发生错误: {e}")
         return jsonify({
@@ -2370,61 +2838,57 @@ def reconnect_wechat():
             'message': f'微信重连失败: {str(e)}'
         })
 
+# 图像识别API提供商列表
+VISION_PROVIDERS = [
+    {
+        "id": "kourichat-asia",
+        "name": "KouriChat API (推荐)",
+        "url": "https://api.kourichat.com/v1",
+        "register_url": "https://api.kourichat.com/register",
+        "status": "active",
+        "priority": 1
+    },
+    {
+        "id": "moonshot",
+        "name": "Moonshot（月之暗面）",
+        "url": "https://api.moonshot.cn/v1",
+        "register_url": "https://platform.moonshot.cn/console/api-keys",
+        "status": "active",
+        "priority": 2
+    },
+    {
+        "id": "openai",
+        "name": "OpenAI",
+        "url": "https://api.openai.com/v1",
+        "register_url": "https://platform.openai.com/api-keys",
+        "status": "active",
+        "priority": 3
+    },
+]
+
+# 模型配置 - 只包含支持图像识别的模型
+VISION_MODELS = {
+    "kourichat-asia": [
+        {"id": "kourichat-vision", "name": "kourichat-vision"},
+        {"id": "gemini-2.5-pro", "name": "Gemini 2.5 Pro"},
+        {"id": "gpt-4o", "name": "GPT-4o"}
+    ],
+    "moonshot": [
+        {"id": "moonshot-v1-8k-vision-preview", "name": "moonshot-v1-8k-vision-preview"}
+    ]
+}
+
+# 内容固定不变，启动时序列化一次，请求时直接返回
+_VISION_CONFIG_JSON = json_utils.dumps({
+    "status": "success",
+    "api_providers": VISION_PROVIDERS,
+    "models": VISION_MODELS
+})
+
 @app.route('/get_vision_api_configs')
 def get_vision_api_configs():
     """获取图像识别API配置"""
-    try:
-        # 构建图像识别API提供商列表
-        vision_providers = [
-            {
-                "id": "kourichat-asia",
-                "name": "KouriChat API (推荐)",
-                "url": "https://api.kourichat.com/v1",
-                "register_url": "https://api.kourichat.com/register",
-                "status": "active",
-                "priority": 1
-            },
-            {
-                "id": "moonshot",
-                "name": "Moonshot（月之暗面）",
-                "url": "https://api.moonshot.cn/v1",
-                "register_url": "https://platform.moonshot.cn/console/api-keys",
-                "status": "active",
-                "priority": 2
-            },
-            {
-                "id": "openai",
-                "name": "OpenAI",
-                "url": "https://api.openai.com/v1",
-                "register_url": "https://platform.openai.com/api-keys",
-                "status": "active",
-                "priority": 3
-            },
-        ]
-
-        # 构建模型配置 - 只包含支持图像识别的模型
-        vision_models = {
-            "kourichat-asia": [
-                {"id": "kourichat-vision", "name": "kourichat-vision"},
-                {"id": "gemini-2.5-pro", "name": "Gemini 2.5 Pro"},
-                {"id": "gpt-4o", "name": "GPT-4o"}
-            ],
-            "moonshot": [
-                {"id": "moonshot-v1-8k-vision-preview", "name": "moonshot-v1-8k-vision-preview"}
-            ]
-        }
-
-        return jsonify({
-            "status": "success",
-            "api_providers": vision_providers,
-            "models": vision_models
-        })
-    except Exception as e:
-        logger.error(f"获取图像识别API配置失败: {str(e)}")
-        return jsonify({
-            "status": "error",
-            "message": str(e)
-        })
+    return app.response_class(_VISION_CONFIG_JSON, mimetype='application/json')
 
 if __name__ == '__main__':
     try:
@@ -72,7 +72,14 @@ class Updater:
 
 
 
-    def __init__(self):
+    def __init__(self, session: Optional[requests.Session] = None, timeout=10):
+        """
+        Args:
+            session: 获取云端信息时复用的HTTP会话，为空时直接使用 requests
+            timeout: 获取云端信息的超时时间，可传入 (连接超时, 读取超时)
+        """
+        self._http = session or requests
+        self.timeout = timeout
         self.root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
         self.temp_dir = os.path.join(self.root_dir, 'temp_update')
 
@@ -83,6 +90,8 @@ class Updater:
         self.version_file = os.path.join(self.cloud_dir, 'version.json')
         self.announcement_file = os.path.join(self.cloud_dir, 'announcement.json')
         self.models_file = os.path.join(self.cloud_dir, 'models.json')
+        # 记录上次清理字节码缓存时的版本号
+        self.pycache_marker_file = os.path.join(self.cloud_dir, '.pycache_version')
 
 
         self.ignore_patterns = self._load_ignore_patterns()  # 加载忽略模式
@@ -184,10 +193,10 @@ class Updater:
 
         try:
             logger.info(f"正在从 {self.CLOUD_ANNOUNCEMENT_URL} 获取公告信息...")
-            response = requests.get(
+            response = self._http.get(
                 self.CLOUD_ANNOUNCEMENT_URL,
                 headers=headers,
-                timeout=10,
+                timeout=self.timeout,
                 verify=True
             )
             response.raise_for_status()
@@ -217,10 +226,10 @@ class Updater:
 
         try:
             logger.info(f"正在从 {self.CLOUD_VERSION_URL} 获取版本信息...")
-            response = requests.get(
+            response = self._http.get(
                 self.CLOUD_VERSION_URL,
                 headers=headers,
-                timeout=10,
+                timeout=self.timeout,
                 verify=True
             )
             response.raise_for_status()
@@ -250,10 +259,10 @@ class Updater:
 
         try:
             logger.info(f"正在从 {self.CLOUD_MODELS_URL} 获取模型列表...")
-            response = requests.get(
+            response = self._http.get(
                 self.CLOUD_MODELS_URL,
                 headers=headers,
-                timeout=10,
+                timeout=self.timeout,
                 verify=True
             )
             response.raise_for_status()
@@ -572,6 +581,9 @@ class Updater:
             for repo_dir in possible_repo_dirs:
                 self._force_remove_directory(repo_dir, "解压目录")
 
+            # 版本变化后清理字节码缓存
+            self.invalidate_pycache_on_version_change()
+
             # 清理其他可能的格式的解压文件夹
             for item in os.listdir(self.root_dir):
                 item_path = os.path.join(self.root_dir, item)
@@ -588,6 +600,26 @@ class Updater:
             # 继续进行强制系统命令删除
             self._system_force_remove(possible_repo_dirs, backup_dir)
 
+    def invalidate_pycache_on_version_change(self) -> bool:
+        """版本号与上次记录不同时清理所有__pycache__，返回是否执行了清理"""
+        current_version = self.get_current_version()
+        try:
+            with open(self.pycache_marker_file, 'r', encoding='utf-8') as f:
+                if f.read().strip() == current_version:
+                    return False
+        except OSError:
+            pass
+
+        from src.utils.cleanup import cleanup_pycache
+        cleanup_pycache()
+        try:
+            with open(self.pycache_marker_file, 'w', encoding='utf-8') as f:
+                f.write(current_version)
+        except OSError as e:
+            logger.error(f"写入字节码缓存版本标记失败: {str(e)}")
+        logger.info(f"版本变更为 {current_version}，已清理字节码缓存")
+        return True
+
     def _force_remove_directory(self, directory, dir_type="目录"):
         """使用多种方法强制删除目录"""
         if not os.path.exists(directory):
@@ -776,10 +808,10 @@ class Updater:
                 'output': f"更新失败: {str(e)}"
             }
 
-def check_cloud_info():
+def check_cloud_info(session: Optional[requests.Session] = None, timeout=10):
     """检查云端公告、版本信息和模型列表"""
     logger.info("开始检查云端信息...")
-    updater = Updater()
+    updater = Updater(session=session, timeout=timeout)
     announcement = updater.fetch_cloud_announcement()
     version = updater.fetch_cloud_version()
     models = updater.fetch_cloud_models()
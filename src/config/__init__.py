@@ -121,6 +121,12 @@ class Config:
         """返回备份的配置模板文件完整路径"""
         return os.path.join(self.config_dir, 'config.json.template.bak')
 
+    @property
+    def runtime_settings_path(self) -> str:
+        """返回启动清理所用的精简配置缓存文件路径"""
+        root_dir = os.path.dirname(os.path.dirname(self.config_dir))
+        return os.path.join(root_dir, 'data', '.runtime_urls.json')
+
     @property
     def config_backup_dir(self) -> str:
         """返回配置备份目录路径"""
@@ -446,10 +452,31 @@ class Config:
 
                 logger.info("配置加载完成")
 
+            self._write_runtime_settings()
+
         except Exception as e:
             logger.error(f"加载配置失败: {str(e)}")
             raise
 
+    def _write_runtime_settings(self) -> None:
+        """写出启动阶段需要的少量配置，供 run.py 在不导入本模块的情况下读取
+
+        记录配置文件的修改时间用于判断缓存是否过期；不写入 API 密钥本身。
+        """
+        try:
+            settings = {
+                'config_mtime': os.path.getmtime(self.config_path),
+                'llm_configured': bool(self.llm.api_key),
+                'base_url': self.llm.base_url,
+                'image_model': self.media.image_generation.model,
+                'tts_api_url': self.media.text_to_speech.tts_api_url
+            }
+            os.makedirs(os.path.dirname(self.runtime_settings_path), exist_ok=True)
+            with open(self.runtime_settings_path, 'w', encoding='utf-8') as f:
+                json.dump(settings, f, ensure_ascii=False)
+        except OSError as e:
+            logger.warning(f"写入运行时配置缓存失败: {str(e)}")
+
     # 更新管理员密码
     def update_password(self, password: str) -> bool:
         try:
@@ -464,7 +491,11 @@ class Config:
                     }
                 }
             }
-            return self.save_config(config_data)
+            if not self.save_config(config_data):
+                return False
+            # 同步更新内存中的配置，无需重新加载整个模块
+            self.auth.admin_password = password
+            return True
         except Exception as e:
             logger.error(f"更新密码失败: {str(e)}")
             return False
@@ -473,22 +504,49 @@ class Config:
 config = Config()
 
 # 为了兼容性保留的旧变量（将在未来版本中移除）
-LISTEN_LIST = config.user.listen_list
-DEEPSEEK_API_KEY = config.llm.api_key
-DEEPSEEK_BASE_URL = config.llm.base_url
-MODEL = config.llm.model
-MAX_TOKEN = config.llm.max_tokens
-TEMPERATURE = config.llm.temperature
-VISION_API_KEY = config.media.image_recognition.api_key
-VISION_BASE_URL = config.media.image_recognition.base_url
-VISION_TEMPERATURE = config.media.image_recognition.temperature
-IMAGE_MODEL = config.media.image_generation.model
-TEMP_IMAGE_DIR = config.media.image_generation.temp_dir
-MAX_GROUPS = config.behavior.context.max_groups
-TTS_API_URL = config.media.text_to_speech.tts_api_url
-VOICE_DIR = config.media.text_to_speech.voice_dir
-AUTO_MESSAGE = config.behavior.auto_message.content
-MIN_COUNTDOWN_HOURS = config.behavior.auto_message.min_hours
-MAX_COUNTDOWN_HOURS = config.behavior.auto_message.max_hours
-QUIET_TIME_START = config.behavior.quiet_time.start
-QUIET_TIME_END = config.behavior.quiet_time.end
\ No newline at end of file
+def _legacy_constants() -> dict:
+    """根据当前配置计算旧版模块级常量"""
+    return {
+        'LISTEN_LIST': config.user.listen_list,
+        'DEEPSEEK_API_KEY': config.llm.api_key,
+        'DEEPSEEK_BASE_URL': config.llm.base_url,
+        'MODEL': config.llm.model,
+        'MAX_TOKEN': config.llm.max_tokens,
+        'TEMPERATURE': config.llm.temperature,
+        'VISION_API_KEY': config.media.image_recognition.api_key,
+        'VISION_BASE_URL': config.media.image_recognition.base_url,
+        'VISION_TEMPERATURE': config.media.image_recognition.temperature,
+        'IMAGE_MODEL': config.media.image_generation.model,
+        'TEMP_IMAGE_DIR': config.media.image_generation.temp_dir,
+        'MAX_GROUPS': config.behavior.context.max_groups,
+        'TTS_API_URL': config.media.text_to_speech.tts_api_url,
+        'VOICE_DIR': config.media.text_to_speech.voice_dir,
+        'AUTO_MESSAGE': config.behavior.auto_message.content,
+        'MIN_COUNTDOWN_HOURS': config.behavior.auto_message.min_hours,
+        'MAX_COUNTDOWN_HOURS': config.behavior.auto_message.max_hours,
+        'QUIET_TIME_START': config.behavior.quiet_time.start,
+        'QUIET_TIME_END': config.behavior.quiet_time.end,
+    }
+
+globals().update(_legacy_constants())
+
+# 配置重新加载后的回调
+_reload_listeners = []
+
+def add_reload_listener(callback) -> None:
+    """注册配置重新加载后的回调，回调参数为 config 实例"""
+    _reload_listeners.append(callback)
+
+def reload_config() -> None:
+    """
+    从文件重新加载配置，原地更新全局 config 实例和旧版模块级常量
+
+    代替 importlib.reload：不会重新执行整个模块，已持有 config 引用的代码也能看到新配置。
+    """
+    config.load_config()
+    globals().update(_legacy_constants())
+    for callback in list(_reload_listeners):
+        try:
+            callback(config)
+        except Exception as e:
+            logger.error(f"执行配置重载回调失败: {str(e)}")
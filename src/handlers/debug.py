@@ -136,19 +136,9 @@ class DebugCommandHandler:
             # 获取核心记忆
             core_memory = self.memory_service.get_core_memory(avatar_name, user_id)
             
-            # 获取对应的短期记忆路径
-            short_memory_path = os.path.join(
-                self.avatars_dir, avatar_name, "memory", user_id, "short_memory.json"
-            )
-            
             # 读取最近5轮对话
-            recent_dialogues = []
-            if os.path.exists(short_memory_path):
-                with open(short_memory_path, "r", encoding="utf-8") as f:
-                    short_memory = json.load(f)
-                    # 只取最近5轮对话
-                    recent_dialogues = short_memory[-5:]
-                    logger.info(f"读取到 {len(recent_dialogues)} 条对话记录")
+            recent_dialogues = self.memory_service.get_short_memory(avatar_name, user_id, 5)
+            logger.info(f"读取到 {len(recent_dialogues)} 条对话记录")
             
             # 组装信息
             result = f"【当前角色: {avatar_name}】【用户: {user_id}】\n\n"
@@ -209,17 +199,19 @@ class DebugCommandHandler:
             str: 操作结果
         """
         try:
+            if not self.memory_service:
+                return "错误: 记忆服务未初始化"
+            
             # 获取对应的短期记忆路径
             short_memory_path = os.path.join(
-                self.avatars_dir, avatar_name, "memory", user_id, "short_memory.json"
+                self.avatars_dir, avatar_name, "memory", user_id, "short_memory.jsonl"
             )
             
             if not os.path.exists(short_memory_path):
                 return f"角色 {avatar_name} 用户 {user_id} 没有短期记忆文件"
             
-            # 重置为空列表
-            with open(short_memory_path, "w", encoding="utf-8") as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+            # 重置为空
+            self.memory_service.reset_short_memory(avatar_name, user_id)
                 
             logger.info(f"已重置角色 {avatar_name} 用户 {user_id} 的短期记忆")
             return f"已重置角色 {avatar_name} 用户 {user_id} 的短期记忆"
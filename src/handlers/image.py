@@ -9,12 +9,10 @@
 
 import os
 import logging
-import requests
 from datetime import datetime
 from typing import Optional, List, Tuple
 import re
 import time
-from src.services.ai.llm_service import LLMService
 
 # 修改logger获取方式，确保与main模块一致
 logger = logging.getLogger('main')
@@ -27,16 +25,8 @@ class ImageHandler:
         self.image_model = image_model
         self.temp_dir = os.path.join(root_dir, "data", "images", "temp")
 
-        # 复用消息模块的AI实例(使用正确的模型名称)
-        from config import config
-        self.text_ai = LLMService(
-            api_key=api_key,
-            base_url=base_url,
-            model="kourichat-vision",
-            max_token=2048,
-            temperature=0.5,
-            max_groups=15
-        )
+        # AI实例在首次使用时创建，避免仅做清理时也加载整个LLM依赖
+        self._text_ai = None
 
         # 多语言提示模板
         self.prompt_templates = {
@@ -125,8 +115,24 @@ class ImageHandler:
 
         return False
 
+    @property
+    def text_ai(self):
+        """提示词优化使用的AI实例(使用正确的模型名称)"""
+        if self._text_ai is None:
+            from src.services.ai.llm_service import LLMService
+            self._text_ai = LLMService(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                model="kourichat-vision",
+                max_token=2048,
+                temperature=0.5,
+                max_groups=15
+            )
+        return self._text_ai
+
     def get_random_image(self) -> Optional[str]:
         """从API获取随机图片并保存"""
+        import requests
         try:
             if not os.path.exists(self.temp_dir):
                 os.makedirs(self.temp_dir)
@@ -300,6 +306,7 @@ class ImageHandler:
 
     def generate_image(self, prompt: str) -> Optional[str]:
         """整合版图像生成方法"""
+        import requests
         try:
             # 自动扩展短提示词
             if len(prompt) <= self.prompt_extend_threshold:
@@ -366,10 +373,12 @@ class ImageHandler:
         """清理临时目录中的旧图片"""
         try:
             if os.path.exists(self.temp_dir):
-                for file in os.listdir(self.temp_dir):
-                    file_path = os.path.join(self.temp_dir, file)
+                with os.scandir(self.temp_dir) as it:
+                    entries = list(it)
+                for entry in entries:
+                    file_path = entry.path
                     try:
-                        if os.path.isfile(file_path):
+                        if entry.is_file():
                             os.remove(file_path)
                             logger.info(f"清理旧临时文件: {file_path}")
                     except Exception as e:
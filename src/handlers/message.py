@@ -16,7 +16,7 @@ from wxauto import WeChat
 from services.database import Session, ChatMessage
 import random
 import os
-from services.ai.llm_service import LLMService
+from src.services.ai.llm_service import get_shared_llm_service
 from config import config
 from modules.memory.memory_service import MemoryService
 from modules.reminder.time_recognition import TimeRecognitionService
@@ -38,8 +38,8 @@ class MessageHandler:
         self.robot_name = robot_name
         self.prompt_content = prompt_content
 
-        # 使用 DeepSeekAI 替换直接的 OpenAI 客户端
-        self.deepseek = LLMService(
+        # 使用 DeepSeekAI 替换直接的 OpenAI 客户端（与记忆服务共享同一实例）
+        self.deepseek = get_shared_llm_service(
             api_key=api_key,
             base_url=base_url,
             model=model,
@@ -9,7 +9,6 @@
 
 import os
 import logging
-import requests
 from datetime import datetime
 from typing import Optional
 
@@ -32,6 +31,8 @@ class VoiceHandler:
 
     def generate_voice(self, text: str) -> Optional[str]:
         """调用TTS API生成语音"""
+        # requests 只在生成语音时需要，延迟导入以加快启动
+        import requests
         try:
             # 确保语音目录存在
             if not os.path.exists(self.voice_dir):
@@ -61,10 +62,12 @@ class VoiceHandler:
         """清理语音目录中的旧文件"""
         try:
             if os.path.exists(self.voice_dir):
-                for file in os.listdir(self.voice_dir):
-                    file_path = os.path.join(self.voice_dir, file)
+                with os.scandir(self.voice_dir) as it:
+                    entries = list(it)
+                for entry in entries:
+                    file_path = entry.path
                     try:
-                        if os.path.isfile(file_path):
+                        if entry.is_file():
                             os.remove(file_path)
                             logger.info(f"清理旧语音文件: {file_path}")
                     except Exception as e:
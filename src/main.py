@@ -376,6 +376,9 @@ def main():
             memory_service.initialize_memory_files(avatar_name, user_id=user_name)
             print_status(f"用户 '{user_name}' 记忆初始化完成", "success", "CHECK")
 
+        # 提醒任务只在机器人主进程中持久化，其他导入本模块的进程（如配置界面）使用内存存储
+        message_handler.reminder_service.enable_persistence()
+
         avatar_dir = os.path.join(root_dir, config.behavior.context.avatar_dir)
         prompt_path = os.path.join(avatar_dir, "avatar.md")
         if not os.path.exists(prompt_path):
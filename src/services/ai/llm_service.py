@@ -14,6 +14,7 @@ import random
 import json  # 新增导入
 import time  # 新增导入
 import pathlib
+import threading
 import requests
 from typing import Dict, List, Optional, Tuple, Union
 from openai import OpenAI
@@ -28,6 +29,64 @@ from tenacity import (
 # 修改logger获取方式，确保与main模块一致
 logger = logging.getLogger('main')
 
+# 项目根目录及基础Prompt路径（从 src/services/ai 向上三级）
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+_BASE_PROMPT_PATH = os.path.join(_PROJECT_ROOT, "data", "base", "base.md")
+
+# 共享的OpenAI客户端与LLM服务实例，相同配置复用同一个HTTP连接池
+_shared_lock = threading.Lock()
+_shared_clients: Dict[Tuple[str, str], OpenAI] = {}
+_shared_services: Dict[Tuple, "LLMService"] = {}
+
+
+def _get_openai_client(api_key: str, base_url: str) -> OpenAI:
+    """获取共享的OpenAI客户端，相同 api_key/base_url 只创建一次"""
+    key = (api_key, base_url)
+    with _shared_lock:
+        client = _shared_clients.get(key)
+        if client is None:
+            # 创建 Updater 实例获取版本信息
+            updater = Updater()
+            version = updater.get_current_version()
+            version_identifier = updater.get_version_identifier()
+
+            client = OpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                default_headers={
+                    "Content-Type": "application/json",
+                    "User-Agent": version_identifier,
+                    "X-KouriChat-Version": version
+                }
+            )
+            _shared_clients[key] = client
+        return client
+
+
+def get_shared_llm_service(api_key: str, base_url: str, model: str,
+                           max_token: int, temperature: float, max_groups: int) -> "LLMService":
+    """
+    获取共享的LLM服务实例，相同配置的调用方复用同一个实例
+
+    各调用方使用不同的 user_id 区分对话上下文，因此可以安全共享
+    """
+    key = (api_key, base_url, model, max_token, temperature, max_groups)
+    with _shared_lock:
+        service = _shared_services.get(key)
+    if service is None:
+        service = LLMService(
+            api_key=api_key,
+            base_url=base_url,
+            model=model,
+            max_token=max_token,
+            temperature=temperature,
+            max_groups=max_groups
+        )
+        with _shared_lock:
+            service = _shared_services.setdefault(key, service)
+    return service
+
+
 class LLMService:
     def __init__(self, api_key: str, base_url: str, model: str,
                  max_token: int, temperature: float, max_groups: int):
@@ -42,20 +101,8 @@ class LLMService:
         :param max_groups: 最大对话轮次记忆
         :param system_prompt: 系统级提示词
         """
-        # 创建 Updater 实例获取版本信息
-        updater = Updater()
-        version = updater.get_current_version()
-        version_identifier = updater.get_version_identifier()
-
-        self.client = OpenAI(
-            api_key=api_key,
-            base_url=base_url,
-            default_headers={
-                "Content-Type": "application/json",
-                "User-Agent": version_identifier,
-                "X-KouriChat-Version": version
-            }
-        )
+        # 相同 api_key/base_url 的实例共享同一个客户端及其连接池
+        self.client = _get_openai_client(api_key, base_url)
         self.config = {
             "model": model,
             "max_token": max_token,
@@ -200,12 +247,7 @@ class LLMService:
             # —— 阶段3：构建请求参数 ——
             # 读取基础Prompt
             try:
-                # 从当前文件位置(llm_service.py)向上导航到项目根目录
-                current_dir = os.path.dirname(os.path.abspath(__file__))  # src/services/ai
-                project_root = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))  # 项目根目录
-                base_prompt_path = os.path.join(project_root, "data", "base", "base.md")
-
-                with open(base_prompt_path, "r", encoding="utf-8") as f:
+                with open(_BASE_PROMPT_PATH, "r", encoding="utf-8") as f:
                     base_content = f.read()
             except Exception as e:
                 logger.error(f"基础Prompt文件读取失败: {str(e)}")
@@ -31,23 +31,24 @@ class CleanupUtils:
             max_retries = 3
             for attempt in range(max_retries):
                 try:
-                    files = os.listdir(self.wxauto_dir)
-                    if not files:
+                    with os.scandir(self.wxauto_dir) as it:
+                        entries = list(it)
+                    if not entries:
                         logger.info("wxauto文件夹为空，无需清理")
                         return
                         
                     deleted_count = 0
-                    for file in files:
+                    for entry in entries:
+                        file_path = entry.path
                         try:
-                            file_path = os.path.join(self.wxauto_dir, file)
-                            if os.path.isfile(file_path):
+                            if entry.is_file():
                                 try:
                                     os.chmod(file_path, 0o777)
                                 except:
                                     pass
                                 os.remove(file_path)
                                 deleted_count += 1
-                            elif os.path.isdir(file_path):
+                            elif entry.is_dir():
                                 shutil.rmtree(file_path, ignore_errors=True)
                                 deleted_count += 1
                         except PermissionError:
@@ -134,8 +135,6 @@ class CleanupUtils:
         try:
             # 清理各个handler的临时目录
             self.cleanup_wxauto_files()
-            # 清理pycache
-            cleanup_pycache()
             # 清理screenshot文件夹
             self.cleanup_screenshot()
             # 清理更新残留文件
@@ -147,12 +146,54 @@ class CleanupUtils:
 def cleanup_pycache():
     """递归清理所有__pycache__文件夹"""
     root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    
-    for root, dirs, files in os.walk(root_dir):
-        if '__pycache__' in dirs:
-            pycache_path = os.path.join(root, '__pycache__')
+
+    # os.fwalk 仅在类 Unix 系统上可用，Windows 上退回 os.scandir 遍历
+    if hasattr(os, 'fwalk'):
+        _cleanup_pycache_fwalk(root_dir)
+    else:
+        _cleanup_pycache_scandir(root_dir)
+
+def _cleanup_pycache_fwalk(root_dir: str):
+    """持有目录描述符遍历，按 dir_fd 删除文件，避免逐个文件解析完整路径"""
+    for dirpath, dirnames, _, dirfd in os.fwalk(root_dir):
+        if '__pycache__' not in dirnames:
+            continue
+        # 原地剔除，不再深入__pycache__
+        dirnames.remove('__pycache__')
+        pycache_path = os.path.join(dirpath, '__pycache__')
+        try:
+            pycache_fd = os.open('__pycache__', os.O_RDONLY, dir_fd=dirfd)
             try:
-                shutil.rmtree(pycache_path)
-                logger.info(f"已清理: {pycache_path}")
-            except Exception as e:
-                logger.error(f"清理失败 {pycache_path}: {str(e)}") 
\ No newline at end of file
+                with os.scandir(pycache_fd) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            shutil.rmtree(os.path.join(pycache_path, entry.name))
+                        else:
+                            os.unlink(entry.name, dir_fd=pycache_fd)
+            finally:
+                os.close(pycache_fd)
+            os.rmdir('__pycache__', dir_fd=dirfd)
+            logger.info(f"已清理: {pycache_path}")
+        except OSError as e:
+            logger.error(f"清理失败 {pycache_path}: {str(e)}")
+
+def _cleanup_pycache_scandir(root_dir: str):
+    """使用 os.scandir 遍历，目录项自带类型信息，无需对每个文件再调用 stat"""
+    pending_dirs = [root_dir]
+    while pending_dirs:
+        current_dir = pending_dirs.pop()
+        try:
+            with os.scandir(current_dir) as it:
+                for entry in it:
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                    if entry.name == '__pycache__':
+                        try:
+                            shutil.rmtree(entry.path)
+                            logger.info(f"已清理: {entry.path}")
+                        except Exception as e:
+                            logger.error(f"清理失败 {entry.path}: {str(e)}")
+                    else:
+                        pending_dirs.append(entry.path)
+        except OSError as e:
+            logger.error(f"无法访问目录 {current_dir}: {str(e)}")
@@ -2,13 +2,96 @@
 控制台输出相关的工具函数
 包含:
 - 状态信息打印
+- 状态信息批量输出
 - 横幅打印
 等功能
 """
 
 from colorama import Fore, Style
+from functools import lru_cache
+import io
 import sys
 
+_STATUS_COLORS = {
+    "success": Fore.GREEN,
+    "info": Fore.BLUE,
+    "warning": Fore.YELLOW,
+    "error": Fore.RED
+}
+
+# ASCII文本到emoji的映射
+_ICON_MAP = {
+    "LAUNCH": "🚀",
+    "FILE": "📁",
+    "CONFIG": "⚙️",
+    "CHECK": "✅",
+    "CROSS": "❌",
+    "CLEAN": "🧹",
+    "TRASH": "🗑️",
+    "STAR_1": "✨",
+    "STAR_2": "🌟",
+    "BOT": "🤖",
+    "STOP": "🛑",
+    "BYE": "👋",
+    "ERROR": "💥",
+    "SEARCH": "🔍",
+    "BRAIN": "🧠",
+    "ANTENNA": "📡",
+    "CHAIN": "🔗",
+    "INTERNET": "🌐",
+    "CLOCK": "⏰",
+    "SYNC": "🔄",
+    "WARNING": "⚠️",
+    "+": "📁",
+    "*": "⚙️",
+    "X": "❌",
+    ">>": "🚀",
+}
+
+# StatusBatcher 生效期间状态消息先写入该缓冲区
+_batch_buffer = None
+
+class StatusBatcher:
+    """
+    状态消息批量输出
+    
+    在 with 块内调用 print_status 的输出会先缓存，退出时一次性写入控制台，
+    减少逐行写出和刷新的次数。支持嵌套，由最外层负责写出。
+    """
+
+    __slots__ = ('_owner',)
+
+    def __enter__(self):
+        global _batch_buffer
+        self._owner = _batch_buffer is None
+        if self._owner:
+            _batch_buffer = io.StringIO()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        global _batch_buffer
+        if self._owner:
+            buffered = _batch_buffer.getvalue()
+            _batch_buffer = None
+            if buffered:
+                sys.stdout.write(buffered)
+                sys.stdout.flush()
+        return False
+
+def _emit(text: str):
+    """输出一行文本，处于批量模式时写入缓冲区"""
+    if _batch_buffer is not None:
+        _batch_buffer.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+
+@lru_cache(maxsize=64)
+def _status_prefix(status: str, icon: str) -> str:
+    """按 (状态, 图标) 缓存颜色和图标前缀"""
+    color = _STATUS_COLORS.get(status, Fore.WHITE)
+    safe_icon = _ICON_MAP.get(icon, icon)  # 如果找不到映射，保留原始输入
+    return f"{color}{safe_icon} "
+
 def print_status(message: str, status: str = "info", icon: str = ""):
     """
     打印带颜色和表情的状态消息
@@ -19,48 +102,19 @@ def print_status(message: str, status: str = "info", icon: str = ""):
         icon (str): 消息前的图标
     """
     try:
-        colors = {
-            "success": Fore.GREEN,
-            "info": Fore.BLUE,
-            "warning": Fore.YELLOW,
-            "error": Fore.RED
-        }
-        color = colors.get(status, Fore.WHITE)
-
-        # ASCII文本到emoji的映射
-        icon_map = {
-            "LAUNCH": "🚀",
-            "FILE": "📁",
-            "CONFIG": "⚙️",
-            "CHECK": "✅",
-            "CROSS": "❌",
-            "CLEAN": "🧹",
-            "TRASH": "🗑️",
-            "STAR_1": "✨",
-            "STAR_2": "🌟",
-            "BOT": "🤖",
-            "STOP": "🛑",
-            "BYE": "👋",
-            "ERROR": "💥",
-            "SEARCH": "🔍",
-            "BRAIN": "🧠",
-            "ANTENNA": "📡",
-            "CHAIN": "🔗",
-            "INTERNET": "🌐",
-            "CLOCK": "⏰",
-            "SYNC": "🔄",
-            "WARNING": "⚠️",
-            "+": "📁",
-            "*": "⚙️",
-            "X": "❌",
-            ">>": "🚀",
-        }
-
-        safe_icon = icon_map.get(icon, icon)  # 如果找不到映射，保留原始输入
-        print(f"{color}{safe_icon} {message}{Style.RESET_ALL}")
+        _emit(f"{_status_prefix(status, icon)}{message}{Style.RESET_ALL}")
     except Exception:
         # 如果出现编码错误，不使用颜色和图标
-        print(f"{message}")
+        _emit(f"{message}")
+
+def print_line(text: str = ""):
+    """
+    打印一行普通文本，处于批量模式时与状态消息一起写出
+
+    Args:
+        text (str): 要打印的文本
+    """
+    _emit(text)
 
 def print_banner():
     """
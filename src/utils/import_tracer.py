@@ -0,0 +1,85 @@
+"""
+导入耗时追踪模块
+用于排查启动阶段的慢导入，包括:
+- 记录每个模块执行的耗时
+- 记录模块执行期间新增的内存占用
+- 程序退出时写出 JSON 报告
+
+仅在设置环境变量 KOURI_TRACE_IMPORTS=1 时由 run.py 启用。
+耗时为包含子模块导入在内的累计值。
+"""
+
+import atexit
+import json
+import sys
+import time
+import tracemalloc
+from importlib.abc import MetaPathFinder
+
+# 耗时超过该值的模块会在报告中标注
+SLOW_IMPORT_MS = 50.0
+
+
+class _TimedLoader:
+    """包装原始加载器，统计 exec_module 的耗时和内存"""
+
+    def __init__(self, loader, records):
+        self._loader = loader
+        self._records = records
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        mem_before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            memory_mb = (tracemalloc.get_traced_memory()[0] - mem_before) / (1024 * 1024)
+            self._records.append({
+                "module": module.__name__,
+                "import_time_ms": round(elapsed_ms, 3),
+                "memory_mb": round(memory_mb, 3),
+                "notes": "slow" if elapsed_ms >= SLOW_IMPORT_MS else ""
+            })
+
+
+class _TracingFinder(MetaPathFinder):
+    """委托给其余查找器，并用 _TimedLoader 包装找到的加载器"""
+
+    def __init__(self, records):
+        self._records = records
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                    spec.loader = _TimedLoader(spec.loader, self._records)
+                return spec
+        return None
+
+
+def install(output_path: str) -> None:
+    """安装导入追踪器，程序退出时将结果按耗时降序写入 output_path"""
+    records = []
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    sys.meta_path.insert(0, _TracingFinder(records))
+
+    def _dump():
+        report = sorted(records, key=lambda r: r["import_time_ms"], reverse=True)
+        try:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump({"modules": report}, f, ensure_ascii=False, indent=2)
+        except OSError:
+            pass
+
+    atexit.register(_dump)
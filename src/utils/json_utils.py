@@ -0,0 +1,83 @@
+"""
+JSON序列化工具模块
+优先使用 orjson 进行编解码，未安装时回退到标准库 json，包含:
+- loads: 解析 str 或 bytes
+- dumps: 序列化为 UTF-8 编码的 bytes
+- atomic_write / atomic_write_json: 通过临时文件 + os.replace 原子写入文件
+"""
+
+import os
+import json
+import threading
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 未安装orjson时使用标准库
+    orjson = None
+
+if orjson is not None:
+    JSONDecodeError = orjson.JSONDecodeError
+
+    def loads(data):
+        """解析JSON字符串或字节串"""
+        return orjson.loads(data)
+
+    def dumps(obj, indent: bool = False) -> bytes:
+        """
+        序列化为UTF-8编码的字节串
+
+        Args:
+            obj: 要序列化的对象
+            indent: 是否使用2空格缩进
+        """
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+else:
+    JSONDecodeError = json.JSONDecodeError
+
+    def loads(data):
+        """解析JSON字符串或字节串"""
+        return json.loads(data)
+
+    def dumps(obj, indent: bool = False) -> bytes:
+        """
+        序列化为UTF-8编码的字节串
+
+        Args:
+            obj: 要序列化的对象
+            indent: 是否使用2空格缩进
+        """
+        return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode("utf-8")
+
+
+def atomic_write(path: str, data: bytes, fsync: bool = False):
+    """
+    原子写入文件：先写入同目录下的临时文件，再用 os.replace 替换目标文件，
+    避免程序中途退出时留下不完整的文件
+
+    Args:
+        path: 目标文件路径
+        data: 要写入的字节内容
+        fsync: 替换前是否将数据同步到磁盘
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_json(path: str, obj, indent: bool = True, fsync: bool = False):
+    """以JSON格式原子写入文件，参数同 atomic_write"""
+    atomic_write(path, dumps(obj, indent=indent), fsync=fsync)
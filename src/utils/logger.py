@@ -69,11 +69,14 @@ class LoggerConfig:
         """清理指定天数之前的日志文件"""
         try:
             current_date = datetime.now()
-            for filename in os.listdir(self.log_dir):
+            with os.scandir(self.log_dir) as it:
+                entries = list(it)
+            for entry in entries:
+                filename = entry.name
                 if not filename.startswith("bot_") or not filename.endswith(".log"):
                     continue
                 
-                file_path = os.path.join(self.log_dir, filename)
+                file_path = entry.path
                 file_date_str = filename[4:12]  # 提取日期部分 YYYYMMDD
                 try:
                     file_date = datetime.strptime(file_date_str, "%Y%m%d")
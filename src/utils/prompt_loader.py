@@ -0,0 +1,27 @@
+"""
+提示词模板加载模块
+提示词文件在运行期间基本不会变化，读取后缓存于内存中，
+文件修改时间变化时自动重新读取
+"""
+
+import os
+import functools
+
+
+@functools.lru_cache(maxsize=8)
+def _read_prompt(path: str, mtime: float) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read().strip()
+
+
+def load_prompt(path: str) -> str:
+    """
+    读取提示词模板文件（去除首尾空白）
+
+    Args:
+        path: 提示词文件路径
+
+    Raises:
+        FileNotFoundError: 文件不存在
+    """
+    return _read_prompt(path, os.path.getmtime(path))
@@ -1,14 +1,43 @@
 import os
+import re
 import shutil
-import json
 from flask import Blueprint, jsonify, request
 from pathlib import Path
 from datetime import datetime
+from src.utils import json_utils
 
 avatar_bp = Blueprint('avatar', __name__)
 
 AVATARS_DIR = Path('data/avatars')
 
+def read_short_memory(memory_dir):
+    """读取短期记忆（JSON Lines格式，兼容旧版JSON数组）"""
+    memory_path = memory_dir / 'short_memory.jsonl'
+    if memory_path.exists():
+        conversations = []
+        with open(memory_path, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    conversations.append(json_utils.loads(line))
+        return conversations
+
+    legacy_path = memory_dir / 'short_memory.json'
+    if legacy_path.exists():
+        return json_utils.loads(legacy_path.read_bytes())
+    return None
+
+def write_short_memory(memory_dir, conversations):
+    """以JSON Lines格式保存短期记忆，并移除旧版JSON文件"""
+    with open(memory_dir / 'short_memory.jsonl', 'wb') as f:
+        f.write(b''.join(json_utils.dumps(conv) + b'\n' for conv in conversations))
+    legacy_path = memory_dir / 'short_memory.json'
+    if legacy_path.exists():
+        legacy_path.unlink()
+
+# 标题行：去除首尾空白后以 "# " 开头且标题不为空
+_SECTION_HEADER_RE = re.compile(r'^[^\S\n]*# (?=[^\n]*\S)', re.MULTILINE)
+
 def parse_md_content(content):
     """解析markdown内容为字典格式"""
     sections = {
@@ -23,28 +52,14 @@ def parse_md_content(content):
     }
     
     result = {v: '' for v in sections.values()}
-    current_section = None
-    current_content = []
-    
-    for line in content.split('\n'):
-        line = line.strip()
-        if not line:
-            continue
-            
-        if line.startswith('# '):
-            if current_section and current_content:
-                result[sections.get(current_section, 'notes')] = '\n'.join(current_content)
-                current_content = []
-            
-            current_section = line[2:].strip()
-            continue
-            
-        if current_section:
-            current_content.append(line)
-    
-    # 处理最后一个部分
-    if current_section and current_content:
-        result[sections.get(current_section, 'notes')] = '\n'.join(current_content)
+
+    # 按标题行一次拆分，第一个标题之前的内容忽略；各部分去掉空行并逐行去除首尾空白
+    for part in _SECTION_HEADER_RE.split(content)[1:]:
+        header, _, body = part.partition('\n')
+        lines = [line.strip() for line in body.split('\n')]
+        body = '\n'.join(line for line in lines if line)
+        if body:
+            result[sections.get(header.strip(), 'notes')] = body
     
     return result
 
@@ -259,35 +274,32 @@ def load_core_memory():
                 "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                 "content": ""  # 初始为空字符串
             }]
-            with open(memory_path, 'w', encoding='utf-8') as f:
-                json.dump(initial_core_data, f, ensure_ascii=False, indent=2)
+            json_utils.atomic_write_json(str(memory_path), initial_core_data)
             
             return jsonify({'status': 'success', 'content': ''})
             
         # 读取核心记忆文件
-        with open(memory_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            # 处理数组格式
-            if isinstance(data, list) and len(data) > 0:
-                content = data[0].get("content", "")
-            else:
-                # 兼容旧格式
-                content = data.get('content', '')
-                
-                # 将旧格式迁移为新格式
-                if memory_path.exists():
-                    try:
-                        # 将旧格式转换为新的数组格式
-                        new_data = [{
-                            "timestamp": data.get("timestamp", datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
-                            "content": content
-                        }]
-                        # 保存为新格式
-                        with open(memory_path, 'w', encoding='utf-8') as f_write:
-                            json.dump(new_data, f_write, ensure_ascii=False, indent=2)
-                    except Exception as e:
-                        print(f"迁移核心记忆格式失败: {str(e)}")
-            
+        data = json_utils.loads(memory_path.read_bytes())
+        # 处理数组格式
+        if isinstance(data, list) and len(data) > 0:
+            content = data[0].get("content", "")
+        else:
+            # 兼容旧格式
+            content = data.get('content', '')
+            
+            # 将旧格式迁移为新格式
+            if memory_path.exists():
+                try:
+                    # 将旧格式转换为新的数组格式
+                    new_data = [{
+                        "timestamp": data.get("timestamp", datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+                        "content": content
+                    }]
+                    # 保存为新格式
+                    json_utils.atomic_write_json(str(memory_path), new_data)
+                except Exception as e:
+                    print(f"迁移核心记忆格式失败: {str(e)}")
+        
         return jsonify({'status': 'success', 'content': content})
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)})
@@ -316,8 +328,7 @@ def save_core_memory():
             "content": content
         }]
         
-        with open(memory_path, 'w', encoding='utf-8') as f:
-            json.dump(memory_data, f, ensure_ascii=False, indent=2)
+        json_utils.atomic_write_json(str(memory_path), memory_data)
             
         return jsonify({'status': 'success'})
     except Exception as e:
@@ -333,24 +344,21 @@ def load_short_memory():
         if not avatar_name:
             return jsonify({'status': 'error', 'message': '未提供角色名称'})
             
-        memory_path = AVATARS_DIR / avatar_name / 'memory' / user_id / 'short_memory.json'
+        memory_dir = AVATARS_DIR / avatar_name / 'memory' / user_id
+        
+        # 读取短期记忆文件
+        conversations = read_short_memory(memory_dir) if memory_dir.exists() else None
         
         # 如果记忆文件不存在，则返回空内容
-        if not memory_path.exists():
+        if conversations is None:
             # 创建记忆目录
-            memory_dir = AVATARS_DIR / avatar_name / 'memory' / user_id
             memory_dir.mkdir(parents=True, exist_ok=True)
             
             # 创建空的短期记忆文件
-            with open(memory_path, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+            write_short_memory(memory_dir, [])
             
             return jsonify({'status': 'success', 'conversations': []})
             
-        # 读取短期记忆文件
-        with open(memory_path, 'r', encoding='utf-8') as f:
-            conversations = json.load(f)
-            
         return jsonify({'status': 'success', 'conversations': conversations})
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)})
@@ -371,11 +379,8 @@ def save_short_memory():
         memory_dir = AVATARS_DIR / avatar_name / 'memory' / user_id
         memory_dir.mkdir(parents=True, exist_ok=True)
         
-        memory_path = memory_dir / 'short_memory.json'
-        
         # 保存短期记忆
-        with open(memory_path, 'w', encoding='utf-8') as f:
-            json.dump(conversations, f, ensure_ascii=False, indent=2)
+        write_short_memory(memory_dir, conversations)
             
         return jsonify({'status': 'success'})
     except Exception as e:
@@ -396,11 +401,8 @@ def clear_short_memory():
         memory_dir = AVATARS_DIR / avatar_name / 'memory' / user_id
         memory_dir.mkdir(parents=True, exist_ok=True)
         
-        memory_path = memory_dir / 'short_memory.json'
-        
         # 清空短期记忆
-        with open(memory_path, 'w', encoding='utf-8') as f:
-            json.dump([], f, ensure_ascii=False, indent=2)
+        write_short_memory(memory_dir, [])
             
         return jsonify({'status': 'success'})
     except Exception as e:
@@ -430,8 +432,7 @@ def clear_core_memory():
             "content": ""
         }]
         
-        with open(memory_path, 'w', encoding='utf-8') as f:
-            json.dump(memory_data, f, ensure_ascii=False, indent=2)
+        json_utils.atomic_write_json(str(memory_path), memory_data)
             
         return jsonify({'status': 'success'})
     except Exception as e: